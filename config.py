@@ -6,7 +6,7 @@ This module contains configuration settings for the application.
 import os
 import json
 import logging
-from typing import Dict, Any, Optional, Union
+from typing import Dict, Any, List, Optional, Union
 
 
 logger = logging.getLogger(__name__)
@@ -248,6 +248,48 @@ class Config:
             logger.error(f"Error setting {category}.{name} to {value}: {e}")
             return False
     
+    def get_local_directories(self) -> List[str]:
+        """Get the local directories scanned for files.
+        
+        Returns:
+            List of directory paths
+        """
+        return list(self.get("local_library", "directories", []))
+    
+    def add_local_directory(self, directory: str) -> bool:
+        """Add a local directory to scan for files.
+        
+        Args:
+            directory: Path of the directory
+            
+        Returns:
+            True if the directory is in the list, False otherwise
+        """
+        directories = self.get_local_directories()
+        
+        if directory in directories:
+            return True
+        
+        directories.append(directory)
+        return self.set("local_library", "directories", directories)
+    
+    def remove_local_directory(self, directory: str) -> bool:
+        """Remove a local directory from the directories scanned for files.
+        
+        Args:
+            directory: Path of the directory
+            
+        Returns:
+            True if the directory was removed, False otherwise
+        """
+        directories = self.get_local_directories()
+        
+        if directory not in directories:
+            return False
+        
+        directories.remove(directory)
+        return self.set("local_library", "directories", directories)
+    
     def _update_dict(self, target: Dict[str, Any], source: Dict[str, Any]) -> None:
         """Update a dictionary recursively.
         
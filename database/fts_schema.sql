@@ -0,0 +1,74 @@
+-- Full-text indexes for the PDF Downloader application, applied after
+-- schema.sql if SQLite's FTS5 has the trigram tokenizer (SQLite 3.34+)
+
+-- Full-text indexes for searching remote file names and local file paths.
+-- The trigram tokenizer matches any substring of three or more characters,
+-- ignoring case.
+CREATE VIRTUAL TABLE IF NOT EXISTS remote_files_fts USING fts5(
+    name,
+    content='remote_files',
+    content_rowid='id',
+    tokenize='trigram'
+);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS local_files_fts USING fts5(
+    path,
+    content='local_files',
+    content_rowid='id',
+    tokenize='trigram'
+);
+
+-- Triggers to keep the full-text indexes in step with the file tables
+CREATE TRIGGER IF NOT EXISTS remote_files_fts_insert
+AFTER INSERT ON remote_files
+BEGIN
+    INSERT INTO remote_files_fts (rowid, name) VALUES (NEW.id, NEW.name);
+END;
+
+-- Rows removed by ON CONFLICT REPLACE don't fire the delete triggers, so the
+-- entries of the rows an insert replaces are removed before it
+CREATE TRIGGER IF NOT EXISTS remote_files_fts_replace
+BEFORE INSERT ON remote_files
+BEGIN
+    INSERT INTO remote_files_fts (remote_files_fts, rowid, name)
+    SELECT 'delete', id, name FROM remote_files WHERE site_id = NEW.site_id AND url = NEW.url;
+END;
+
+CREATE TRIGGER IF NOT EXISTS remote_files_fts_delete
+AFTER DELETE ON remote_files
+BEGIN
+    INSERT INTO remote_files_fts (remote_files_fts, rowid, name) VALUES ('delete', OLD.id, OLD.name);
+END;
+
+CREATE TRIGGER IF NOT EXISTS remote_files_fts_update
+AFTER UPDATE OF name ON remote_files
+BEGIN
+    INSERT INTO remote_files_fts (remote_files_fts, rowid, name) VALUES ('delete', OLD.id, OLD.name);
+    INSERT INTO remote_files_fts (rowid, name) VALUES (NEW.id, NEW.name);
+END;
+
+CREATE TRIGGER IF NOT EXISTS local_files_fts_insert
+AFTER INSERT ON local_files
+BEGIN
+    INSERT INTO local_files_fts (rowid, path) VALUES (NEW.id, NEW.path);
+END;
+
+CREATE TRIGGER IF NOT EXISTS local_files_fts_replace
+BEFORE INSERT ON local_files
+BEGIN
+    INSERT INTO local_files_fts (local_files_fts, rowid, path)
+    SELECT 'delete', id, path FROM local_files WHERE path = NEW.path;
+END;
+
+CREATE TRIGGER IF NOT EXISTS local_files_fts_delete
+AFTER DELETE ON local_files
+BEGIN
+    INSERT INTO local_files_fts (local_files_fts, rowid, path) VALUES ('delete', OLD.id, OLD.path);
+END;
+
+CREATE TRIGGER IF NOT EXISTS local_files_fts_update
+AFTER UPDATE OF path ON local_files
+BEGIN
+    INSERT INTO local_files_fts (local_files_fts, rowid, path) VALUES ('delete', OLD.id, OLD.path);
+    INSERT INTO local_files_fts (rowid, path) VALUES (NEW.id, NEW.path);
+END;
@@ -56,6 +56,11 @@ CREATE TABLE IF NOT EXISTS local_files (
     UNIQUE (path) ON CONFLICT REPLACE
 );
 
+-- Indexes for listing remote files in name order one page at a time; the
+-- UNIQUE constraint already indexes local files by path
+CREATE INDEX IF NOT EXISTS idx_remote_files_name ON remote_files (name);
+CREATE INDEX IF NOT EXISTS idx_remote_files_site_name ON remote_files (site_id, name);
+
 -- Downloads table for storing download history
 CREATE TABLE IF NOT EXISTS downloads (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -17,18 +17,42 @@ Options:
     --verbose, -v: Run tests in verbose mode
     --quiet, -q: Run tests in quiet mode
     --failfast, -f: Stop on first test failure
+    --parallel, -p: Run the test modules in worker processes at the same time
     --category=CATEGORY: Run only tests in the specified category
                         (utils, db, core, scrapers, gui, or all)
+
+The tests' temporary files are kept in /dev/shm when it exists, unless
+TMPDIR is set.
 """
 
+import glob
+import io
+import tempfile
 import unittest
 import sys
 import os
+from concurrent.futures import ProcessPoolExecutor
+
+
+# Memory-backed directory for the tests' temporary files, where available
+RAM_TEMP_DIR = '/dev/shm'
+
+
+# Test categories in the order they run: (name, title, directory)
+CATEGORIES = (
+    ('utils', 'Utility Tests', 'tests/utils'),
+    ('db', 'Database Model Tests', 'tests/db'),
+    ('core', 'Core Functionality Tests', 'tests/core'),
+    ('scrapers', 'Scraper Tests', 'tests/scrapers'),
+    ('gui', 'GUI Tests', 'tests/gui'),
+)
 
 
 def discover_tests(start_dir, pattern='test_*.py'):
     """Discover tests in the specified directory."""
-    return unittest.defaultTestLoader.discover(start_dir, pattern=pattern)
+    # Import the tests as part of the tests package from the project root,
+    # so that every category resolves its modules the same way
+    return unittest.defaultTestLoader.discover(start_dir, pattern=pattern, top_level_dir='.')
 
 
 def run_tests(test_suite, verbosity=1, failfast=False):
@@ -37,11 +61,33 @@ def run_tests(test_suite, verbosity=1, failfast=False):
     return runner.run(test_suite)
 
 
+def find_test_modules(start_dir, pattern='test_*.py'):
+    """Find the test modules in a category directory, as dotted names."""
+    paths = glob.glob(os.path.join(start_dir, '**', pattern), recursive=True)
+    return sorted(os.path.splitext(os.path.normpath(path))[0].replace(os.sep, '.') for path in paths)
+
+
+def run_module(module_name, verbosity=1, failfast=False):
+    """Run the tests in a module, keeping the runner's output.
+    
+    This runs in a worker process when the tests run in parallel, so it
+    returns plain values rather than the test result.
+    
+    Returns:
+        Tuple of (runner output, tests run, failures, errors)
+    """
+    stream = io.StringIO()
+    runner = unittest.TextTestRunner(stream=stream, verbosity=verbosity, failfast=failfast)
+    result = runner.run(unittest.defaultTestLoader.loadTestsFromName(module_name))
+    return stream.getvalue(), result.testsRun, len(result.failures), len(result.errors)
+
+
 def main():
     """Main function to run all tests."""
     # Parse command line arguments
     verbosity = 1
     failfast = False
+    parallel = False
     category = 'all'
     
     for arg in sys.argv[1:]:
@@ -51,6 +97,8 @@ def main():
             verbosity = 0
         elif arg in ('--failfast', '-f'):
             failfast = True
+        elif arg in ('--parallel', '-p'):
+            parallel = True
         elif arg.startswith('--category='):
             category = arg.split('=')[1].lower()
     
@@ -59,71 +107,58 @@ def main():
         print("Error: This script must be run from the project root directory.")
         sys.exit(1)
     
-    # Create test suites for each category
-    test_suites = {}
+    # Keep the tests' temporary files in memory unless TMPDIR says otherwise;
+    # the worker processes inherit the setting through the environment
+    if 'TMPDIR' not in os.environ and os.path.isdir(RAM_TEMP_DIR):
+        os.environ['TMPDIR'] = RAM_TEMP_DIR
+        tempfile.tempdir = None
     
-    # 1. Utility tests
-    if category in ('utils', 'all'):
-        print("\n=== Running Utility Tests ===")
-        test_suites['utils'] = discover_tests('tests/utils')
-        result_utils = run_tests(test_suites['utils'], verbosity, failfast)
-        if not result_utils.wasSuccessful() and failfast:
-            return 1
-    
-    # 2. Database model tests
-    if category in ('db', 'all'):
-        print("\n=== Running Database Model Tests ===")
-        test_suites['db'] = discover_tests('tests/db')
-        result_db = run_tests(test_suites['db'], verbosity, failfast)
-        if not result_db.wasSuccessful() and failfast:
-            return 1
-    
-    # 3. Core functionality tests
-    if category in ('core', 'all'):
-        print("\n=== Running Core Functionality Tests ===")
-        test_suites['core'] = discover_tests('tests/core')
-        result_core = run_tests(test_suites['core'], verbosity, failfast)
-        if not result_core.wasSuccessful() and failfast:
-            return 1
+    selected = [entry for entry in CATEGORIES if category in (entry[0], 'all')]
     
-    # 4. Scraper tests
-    if category in ('scrapers', 'all'):
-        print("\n=== Running Scraper Tests ===")
-        test_suites['scrapers'] = discover_tests('tests/scrapers')
-        result_scrapers = run_tests(test_suites['scrapers'], verbosity, failfast)
-        if not result_scrapers.wasSuccessful() and failfast:
-            return 1
+    # (tests run, failures, errors) for each category that ran
+    counts = []
     
-    # 5. GUI tests
-    if category in ('gui', 'all'):
-        print("\n=== Running GUI Tests ===")
-        test_suites['gui'] = discover_tests('tests/gui')
-        result_gui = run_tests(test_suites['gui'], verbosity, failfast)
-        if not result_gui.wasSuccessful() and failfast:
+    if parallel:
+        # Each module runs whole in one worker process, one per CPU, so its
+        # class fixtures and temporary files stay within that process; the
+        # output is printed in category order once done
+        with ProcessPoolExecutor() as executor:
+            futures = [
+                [executor.submit(run_module, module_name, verbosity, failfast)
+                 for module_name in find_test_modules(start_dir)]
+                for _, _, start_dir in selected
+            ]
+            for (_, title, _), category_futures in zip(selected, futures):
+                print(f"\n=== Running {title} ===")
+                sys.stdout.flush()
+                tests_run = failed = errors = 0
+                for future in category_futures:
+                    output, module_tests_run, module_failed, module_errors = future.result()
+                    sys.stderr.write(output)
+                    tests_run += module_tests_run
+                    failed += module_failed
+                    errors += module_errors
+                counts.append((tests_run, failed, errors))
+        
+        if failfast and any(failed or errors for _, failed, errors in counts):
             return 1
+    else:
+        for _, title, start_dir in selected:
+            print(f"\n=== Running {title} ===")
+            result = run_tests(discover_tests(start_dir), verbosity, failfast)
+            counts.append((result.testsRun, len(result.failures), len(result.errors)))
+            if not result.wasSuccessful() and failfast:
+                return 1
     
-    # Run all tests together if requested
+    # Summarize the results of all categories if requested
     if category == 'all':
         print("\n=== Summary ===")
-        all_tests = unittest.TestSuite()
-        for suite in test_suites.values():
-            all_tests.addTest(suite)
+        total_tests = sum(tests_run for tests_run, _, _ in counts)
+        failed = sum(failed for _, failed, _ in counts)
+        errors = sum(errors for _, _, errors in counts)
+        passed = total_tests - failed - errors
         
-        total_tests = all_tests.countTestCases()
         print(f"Total tests: {total_tests}")
-        
-        # Count passed and failed tests
-        passed = 0
-        failed = 0
-        errors = 0
-        
-        for suite_name, suite in test_suites.items():
-            suite_result = unittest.TestResult()
-            suite.run(suite_result)
-            passed += suite_result.testsRun - len(suite_result.failures) - len(suite_result.errors)
-            failed += len(suite_result.failures)
-            errors += len(suite_result.errors)
-        
         print(f"Passed: {passed}")
         print(f"Failed: {failed}")
         print(f"Errors: {errors}")
@@ -137,4 +172,4 @@ def main():
 
 
 if __name__ == '__main__':
-    sys.exit(main())
\ No newline at end of file
+    sys.exit(main())
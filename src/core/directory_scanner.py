@@ -5,7 +5,9 @@ This module provides functionality for scanning local directories and extracting
 
 import os
 import logging
-from typing import Dict, Any, List, Optional, Set, Callable
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Any, List, Optional, Set, Callable, Iterator
 from datetime import datetime
 
 from src.db.local_file_model import LocalFileModel
@@ -14,6 +16,37 @@ from src.core.file_validator import FileValidator
 
 logger = logging.getLogger(__name__)
 
+# Smallest number of files validated in worker processes; for fewer files,
+# starting the processes costs more than validating the files in turn
+PARALLEL_VALIDATION_MIN_FILES = 32
+
+# Number of files handed to a worker process at a time
+VALIDATION_CHUNK_SIZE = 8
+
+# File validator of the current worker process
+_worker_validator = None
+
+
+def _validate_files(file_paths: List[str], file_types: List[str]) -> List[Dict[str, Any]]:
+    """Validate a chunk of files in a worker process.
+    
+    Parsing PDF and EPUB files is CPU-bound Python code, so the scanner
+    validates large batches of files in a process pool.
+    
+    Args:
+        file_paths: Paths to the files to validate
+        file_types: Type of each file
+        
+    Returns:
+        List of dictionaries containing the validation results of the files
+    """
+    global _worker_validator
+    
+    if _worker_validator is None:
+        _worker_validator = FileValidator()
+    
+    return list(map(_worker_validator.validate_file, file_paths, file_types))
+
 
 class DirectoryScanner:
     """Scanner for extracting file information from local directories.
@@ -85,61 +118,27 @@ class DirectoryScanner:
             for ext_type in self.SUPPORTED_EXTENSIONS.values():
                 result["files_by_type"][ext_type] = 0
             
-            # Process each file
-            for i, file_path in enumerate(all_files):
-                # Check if cancellation was requested
-                if self.cancel_requested:
-                    result["cancelled"] = True
-                    break
-                
-                # Update progress
-                if progress_callback:
-                    progress_callback(i, len(all_files), file_path)
-                
-                try:
-                    # Get the file extension and type
-                    _, ext = os.path.splitext(file_path)
-                    file_type = self.SUPPORTED_EXTENSIONS.get(ext.lower())
-                    
-                    # Get the file size
-                    file_size = os.path.getsize(file_path)
-                    
-                    # Validate the file
-                    validation_result = self.file_validator.validate_file(file_path, file_type)
-                    
-                    # Only add valid files to the database
-                    if validation_result["valid"]:
-                        # Get the relative path from the root directory
-                        rel_path = os.path.relpath(file_path, root_dir)
-                        
-                        # Add or update the file in the database
-                        existing_file = self.local_file_model.get_file_by_path(file_path)
-                        
-                        if existing_file is None:
-                            # Add a new file
-                            self.local_file_model.add_file(
-                                path=file_path,
-                                size=file_size,
-                                file_type=file_type
-                            )
-                            result["files_added"] += 1
-                        else:
-                            # Update an existing file
-                            self.local_file_model.update_file(
-                                file_id=existing_file["id"],
-                                path=file_path,
-                                size=file_size,
-                                file_type=file_type,
-                                remote_file_id=existing_file.get("remote_file_id")
-                            )
-                            result["files_updated"] += 1
-                        
-                        # Update the file type count
-                        result["files_by_type"][file_type] = result["files_by_type"].get(file_type, 0) + 1
-                    else:
-                        logger.warning(f"Invalid file: {file_path} - {validation_result['error']}")
-                except Exception as e:
-                    logger.error(f"Error processing file {file_path}: {e}")
+            # Get the type of each file from its extension
+            file_types = [
+                self.SUPPORTED_EXTENSIONS[os.path.splitext(file_path)[1].lower()]
+                for file_path in all_files
+            ]
+            
+            # Validate large batches of files in worker processes; the
+            # results arrive in file order while the database is updated here
+            executor = None
+            if len(all_files) >= PARALLEL_VALIDATION_MIN_FILES:
+                executor = ProcessPoolExecutor(mp_context=multiprocessing.get_context("spawn"))
+                validation_results = self._validate_in_workers(executor, all_files, file_types)
+            else:
+                validation_results = map(self.file_validator.validate_file, all_files, file_types)
+            
+            try:
+                self._process_files(root_dir, all_files, file_types, validation_results,
+                                    result, progress_callback)
+            finally:
+                if executor is not None:
+                    executor.shutdown(cancel_futures=True)
             
             # Update the final progress
             if progress_callback and not result["cancelled"]:
@@ -152,6 +151,104 @@ class DirectoryScanner:
         
         return result
     
+    def _validate_in_workers(self, executor: ProcessPoolExecutor, all_files: List[str],
+                             file_types: List[str]) -> Iterator[Dict[str, Any]]:
+        """Validate files in worker processes.
+        
+        The files are handed to the workers in chunks. A chunk whose worker
+        failed, also because the pool broke, is validated in this process
+        instead, so that one failure doesn't end the scan.
+        
+        Args:
+            executor: Process pool to validate the files in
+            all_files: Paths of the files to validate
+            file_types: Type of each file
+            
+        Yields:
+            Dictionary containing the validation results of each file, in
+            file order
+        """
+        chunks = [
+            (all_files[i:i + VALIDATION_CHUNK_SIZE], file_types[i:i + VALIDATION_CHUNK_SIZE])
+            for i in range(0, len(all_files), VALIDATION_CHUNK_SIZE)
+        ]
+        futures = [executor.submit(_validate_files, file_paths, chunk_types)
+                   for file_paths, chunk_types in chunks]
+        
+        for future, (file_paths, chunk_types) in zip(futures, chunks):
+            try:
+                results = future.result()
+            except Exception as e:
+                logger.warning(f"Error validating files in a worker process, validating them here: {e}")
+                results = map(self.file_validator.validate_file, file_paths, chunk_types)
+            
+            yield from results
+    
+    def _process_files(self, root_dir: str, all_files: List[str], file_types: List[str],
+                       validation_results, result: Dict[str, Any],
+                       progress_callback: Optional[Callable[[int, int, str], None]]):
+        """Add or update the valid files in the database.
+        
+        Args:
+            root_dir: Root directory being scanned
+            all_files: Paths of the files found
+            file_types: Type of each file
+            validation_results: Iterator over the validation result of each file
+            result: Scan result dictionary to update
+            progress_callback: Callback function for progress updates (optional)
+        """
+        for i, (file_path, file_type) in enumerate(zip(all_files, file_types)):
+            # Check if cancellation was requested
+            if self.cancel_requested:
+                result["cancelled"] = True
+                break
+            
+            # Update progress
+            if progress_callback:
+                progress_callback(i, len(all_files), file_path)
+            
+            try:
+                # Get the validation result of the file; taken first so that
+                # the results stay in step with the files
+                validation_result = next(validation_results)
+                
+                # Get the file size
+                file_size = os.path.getsize(file_path)
+                
+                # Only add valid files to the database
+                if validation_result["valid"]:
+                    # Get the relative path from the root directory
+                    rel_path = os.path.relpath(file_path, root_dir)
+                    
+                    # Add or update the file in the database
+                    existing_file = self.local_file_model.get_file_by_path(file_path)
+                    
+                    if existing_file is None:
+                        # Add a new file
+                        self.local_file_model.add_file(
+                            path=file_path,
+                            size=file_size,
+                            file_type=file_type
+                        )
+                        result["files_added"] += 1
+                    else:
+                        # Update an existing file
+                        self.local_file_model.update_file(
+                            file_id=existing_file["id"],
+                            path=file_path,
+                            size=file_size,
+                            file_type=file_type,
+                            remote_file_id=existing_file.get("remote_file_id")
+                        )
+                        result["files_updated"] += 1
+                    
+                    # Update the file type count
+                    result["files_by_type"][file_type] = result["files_by_type"].get(file_type, 0) + 1
+                else:
+                    logger.warning(f"Invalid file: {file_path} - {validation_result['error']}")
+            except Exception as e:
+                logger.error(f"Error processing file {file_path}: {e}")
+    
     def cancel_scan(self):
         """Cancel the current scan operation."""
         self.cancel_requested = True
@@ -0,0 +1,192 @@
+"""Download cache for the PDF Downloader application.
+
+This module remembers the ETag and Last-Modified headers of downloaded files,
+so that a file can be downloaded again with a conditional request that
+transfers no body when the file hasn't changed.
+"""
+
+import os
+import json
+import logging
+import threading
+from typing import Dict, Any, Optional
+
+
+logger = logging.getLogger(__name__)
+
+
+class DownloadCache:
+    """Cache of the validators of downloaded files.
+    
+    Entries are keyed by URL and record the ETag and Last-Modified headers of
+    the response together with the path and size of the saved file. They are
+    kept in a JSON file, written again whenever an entry changes.
+    
+    The validators of partial downloads are kept as well, in memory only, so
+    a partial file left by an earlier run is downloaded again in full.
+    """
+    
+    # Name of the cache file in the download directory
+    FILE_NAME = ".download_cache.json"
+    
+    def __init__(self, cache_file: str):
+        """Initialize the download cache.
+        
+        Args:
+            cache_file: Path of the JSON file to keep the entries in
+        """
+        self.cache_file = cache_file
+        self.lock = threading.Lock()
+        self.entries: Dict[str, Dict[str, Any]] = self._load()
+        self.partials: Dict[str, Dict[str, Any]] = {}
+    
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        """Load the entries from the cache file.
+        
+        Returns:
+            Dictionary mapping URLs to entries, empty if the file is missing
+            or unreadable
+        """
+        if not os.path.exists(self.cache_file):
+            return {}
+        
+        try:
+            with open(self.cache_file, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Error loading download cache {self.cache_file}: {e}")
+            return {}
+    
+    def _save(self) -> None:
+        """Write the entries to the cache file.
+        
+        The entries are written to a temporary file first and moved into
+        place, so an interrupted write doesn't leave a truncated cache.
+        """
+        temp_file = f"{self.cache_file}.tmp"
+        
+        try:
+            with open(temp_file, "w", encoding="utf-8") as f:
+                json.dump(self.entries, f)
+            os.replace(temp_file, self.cache_file)
+        except OSError as e:
+            logger.warning(f"Error saving download cache {self.cache_file}: {e}")
+    
+    def get_conditional_headers(self, url: str, file_path: str) -> Dict[str, str]:
+        """Get the headers for a conditional request for a file.
+        
+        Headers are only returned if the file from the last download of the
+        URL is still at the given path with the same size, so that a 304
+        response can be answered with it.
+        
+        Args:
+            url: URL of the file
+            file_path: Path the file is saved to
+        
+        Returns:
+            Dictionary containing If-None-Match and If-Modified-Since headers,
+            empty if the file has to be downloaded in full
+        """
+        with self.lock:
+            entry = self.entries.get(url)
+        
+        if entry is None or entry["file_path"] != file_path:
+            return {}
+        
+        try:
+            if os.path.getsize(file_path) != entry["size"]:
+                return {}
+        except OSError:
+            return {}
+        
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        
+        return headers
+    
+    def update(self, url: str, file_path: str, size: int,
+               etag: Optional[str] = None, last_modified: Optional[str] = None) -> None:
+        """Record a completed download.
+        
+        Args:
+            url: URL of the file
+            file_path: Path the file was saved to
+            size: Size of the saved file in bytes
+            etag: ETag header of the response (optional)
+            last_modified: Last-Modified header of the response (optional)
+        """
+        with self.lock:
+            if etag or last_modified:
+                self.entries[url] = {
+                    "file_path": file_path,
+                    "size": size,
+                    "etag": etag,
+                    "last_modified": last_modified
+                }
+            elif self.entries.pop(url, None) is None:
+                # Without validators the file can't be checked later
+                return
+            
+            self._save()
+    
+    def get_range_headers(self, url: str, part_path: str, start: int) -> Dict[str, str]:
+        """Get the headers for a request for the rest of a partial download.
+        
+        The If-Range header makes the server send the whole file instead if
+        it has changed since the partial download started.
+        
+        Args:
+            url: URL of the file
+            part_path: Path of the partial file
+            start: Size of the partial file in bytes
+        
+        Returns:
+            Dictionary containing Range and If-Range headers, empty if the
+            partial file can't be resumed
+        """
+        with self.lock:
+            entry = self.partials.get(url)
+        
+        if entry is None or entry["part_path"] != part_path:
+            return {}
+        
+        # Weak ETags can't be used in If-Range
+        etag = entry["etag"]
+        validator = etag if etag and not etag.startswith("W/") else entry["last_modified"]
+        if not validator:
+            return {}
+        
+        return {"Range": f"bytes={start}-", "If-Range": validator}
+    
+    def update_partial(self, url: str, part_path: str,
+                       etag: Optional[str] = None, last_modified: Optional[str] = None) -> None:
+        """Record the start of a download that can be resumed.
+        
+        Args:
+            url: URL of the file
+            part_path: Path of the partial file
+            etag: ETag header of the response (optional)
+            last_modified: Last-Modified header of the response (optional)
+        """
+        with self.lock:
+            if etag or last_modified:
+                self.partials[url] = {
+                    "part_path": part_path,
+                    "etag": etag,
+                    "last_modified": last_modified
+                }
+            else:
+                # Without validators the partial file can't be resumed
+                self.partials.pop(url, None)
+    
+    def remove_partial(self, url: str) -> None:
+        """Forget the partial download of a URL.
+        
+        Args:
+            url: URL of the file
+        """
+        with self.lock:
+            self.partials.pop(url, None)
@@ -6,17 +6,112 @@ This module provides functionality for downloading files from remote sites.
 import os
 import logging
 import requests
+import threading
 import time
-from typing import Dict, Any, Optional, Callable
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import suppress
+from typing import Dict, Any, Optional, Callable, Iterable, Tuple
 from datetime import datetime
 from urllib.parse import urlparse
 
+from urllib3.exceptions import HTTPError, ProtocolError, ReadTimeoutError, SSLError
+
 from config import config
+from src.core.download_cache import DownloadCache
 from src.utils import network_utils
 
 
 logger = logging.getLogger(__name__)
 
+# Size of the buffer the body of a download is read into
+CHUNK_SIZE = 64 * 1024
+
+# Size of the window the chunks are gathered in, and written with one call
+WRITE_WINDOW = 1024 * 1024
+
+# Flags for opening a downloaded file for unbuffered writing; O_BINARY
+# keeps Windows from translating line endings
+WRITE_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0)
+
+# Flags for adding the rest of a resumed download to its partial file
+APPEND_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_APPEND | getattr(os, "O_BINARY", 0)
+
+# Suffix of a file being downloaded; it is renamed when the download completes,
+# and resumed from where it stopped if the download fails
+PART_SUFFIX = ".part"
+
+
+def _iter_chunks(response: requests.Response, chunk_size: int = CHUNK_SIZE):
+    """Iterate over the body of a streamed response.
+    
+    The body is read into one buffer that is reused for every chunk, instead
+    of allocating a new bytes object per chunk. Each chunk is only valid until
+    the next one is read. Compressed bodies are decoded by iter_content.
+    
+    Errors reading the body are raised as the requests exceptions iter_content
+    raises for them, so that they are retried like other request errors.
+    
+    Args:
+        response: Streamed response
+        chunk_size: Size of the chunks in bytes
+        
+    Yields:
+        Chunks of the body, as memoryviews of the buffer or as bytes
+        
+    Raises:
+        requests.exceptions.RequestException: If reading the body failed
+    """
+    raw = getattr(response, "raw", None)
+    if raw is None or not hasattr(raw, "readinto") or response.headers.get("Content-Encoding", "identity") != "identity":
+        yield from response.iter_content(chunk_size=chunk_size)
+        return
+    
+    buffer = bytearray(chunk_size)
+    view = memoryview(buffer)
+    while True:
+        try:
+            size = raw.readinto(buffer)
+        except ProtocolError as e:
+            # Includes bodies cut off before their Content-Length
+            raise requests.exceptions.ChunkedEncodingError(e)
+        except ReadTimeoutError as e:
+            raise requests.exceptions.ConnectionError(e)
+        except SSLError as e:
+            raise requests.exceptions.SSLError(e)
+        except HTTPError as e:
+            raise requests.exceptions.ConnectionError(e)
+        
+        if not size:
+            break
+        yield view[:size]
+
+
+def _continues_at(response: requests.Response, start: int) -> bool:
+    """Check whether a partial response continues a partial file.
+    
+    Args:
+        response: Response with status 206
+        start: Size of the partial file in bytes
+        
+    Returns:
+        True if the body is the unencoded rest of the file from start
+    """
+    return (response.headers.get("Content-Range", "").startswith(f"bytes {start}-")
+            and response.headers.get("Content-Encoding", "identity") == "identity")
+
+
+def _write_all(fd: int, data) -> None:
+    """Write all of a chunk to a file descriptor.
+    
+    Args:
+        fd: File descriptor to write to
+        data: Bytes-like chunk to write
+    """
+    view = memoryview(data)
+    while view:
+        written = os.write(fd, view)
+        view = view[written:]
+
 
 class FileDownloader:
     """Downloader for retrieving files from remote sites.
@@ -33,6 +128,97 @@ class FileDownloader:
         
         # Create the download directory if it doesn't exist
         os.makedirs(self.download_dir, exist_ok=True)
+        
+        # Validators of earlier downloads, for conditional requests
+        self.cache = DownloadCache(os.path.join(self.download_dir, DownloadCache.FILE_NAME))
+        
+        # Locks of the paths files are saved to, so that URLs with the same
+        # file name are downloaded one after another
+        self._path_locks: Dict[str, threading.Lock] = {}
+        self._path_locks_lock = threading.Lock()
+    
+    def _lock_path(self, file_path: str) -> threading.Lock:
+        """Get the lock of a path files are saved to.
+        
+        Args:
+            file_path: Path the file is saved to
+            
+        Returns:
+            Lock held while a file is downloaded to the path
+        """
+        with self._path_locks_lock:
+            return self._path_locks.setdefault(file_path, threading.Lock())
+    
+    def _request(self, url: str, file_path: str, part_path: str) -> Tuple[requests.Response, int]:
+        """Send the request for a download.
+        
+        The rest of a partial download is asked for if the validators of the
+        response it came from are known. If the server sends something other
+        than the unencoded rest of the same file, the partial file is
+        forgotten and the whole file is asked for again.
+        
+        The session doesn't retry the request, as download_file retries the
+        whole download.
+        
+        Args:
+            url: URL of the file
+            file_path: Path the file is saved to
+            part_path: Path of the partial file
+            
+        Returns:
+            Tuple of the streamed response and the size of the partial file
+            its body continues, 0 if the body is the whole file
+        """
+        # Ask for the file only if it changed since the last download
+        headers = self.cache.get_conditional_headers(url, file_path)
+        
+        # Ask only for the rest of a partial download, unencoded so that it
+        # continues the bytes in the partial file
+        start = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+        range_headers = self.cache.get_range_headers(url, part_path, start) if start else {}
+        if range_headers:
+            response = network_utils.get(url, stream=True, retry=False, headers={
+                **headers, **range_headers, "Accept-Encoding": "identity"
+            })
+            if response.status_code == 206 and _continues_at(response, start):
+                return response, start
+            if response.status_code not in (206, 416):
+                # Includes the whole file, sent if it changed
+                return response, 0
+            
+            # Start again if the partial download can't be resumed
+            response.close()
+            self.cache.remove_partial(url)
+            logger.info(f"Can't resume the download of {url}, downloading it again")
+        
+        return network_utils.get(url, stream=True, retry=False, headers=headers), 0
+    
+    def get_file_path(self, url: str, file_name: Optional[str] = None,
+                      file_type: Optional[str] = None,
+                      category_id: Optional[int] = None) -> str:
+        """Get the path a file is saved to.
+        
+        Args:
+            url: URL of the file
+            file_name: Name to save the file as (optional, defaults to URL filename)
+            file_type: Type of the file (e.g., 'pdf', 'epub')
+            category_id: ID of the category to save the file in (optional)
+            
+        Returns:
+            Path of the file in the download directory
+        """
+        # Determine the file name if not provided
+        if file_name is None:
+            file_name = os.path.basename(urlparse(url).path)
+            if not file_name:
+                file_name = f"download_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{file_type or 'pdf'}"
+        
+        # Use category_id as a subdirectory
+        save_dir = self.download_dir
+        if category_id:
+            save_dir = os.path.join(save_dir, f"category_{category_id}")
+        
+        return os.path.join(save_dir, file_name)
     
     def download_file(self, url: str, file_name: Optional[str] = None, 
                      file_type: Optional[str] = None,
@@ -41,6 +227,11 @@ class FileDownloader:
                      rate_limit: Optional[int] = None) -> Dict[str, Any]:
         """Download a file from a URL.
         
+        The file is downloaded to a partial file next to it, which replaces
+        the file once complete. If the download fails, the partial file is
+        kept, and the next attempt asks only for the rest of the file if it
+        hasn't changed.
+        
         Args:
             url: URL of the file to download
             file_name: Name to save the file as (optional, defaults to URL filename)
@@ -50,7 +241,8 @@ class FileDownloader:
             rate_limit: Rate limit in KB/s (optional)
             
         Returns:
-            Dictionary containing download results
+            Dictionary containing download results; not_modified is set if
+            the file saved by an earlier download was kept
         """
         # Use the global rate limit if none is specified
         if rate_limit is None:
@@ -68,89 +260,206 @@ class FileDownloader:
         }
         
         try:
-            # Determine the file name if not provided
-            if file_name is None:
-                file_name = os.path.basename(urlparse(url).path)
-                if not file_name:
-                    file_name = f"download_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{file_type or 'pdf'}"
-            
-            # Determine the save directory
-            save_dir = self.download_dir
+            # Determine the file path, creating the category's directory
+            file_path = self.get_file_path(url, file_name, file_type, category_id)
             if category_id:
-                # Use category_id as a subdirectory
-                category_dir = f"category_{category_id}"
-                save_dir = os.path.join(save_dir, category_dir)
-                os.makedirs(save_dir, exist_ok=True)
-            
-            # Determine the file path
-            file_path = os.path.join(save_dir, file_name)
+                os.makedirs(os.path.dirname(file_path), exist_ok=True)
             result["file_path"] = file_path
+            part_path = file_path + PART_SUFFIX
             
-            # Download the file with retries
-            for attempt in range(self.retry_count + 1):
-                try:
-                    # Start the download using network_utils
-                    with network_utils.get(url, stream=True) as response:
-                        # Check if the request was successful
-                        response.raise_for_status()
-                        
-                        # Get the file size
-                        file_size = int(response.headers.get("Content-Length", 0))
-                        result["file_size"] = file_size
-                        
-                        # Download the file in chunks with rate limiting
-                        downloaded = 0
-                        start_time = time.time()
-                        chunk_size = 8192  # 8 KB chunks
-                        
-                        with open(file_path, "wb") as f:
-                            for chunk in response.iter_content(chunk_size=chunk_size):
-                                if chunk:
-                                    # Apply rate limiting if specified
-                                    if rate_limit:
-                                        # Calculate the expected time for this chunk at the rate limit
-                                        chunk_size_kb = len(chunk) / 1024
-                                        expected_time = chunk_size_kb / rate_limit
+            # Download the file with retries, one download of the path at a time
+            with self._lock_path(file_path):
+                for attempt in range(self.retry_count + 1):
+                    try:
+                        # Start the download using network_utils
+                        response, start = self._request(url, file_path, part_path)
+                        with response:
+                            # Keep the saved file if it hasn't changed
+                            if response.status_code == 304:
+                                # A partial download of it is no longer needed
+                                self.cache.remove_partial(url)
+                                with suppress(FileNotFoundError):
+                                    os.remove(part_path)
+                                
+                                result["file_size"] = os.path.getsize(file_path)
+                                result["not_modified"] = True
+                                if progress_callback:
+                                    progress_callback(100)
+                                
+                                result["success"] = True
+                                logger.info(f"{url} not modified since it was downloaded to {file_path}")
+                                break
+                            
+                            # Check if the request was successful
+                            response.raise_for_status()
+                            
+                            # Remember the validators of the file, so that a retry can
+                            # resume it; not for encoded bodies, as the partial file
+                            # holds their decoded bytes
+                            if response.headers.get("Content-Encoding", "identity") == "identity":
+                                self.cache.update_partial(
+                                    url, part_path,
+                                    response.headers.get("ETag"),
+                                    response.headers.get("Last-Modified")
+                                )
+                            else:
+                                self.cache.remove_partial(url)
+                            
+                            # Get the file size
+                            content_length = int(response.headers.get("Content-Length", 0))
+                            file_size = start + content_length if content_length else 0
+                            result["file_size"] = file_size
+                            
+                            # Download the file in chunks with rate limiting
+                            downloaded = start
+                            start_time = time.time()
+                            
+                            # Report progress once per percent rather than per chunk
+                            progress_step = file_size / 100
+                            reported = start
+                            
+                            # Gather the chunks in a window and write it straight to the
+                            # file descriptor when full, with one system call per window
+                            window = bytearray(WRITE_WINDOW)
+                            window_view = memoryview(window)
+                            filled = 0
+                            
+                            fd = os.open(part_path, APPEND_FLAGS if start else WRITE_FLAGS, 0o644)
+                            try:
+                                for chunk in _iter_chunks(response):
+                                    if chunk:
+                                        # Apply rate limiting if specified
+                                        if rate_limit:
+                                            # Calculate the expected time for this chunk at the rate limit
+                                            chunk_size_kb = len(chunk) / 1024
+                                            expected_time = chunk_size_kb / rate_limit
+                                            
+                                            # Calculate the elapsed time
+                                            elapsed = time.time() - start_time
+                                            
+                                            # Sleep if we're going too fast
+                                            if elapsed < expected_time:
+                                                time.sleep(expected_time - elapsed)
+                                            
+                                            # Reset the start time
+                                            start_time = time.time()
+                                        
+                                        # Write the window first if the chunk doesn't fit
+                                        size = len(chunk)
+                                        if filled + size > WRITE_WINDOW:
+                                            # Empty the window first, so that it isn't written
+                                            # again below if the write fails
+                                            full, filled = filled, 0
+                                            _write_all(fd, window_view[:full])
                                         
-                                        # Calculate the elapsed time
-                                        elapsed = time.time() - start_time
+                                        # Add the chunk to the window, or write it if it is
+                                        # larger than the window
+                                        if size > WRITE_WINDOW:
+                                            _write_all(fd, chunk)
+                                        else:
+                                            window[filled:filled + size] = chunk
+                                            filled += size
                                         
-                                        # Sleep if we're going too fast
-                                        if elapsed < expected_time:
-                                            time.sleep(expected_time - elapsed)
+                                        downloaded += size
                                         
-                                        # Reset the start time
-                                        start_time = time.time()
-                                    
-                                    # Write the chunk
-                                    f.write(chunk)
-                                    downloaded += len(chunk)
-                                    
-                                    # Update progress
-                                    if progress_callback and file_size > 0:
-                                        progress = (downloaded / file_size) * 100
-                                        progress_callback(progress)
-                    
-                    # Download successful
-                    result["success"] = True
-                    logger.info(f"Downloaded {url} to {file_path}")
-                    break
-                except requests.exceptions.RequestException as e:
-                    if attempt < self.retry_count:
-                        logger.warning(f"Download attempt {attempt + 1} failed for {url}: {e}")
-                        # Wait before retrying
-                        time.sleep(self.retry_delay)
-                    else:
-                        raise
+                                        # Update progress
+                                        if progress_callback and file_size > 0 and (
+                                                downloaded - reported >= progress_step or downloaded >= file_size):
+                                            reported = downloaded
+                                            progress = (downloaded / file_size) * 100
+                                            progress_callback(progress)
+                            finally:
+                                # Write the rest of the window, also if the download
+                                # failed, so that a retry resumes after it
+                                try:
+                                    _write_all(fd, window_view[:filled])
+                                finally:
+                                    os.close(fd)
+                            
+                            # Replace the file with the complete download
+                            os.replace(part_path, file_path)
+                            self.cache.remove_partial(url)
+                            
+                            # Remember the validators for the next download
+                            self.cache.update(
+                                url, file_path, downloaded,
+                                response.headers.get("ETag"),
+                                response.headers.get("Last-Modified")
+                            )
+                        
+                        # Download successful
+                        result["success"] = True
+                        logger.info(f"Downloaded {url} to {file_path}")
+                        break
+                    except requests.exceptions.RequestException as e:
+                        if attempt < self.retry_count:
+                            logger.warning(f"Download attempt {attempt + 1} failed for {url}: {e}")
+                            # Wait before retrying
+                            time.sleep(self.retry_delay)
+                        else:
+                            raise
         except Exception as e:
             logger.error(f"Error downloading {url}: {e}")
             result["error"] = str(e)
+        
+        return result
+    
+    def download_files(self, urls: Iterable[str],
+                       category_id: Optional[int] = None,
+                       max_workers: Optional[int] = None) -> Dict[str, Dict[str, Any]]:
+        """Download several files at the same time.
+        
+        The files are downloaded with download_file in a pool of threads, so
+        that the requests wait for the network side by side, reusing the
+        connections of the shared session.
+        
+        URLs saved to the same path as an earlier URL in the list, because
+        their file names are the same, fail without being downloaded, instead
+        of replacing the earlier file.
+        
+        Args:
+            urls: URLs of the files to download
+            category_id: ID of the category to save the files in (optional)
+            max_workers: Number of files to download at the same time (optional,
+                         defaults to the number of concurrent downloads)
             
-            # Remove the file if it was partially downloaded
-            if result["file_path"] and os.path.exists(result["file_path"]):
-                try:
-                    os.remove(result["file_path"])
-                except Exception as remove_error:
-                    logger.error(f"Error removing partial download {result['file_path']}: {remove_error}")
-        
-        return result
\ No newline at end of file
+        Returns:
+            Dictionary mapping each URL to the results of its download
+        """
+        urls = list(dict.fromkeys(urls))
+        if not urls:
+            return {}
+        
+        # Determine each file's path once, keeping the first URL of each path
+        results = {}
+        file_paths = {}
+        for url in urls:
+            file_path = self.get_file_path(url, category_id=category_id)
+            if file_path in file_paths.values():
+                results[url] = {
+                    "success": False,
+                    "url": url,
+                    "file_path": file_path,
+                    "file_size": None,
+                    "error": f"Another URL is saved to {file_path}"
+                }
+                logger.error(f"Not downloading {url}: another URL is saved to {file_path}")
+            else:
+                results[url] = None
+                file_paths[url] = file_path
+        
+        if max_workers is None:
+            max_workers = config.get("download", "concurrent_downloads", 3)
+        
+        # More threads than the session has connections would only wait for one
+        max_workers = max(1, min(max_workers, network_utils.POOL_SIZE, len(file_paths)))
+        
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="FileDownloader") as executor:
+            downloads = executor.map(
+                lambda url: self.download_file(url, file_name=os.path.basename(file_paths[url]),
+                                               category_id=category_id),
+                file_paths
+            )
+            results.update(zip(file_paths, downloads))
+        
+        return results
\ No newline at end of file
@@ -12,6 +12,68 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# Path of the application database, used when no other path is given
+DEFAULT_DB_PATH = "database/pdf_downloader.db"
+
+# Full-text indexes of the schema; filled from their file tables when they are
+# added to an existing database
+FTS_TABLES = ("remote_files_fts", "local_files_fts")
+
+# Shortest search text the trigram full-text indexes can match
+MIN_FTS_SEARCH_LENGTH = 3
+
+
+def _has_trigram_tokenizer() -> bool:
+    """Check whether SQLite's FTS5 has the trigram tokenizer.
+    
+    The tokenizer was added in SQLite 3.34, and FTS5 itself can be left out of
+    a build, so a trial table is created in an in-memory database.
+    
+    Returns:
+        True if trigram full-text indexes can be created
+    """
+    conn = sqlite3.connect(":memory:")
+    try:
+        conn.execute("CREATE VIRTUAL TABLE trial USING fts5(text, tokenize='trigram')")
+        return True
+    except sqlite3.Error:
+        return False
+    finally:
+        conn.close()
+
+
+# Whether the schema has the full-text indexes; without them, searches match
+# all texts with LIKE
+FTS_ENABLED = _has_trigram_tokenizer()
+
+
+def fts_phrase(text: str) -> str:
+    """Quote a search text as an FTS5 phrase.
+    
+    Args:
+        text: Text to search for
+        
+    Returns:
+        Phrase matching the text literally
+    """
+    return '"' + text.replace('"', '""') + '"'
+
+
+def like_pattern(text: str) -> str:
+    """Build a LIKE pattern matching values that contain a text.
+    
+    The pattern escapes wildcards with a backslash, so queries using it
+    need ESCAPE '\\'.
+    
+    Args:
+        text: Text to search for
+        
+    Returns:
+        LIKE pattern
+    """
+    escaped = text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
 
 class DatabaseManager:
     """Manages database connections and provides query methods.
@@ -20,13 +82,14 @@ class DatabaseManager:
     and provides methods for common database operations.
     """
     
-    def __init__(self, db_path: str = "database/pdf_downloader.db"):
+    def __init__(self, db_path: Optional[str] = None):
         """Initialize the database manager with the given database path.
         
         Args:
-            db_path: Path to the SQLite database file
+            db_path: Path to the SQLite database file (optional, defaults to
+                     DEFAULT_DB_PATH)
         """
-        self.db_path = Path(db_path)
+        self.db_path = Path(db_path or DEFAULT_DB_PATH)
         self.connection: Optional[sqlite3.Connection] = None
         
     def connect(self) -> sqlite3.Connection:
@@ -56,12 +119,28 @@ class DatabaseManager:
         conn = self.connect()
         cursor = conn.cursor()
         
+        # Note the tables that exist before the schema is applied
+        cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table'")
+        existing_tables = {row[0] for row in cursor.fetchall()}
+        
         # Read schema from file
         schema_path = Path("database/schema.sql")
         if schema_path.exists():
             with open(schema_path, "r") as f:
                 schema_sql = f.read()
                 cursor.executescript(schema_sql)
+            
+            # Add the full-text indexes if SQLite supports them
+            if FTS_ENABLED:
+                with open(Path("database/fts_schema.sql"), "r") as f:
+                    cursor.executescript(f.read())
+                
+                # Index the files already in the database
+                for table in FTS_TABLES:
+                    if table not in existing_tables:
+                        cursor.execute(f"INSERT INTO {table} ({table}) VALUES ('rebuild')")
+            else:
+                logger.warning("SQLite has no FTS5 trigram tokenizer; file searches use LIKE")
         else:
             logger.error(f"Schema file not found: {schema_path}")
             raise FileNotFoundError(f"Schema file not found: {schema_path}")
@@ -69,6 +148,18 @@ class DatabaseManager:
         conn.commit()
         logger.info("Database schema initialized")
     
+    def table_exists(self, table: str) -> bool:
+        """Check whether a table exists in the database.
+        
+        Args:
+            table: Name of the table
+            
+        Returns:
+            True if the table exists, False otherwise
+        """
+        cursor = self.execute_query("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (table,))
+        return cursor.fetchone() is not None
+    
     def initialize_database(self) -> None:
         """Initialize the database for the application.
         
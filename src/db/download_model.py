@@ -8,7 +8,7 @@ import sqlite3
 from typing import Dict, Any, List, Optional
 from datetime import datetime
 
-from src.db.database import Database
+from src.db.database import DatabaseManager
 
 
 logger = logging.getLogger(__name__)
@@ -23,7 +23,7 @@ class DownloadModel:
     
     def __init__(self):
         """Initialize the download model."""
-        self.db = Database()
+        self.db_manager = DatabaseManager()
     
     def create_download(self, remote_file_id: int) -> int:
         """Create a new download record.
@@ -46,7 +46,8 @@ class DownloadModel:
             params = (remote_file_id, "pending", timestamp)
             
             # Execute the query
-            cursor = self.db.execute_query(query, params)
+            cursor = self.db_manager.execute_query(query, params)
+            self.db_manager.commit()
             download_id = cursor.lastrowid
             
             logger.info(f"Created download record {download_id} for remote file {remote_file_id}")
@@ -77,7 +78,8 @@ class DownloadModel:
             params = ("in_progress", timestamp, download_id)
             
             # Execute the query
-            self.db.execute_query(query, params)
+            self.db_manager.execute_query(query, params)
+            self.db_manager.commit()
             
             logger.info(f"Updated download record {download_id} as started")
             return True
@@ -108,7 +110,8 @@ class DownloadModel:
             params = ("completed", timestamp, local_file_id, download_id)
             
             # Execute the query
-            self.db.execute_query(query, params)
+            self.db_manager.execute_query(query, params)
+            self.db_manager.commit()
             
             logger.info(f"Updated download record {download_id} as completed")
             return True
@@ -139,7 +142,8 @@ class DownloadModel:
             params = ("failed", timestamp, error_message, download_id)
             
             # Execute the query
-            self.db.execute_query(query, params)
+            self.db_manager.execute_query(query, params)
+            self.db_manager.commit()
             
             logger.info(f"Updated download record {download_id} as failed")
             return True
@@ -157,23 +161,19 @@ class DownloadModel:
             Download record as a dictionary, or None if not found
         """
         try:
-            # Get the download record
-            query = "SELECT * FROM downloads WHERE id = ?"
+            # Get the download record with the name of its remote file
+            query = """
+            SELECT d.*, COALESCE(r.name, 'Unknown') AS file_name
+            FROM downloads d
+            LEFT JOIN remote_files r ON r.id = d.remote_file_id
+            WHERE d.id = ?
+            """
             params = (download_id,)
             
             # Execute the query
-            result = self.db.fetch_one(query, params)
-            
-            if result:
-                # Get the file name from the remote file
-                from src.db.remote_file_model import RemoteFileModel
-                remote_file_model = RemoteFileModel()
-                remote_file = remote_file_model.get_file_by_id(result["remote_file_id"])
-                
-                if remote_file:
-                    result["file_name"] = remote_file["name"]
-                else:
-                    result["file_name"] = "Unknown"
+            cursor = self.db_manager.execute_query(query, params)
+            row = cursor.fetchone()
+            result = dict(row) if row is not None else None
             
             return result
         except sqlite3.Error as e:
@@ -187,31 +187,26 @@ class DownloadModel:
             limit: Maximum number of records to return
             
         Returns:
-            List of download records as dictionaries
+            List of download records as dictionaries, with the file_name of
+            the remote file and the file_path of the local file, if any
         """
         try:
-            # Get the download records
+            # Get the download records with the names of their remote files
+            # and the paths of their local files
             query = """
-            SELECT * FROM downloads
-            ORDER BY created_at DESC
+            SELECT d.*, COALESCE(r.name, 'Unknown') AS file_name, l.path AS file_path
+            FROM downloads d
+            LEFT JOIN remote_files r ON r.id = d.remote_file_id
+            LEFT JOIN local_files l ON l.id = d.local_file_id
+            ORDER BY d.created_at DESC
             LIMIT ?
             """
             params = (limit,)
             
             # Execute the query
-            results = self.db.fetch_all(query, params)
-            
-            # Get the file names from the remote files
-            from src.db.remote_file_model import RemoteFileModel
-            remote_file_model = RemoteFileModel()
-            
-            for result in results:
-                remote_file = remote_file_model.get_file_by_id(result["remote_file_id"])
-                
-                if remote_file:
-                    result["file_name"] = remote_file["name"]
-                else:
-                    result["file_name"] = "Unknown"
+            cursor = self.db_manager.execute_query(query, params)
+            rows = cursor.fetchall()
+            results = [dict(row) for row in rows]
             
             return results
         except sqlite3.Error as e:
@@ -229,7 +224,9 @@ class DownloadModel:
             query = "SELECT * FROM downloads WHERE status = 'pending' ORDER BY created_at ASC"
             
             # Execute the query
-            results = self.db.fetch_all(query)
+            cursor = self.db_manager.execute_query(query)
+            rows = cursor.fetchall()
+            results = [dict(row) for row in rows]
             
             return results
         except sqlite3.Error as e:
@@ -247,7 +244,9 @@ class DownloadModel:
             query = "SELECT * FROM downloads WHERE status = 'in_progress' ORDER BY started_at ASC"
             
             # Execute the query
-            results = self.db.fetch_all(query)
+            cursor = self.db_manager.execute_query(query)
+            rows = cursor.fetchall()
+            results = [dict(row) for row in rows]
             
             return results
         except sqlite3.Error as e:
@@ -269,7 +268,8 @@ class DownloadModel:
             params = (download_id,)
             
             # Execute the query
-            self.db.execute_query(query, params)
+            self.db_manager.execute_query(query, params)
+            self.db_manager.commit()
             
             logger.info(f"Deleted download record {download_id}")
             return True
@@ -292,7 +292,9 @@ class DownloadModel:
             params = (status,)
             
             # Execute the query
-            result = self.db.fetch_one(query, params)
+            cursor = self.db_manager.execute_query(query, params)
+            row = cursor.fetchone()
+            result = dict(row) if row is not None else None
             
             return result["COUNT(*)"] if result else 0
         except sqlite3.Error as e:
@@ -4,11 +4,11 @@ This module provides database models and operations for managing local files.
 """
 
 import sqlite3
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime
 import os
 
-from src.db.database import DatabaseManager
+from src.db.database import DatabaseManager, FTS_ENABLED, MIN_FTS_SEARCH_LENGTH, fts_phrase, like_pattern
 
 
 class LocalFileModel:
@@ -209,6 +209,99 @@ class LocalFileModel:
         
         return files
     
+    def get_files_page(self, limit: int, after: Optional[Tuple[str, int]] = None,
+                       file_type: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Get one page of local files, in path order.
+        
+        Pages are keyed on the path and ID of the last file of the previous
+        page rather than an offset, so each page is read straight from the
+        path index however far into the list it is.
+        
+        Args:
+            limit: Maximum number of files to get
+            after: Path and ID of the last file of the previous page, or None
+                for the first page
+            file_type: Type of the files to get, or None for all types
+            
+        Returns:
+            List of dictionaries containing file information
+        """
+        conditions = []
+        params = []
+        
+        if after is not None:
+            conditions.append("(path, id) > (?, ?)")
+            params.extend(after)
+        
+        if file_type:
+            conditions.append("file_type = ?")
+            params.append(file_type)
+        
+        where_clause = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        params.append(limit)
+        
+        conn = self.db_manager.connect()
+        cursor = conn.cursor()
+        
+        cursor.execute(f"""
+            SELECT id, remote_file_id, path, size, file_type, last_checked, created_at, updated_at
+            FROM local_files
+            {where_clause}
+            ORDER BY path, id
+            LIMIT ?
+        """, tuple(params))
+        
+        # Convert row objects to dictionaries
+        files = [dict(row) for row in cursor.fetchall()]
+        
+        return files
+    
+    def search_files(self, search_text: str, file_type: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Search local files by path.
+        
+        A file matches if its path contains the search text, ignoring case.
+        Texts of three or more characters are looked up in the full-text
+        index; shorter ones, and all texts if SQLite has no full-text
+        indexes, are matched with LIKE.
+        
+        Args:
+            search_text: Text to search for
+            file_type: Type of the files to search, or None for all types
+            
+        Returns:
+            List of dictionaries containing file information
+        """
+        conditions = []
+        params = []
+        
+        if FTS_ENABLED and len(search_text) >= MIN_FTS_SEARCH_LENGTH:
+            conditions.append("id IN (SELECT rowid FROM local_files_fts WHERE local_files_fts MATCH ?)")
+            params.append(fts_phrase(search_text))
+        elif search_text:
+            conditions.append("path LIKE ? ESCAPE '\\'")
+            params.append(like_pattern(search_text))
+        
+        if file_type:
+            conditions.append("file_type = ?")
+            params.append(file_type)
+        
+        where_clause = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        
+        conn = self.db_manager.connect()
+        cursor = conn.cursor()
+        
+        cursor.execute(f"""
+            SELECT id, remote_file_id, path, size, file_type, last_checked, created_at, updated_at
+            FROM local_files
+            {where_clause}
+            ORDER BY path
+        """, tuple(params))
+        
+        # Convert row objects to dictionaries
+        files = [dict(row) for row in cursor.fetchall()]
+        
+        return files
+    
     def get_file_count(self) -> int:
         """Get the total number of local files in the database.
         
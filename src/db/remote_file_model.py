@@ -4,10 +4,10 @@ This module provides database models and operations for managing remote files.
 """
 
 import sqlite3
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime
 
-from src.db.database import DatabaseManager
+from src.db.database import DatabaseManager, FTS_ENABLED, MIN_FTS_SEARCH_LENGTH, fts_phrase, like_pattern
 
 
 class RemoteFileModel:
@@ -30,7 +30,7 @@ class RemoteFileModel:
         cursor = conn.cursor()
         
         cursor.execute("""
-            SELECT id, site_id, url, name, size, file_type, category, last_checked, created_at, updated_at
+            SELECT id, site_id, url, name, size, file_type, category_id, last_checked, created_at, updated_at
             FROM remote_files
             ORDER BY name
         """)
@@ -53,7 +53,7 @@ class RemoteFileModel:
         cursor = conn.cursor()
         
         cursor.execute("""
-            SELECT id, site_id, url, name, size, file_type, category, last_checked, created_at, updated_at
+            SELECT id, site_id, url, name, size, file_type, category_id, last_checked, created_at, updated_at
             FROM remote_files
             WHERE id = ?
         """, (file_id,))
@@ -77,7 +77,7 @@ class RemoteFileModel:
         cursor = conn.cursor()
         
         cursor.execute("""
-            SELECT id, site_id, url, name, size, file_type, category, last_checked, created_at, updated_at
+            SELECT id, site_id, url, name, size, file_type, category_id, last_checked, created_at, updated_at
             FROM remote_files
             WHERE url = ?
         """, (url,))
@@ -101,7 +101,7 @@ class RemoteFileModel:
         cursor = conn.cursor()
         
         cursor.execute("""
-            SELECT id, site_id, url, name, size, file_type, category, last_checked, created_at, updated_at
+            SELECT id, site_id, url, name, size, file_type, category_id, last_checked, created_at, updated_at
             FROM remote_files
             WHERE site_id = ?
             ORDER BY name
@@ -112,8 +112,113 @@ class RemoteFileModel:
         
         return files
     
+    def get_files_page(self, limit: int, after: Optional[Tuple[str, int]] = None,
+                       site_id: Optional[int] = None,
+                       file_type: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Get one page of remote files, in name order.
+        
+        Pages are keyed on the name and ID of the last file of the previous
+        page rather than an offset, so each page is read straight from the
+        name index however far into the list it is.
+        
+        Args:
+            limit: Maximum number of files to get
+            after: Name and ID of the last file of the previous page, or None
+                for the first page
+            site_id: ID of the site to get the files of, or None for all sites
+            file_type: Type of the files to get, or None for all types
+            
+        Returns:
+            List of dictionaries containing file information
+        """
+        conditions = []
+        params = []
+        
+        if after is not None:
+            conditions.append("(name, id) > (?, ?)")
+            params.extend(after)
+        
+        if site_id is not None:
+            conditions.append("site_id = ?")
+            params.append(site_id)
+        
+        if file_type:
+            conditions.append("file_type = ?")
+            params.append(file_type)
+        
+        where_clause = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        params.append(limit)
+        
+        conn = self.db_manager.connect()
+        cursor = conn.cursor()
+        
+        cursor.execute(f"""
+            SELECT id, site_id, url, name, size, file_type, category_id, last_checked, created_at, updated_at
+            FROM remote_files
+            {where_clause}
+            ORDER BY name, id
+            LIMIT ?
+        """, tuple(params))
+        
+        # Convert row objects to dictionaries
+        files = [dict(row) for row in cursor.fetchall()]
+        
+        return files
+    
+    def search_files(self, search_text: str, site_id: Optional[int] = None,
+                     file_type: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Search remote files by name.
+        
+        A file matches if its name contains the search text, ignoring case.
+        Texts of three or more characters are looked up in the full-text
+        index; shorter ones, and all texts if SQLite has no full-text
+        indexes, are matched with LIKE.
+        
+        Args:
+            search_text: Text to search for
+            site_id: ID of the site to search, or None for all sites
+            file_type: Type of the files to search, or None for all types
+            
+        Returns:
+            List of dictionaries containing file information
+        """
+        conditions = []
+        params = []
+        
+        if FTS_ENABLED and len(search_text) >= MIN_FTS_SEARCH_LENGTH:
+            conditions.append("id IN (SELECT rowid FROM remote_files_fts WHERE remote_files_fts MATCH ?)")
+            params.append(fts_phrase(search_text))
+        elif search_text:
+            conditions.append("name LIKE ? ESCAPE '\\'")
+            params.append(like_pattern(search_text))
+        
+        if site_id is not None:
+            conditions.append("site_id = ?")
+            params.append(site_id)
+        
+        if file_type:
+            conditions.append("file_type = ?")
+            params.append(file_type)
+        
+        where_clause = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        
+        conn = self.db_manager.connect()
+        cursor = conn.cursor()
+        
+        cursor.execute(f"""
+            SELECT id, site_id, url, name, size, file_type, category_id, last_checked, created_at, updated_at
+            FROM remote_files
+            {where_clause}
+            ORDER BY name
+        """, tuple(params))
+        
+        # Convert row objects to dictionaries
+        files = [dict(row) for row in cursor.fetchall()]
+        
+        return files
+    
     def add_file(self, site_id: int, url: str, name: str, size: int, file_type: str,
-                category: str = "") -> int:
+                category_id: Optional[int] = None) -> int:
         """Add a new remote file to the database.
         
         Args:
@@ -122,7 +227,7 @@ class RemoteFileModel:
             name: Name of the file
             size: Size of the file in bytes
             file_type: Type of the file (e.g., 'pdf', 'epub')
-            category: Category of the file (optional)
+            category_id: ID of the category the file belongs to (optional)
             
         Returns:
             ID of the newly added file
@@ -136,15 +241,15 @@ class RemoteFileModel:
         now = datetime.now().isoformat()
         
         cursor.execute("""
-            INSERT INTO remote_files (site_id, url, name, size, file_type, category, last_checked)
+            INSERT INTO remote_files (site_id, url, name, size, file_type, category_id, last_checked)
             VALUES (?, ?, ?, ?, ?, ?, ?)
-        """, (site_id, url, name, size, file_type, category, now))
+        """, (site_id, url, name, size, file_type, category_id, now))
         
         conn.commit()
         return cursor.lastrowid
     
     def update_file(self, file_id: int, site_id: int, url: str, name: str, size: int,
-                   file_type: str, category: str = "") -> bool:
+                   file_type: str, category_id: Optional[int] = None) -> bool:
         """Update an existing remote file in the database.
         
         Args:
@@ -154,7 +259,7 @@ class RemoteFileModel:
             name: New name for the file
             size: New size for the file in bytes
             file_type: New type for the file
-            category: New category for the file (optional)
+            category_id: New category ID for the file (optional)
             
         Returns:
             True if the file was updated, False if the file was not found
@@ -169,9 +274,9 @@ class RemoteFileModel:
         
         cursor.execute("""
             UPDATE remote_files
-            SET site_id = ?, url = ?, name = ?, size = ?, file_type = ?, category = ?, last_checked = ?
+            SET site_id = ?, url = ?, name = ?, size = ?, file_type = ?, category_id = ?, last_checked = ?
             WHERE id = ?
-        """, (site_id, url, name, size, file_type, category, now, file_id))
+        """, (site_id, url, name, size, file_type, category_id, now, file_id))
         
         conn.commit()
         return cursor.rowcount > 0
@@ -271,7 +376,7 @@ class RemoteFileModel:
         return counts
     
     def add_or_update_file(self, site_id: int, url: str, name: str, size: int,
-                          file_type: str, category: str = "") -> int:
+                          file_type: str, category_id: Optional[int] = None) -> int:
         """Add a new remote file or update an existing one.
         
         Args:
@@ -280,7 +385,7 @@ class RemoteFileModel:
             name: Name of the file
             size: Size of the file in bytes
             file_type: Type of the file (e.g., 'pdf', 'epub')
-            category: Category of the file (optional)
+            category_id: ID of the category the file belongs to (optional)
             
         Returns:
             ID of the added or updated file
@@ -297,7 +402,7 @@ class RemoteFileModel:
                 name=name,
                 size=size,
                 file_type=file_type,
-                category=category
+                category_id=category_id
             )
             return existing_file["id"]
         else:
@@ -308,7 +413,7 @@ class RemoteFileModel:
                 name=name,
                 size=size,
                 file_type=file_type,
-                category=category
+                category_id=category_id
             )
     
     def get_all_sites(self) -> List[Dict[str, Any]]:
@@ -321,7 +426,7 @@ class RemoteFileModel:
         cursor = conn.cursor()
         
         cursor.execute("""
-            SELECT id, name, url, scraper_module, last_scanned, created_at, updated_at
+            SELECT id, name, url, scraper_type, last_scan_date, created_at, updated_at
             FROM sites
             ORDER BY name
         """)
@@ -8,7 +8,7 @@ import sqlite3
 import json
 from typing import Dict, Any, List, Optional, Union
 
-from src.db.database import Database
+from src.db.database import DatabaseManager
 
 
 logger = logging.getLogger(__name__)
@@ -23,11 +23,23 @@ class SettingsModel:
     
     def __init__(self):
         """Initialize the settings model."""
-        self.db = Database()
+        self.db_manager = DatabaseManager()
         self._ensure_default_settings()
     
     def _ensure_default_settings(self):
-        """Ensure that default settings exist in the database."""
+        """Ensure that default settings exist in the database.
+        
+        Nothing is added if the schema hasn't been created yet, as when the
+        configuration is loaded before the database is initialized.
+        """
+        try:
+            if not self.db_manager.table_exists("settings"):
+                logger.info("Settings table not created yet, not adding default settings")
+                return
+        except sqlite3.Error as e:
+            logger.error(f"Error checking for the settings table: {e}")
+            return
+        
         default_settings = [
             # Network settings
             {
@@ -159,7 +171,9 @@ class SettingsModel:
                 # Check if the setting already exists
                 query = "SELECT * FROM settings WHERE key = ?"
                 params = (setting["key"],)
-                result = self.db.fetch_one(query, params)
+                cursor = self.db_manager.execute_query(query, params)
+                row = cursor.fetchone()
+                result = dict(row) if row is not None else None
                 
                 if not result:
                     # Insert the default setting
@@ -173,7 +187,8 @@ class SettingsModel:
                         setting["category"],
                         setting["description"]
                     )
-                    self.db.execute_query(query, params)
+                    self.db_manager.execute_query(query, params)
+                    self.db_manager.commit()
                     logger.info(f"Added default setting: {setting['key']}")
             except sqlite3.Error as e:
                 logger.error(f"Error ensuring default setting {setting['key']}: {e}")
@@ -191,7 +206,9 @@ class SettingsModel:
         try:
             query = "SELECT value FROM settings WHERE key = ?"
             params = (key,)
-            result = self.db.fetch_one(query, params)
+            cursor = self.db_manager.execute_query(query, params)
+            row = cursor.fetchone()
+            result = dict(row) if row is not None else None
             
             if result:
                 value = result["value"]
@@ -250,13 +267,16 @@ class SettingsModel:
             # Check if the setting exists
             query = "SELECT * FROM settings WHERE key = ?"
             params = (key,)
-            result = self.db.fetch_one(query, params)
+            cursor = self.db_manager.execute_query(query, params)
+            row = cursor.fetchone()
+            result = dict(row) if row is not None else None
             
             if result:
                 # Update the setting
                 query = "UPDATE settings SET value = ? WHERE key = ?"
                 params = (value_str, key)
-                self.db.execute_query(query, params)
+                self.db_manager.execute_query(query, params)
+                self.db_manager.commit()
             else:
                 # Get the category from the key (e.g., "network.proxy_enabled" -> "network")
                 category = key.split(".")[0] if "." in key else "general"
@@ -267,7 +287,8 @@ class SettingsModel:
                 VALUES (?, ?, ?, ?)
                 """
                 params = (key, value_str, category, "")
-                self.db.execute_query(query, params)
+                self.db_manager.execute_query(query, params)
+                self.db_manager.commit()
             
             logger.info(f"Set setting {key} to {value}")
             return True
@@ -283,7 +304,9 @@ class SettingsModel:
         """
         try:
             query = "SELECT key, value FROM settings"
-            results = self.db.fetch_all(query)
+            cursor = self.db_manager.execute_query(query)
+            rows = cursor.fetchall()
+            results = [dict(row) for row in rows]
             
             settings = {}
             for result in results:
@@ -328,7 +351,9 @@ class SettingsModel:
         try:
             query = "SELECT key, value FROM settings WHERE category = ?"
             params = (category,)
-            results = self.db.fetch_all(query, params)
+            cursor = self.db_manager.execute_query(query, params)
+            rows = cursor.fetchall()
+            results = [dict(row) for row in rows]
             
             settings = {}
             for result in results:
@@ -373,7 +398,8 @@ class SettingsModel:
         try:
             query = "DELETE FROM settings WHERE key = ?"
             params = (key,)
-            self.db.execute_query(query, params)
+            self.db_manager.execute_query(query, params)
+            self.db_manager.commit()
             
             logger.info(f"Deleted setting {key}")
             return True
@@ -390,7 +416,8 @@ class SettingsModel:
         try:
             # Delete all settings
             query = "DELETE FROM settings"
-            self.db.execute_query(query)
+            self.db_manager.execute_query(query)
+            self.db_manager.commit()
             
             # Re-add default settings
             self._ensure_default_settings()
@@ -13,6 +13,7 @@ from PyQt5.QtGui import QColor
 import logging
 from typing import Dict, Any, List, Optional
 
+from src.core.download_manager import DownloadManager
 from src.core.file_comparison import FileComparisonService
 from src.db.remote_file_model import RemoteFileModel
 
@@ -213,11 +214,15 @@ class ComparisonTab(QWidget):
             # Store results
             self.comparison_results = results
             
-            # Update tables
-            self.update_new_files_table(results["new_files"])
-            self.update_updated_files_table(results["updated_files"])
-            self.update_corrupted_files_table(results["corrupted_files"])
-            self.update_ok_files_table(results["ok_files"])
+            # Update tables, holding back repaints until every row is in place
+            self.tab_widget.setUpdatesEnabled(False)
+            try:
+                self.update_new_files_table(results["new_files"])
+                self.update_updated_files_table(results["updated_files"])
+                self.update_corrupted_files_table(results["corrupted_files"])
+                self.update_ok_files_table(results["ok_files"])
+            finally:
+                self.tab_widget.setUpdatesEnabled(True)
             
             # Update tab titles
             self.tab_widget.setTabText(0, f"New Files ({len(results['new_files'])})")
@@ -13,13 +13,20 @@ from PyQt5.QtWidgets import (
     QComboBox, QMenu, QAction, QMessageBox, QDateEdit
 )
 from PyQt5.QtCore import Qt, QDate
-from PyQt5.QtGui import QColor
+from PyQt5.QtGui import QColor, QBrush
 
 from src.db.download_model import DownloadModel
 
 
 logger = logging.getLogger(__name__)
 
+# Status text colors
+STATUS_COLORS = {
+    "completed": QColor(0, 128, 0),  # Green
+    "failed": QColor(255, 0, 0),  # Red
+    "in_progress": QColor(0, 0, 255),  # Blue
+}
+
 
 class DownloadHistoryTab(QWidget):
     """Tab for viewing download history.
@@ -49,23 +56,23 @@ class DownloadHistoryTab(QWidget):
         self.status_filter.addItem("Failed", "failed")
         self.status_filter.addItem("In Progress", "in_progress")
         self.status_filter.addItem("Pending", "pending")
-        self.status_filter.currentIndexChanged.connect(self.apply_filters)
+        self.status_filter.currentIndexChanged.connect(lambda: self.apply_filters())
         
         # Date range filter
         self.date_from = QDateEdit()
         self.date_from.setCalendarPopup(True)
         self.date_from.setDate(QDate.currentDate().addMonths(-1))  # Default to 1 month ago
-        self.date_from.dateChanged.connect(self.apply_filters)
+        self.date_from.dateChanged.connect(lambda: self.apply_filters())
         
         self.date_to = QDateEdit()
         self.date_to.setCalendarPopup(True)
         self.date_to.setDate(QDate.currentDate())
-        self.date_to.dateChanged.connect(self.apply_filters)
+        self.date_to.dateChanged.connect(lambda: self.apply_filters())
         
         # Search box
         self.search_box = QLineEdit()
         self.search_box.setPlaceholderText("Search by filename...")
-        self.search_box.textChanged.connect(self.apply_filters)
+        self.search_box.textChanged.connect(lambda: self.apply_filters())
         
         # Refresh button
         self.refresh_button = QPushButton("Refresh")
@@ -163,63 +170,67 @@ class DownloadHistoryTab(QWidget):
         Args:
             history: Filtered download history data
         """
-        # Clear the table
-        self.history_table.setRowCount(0)
-        
-        # Add rows to the table
-        for item in history:
-            row = self.history_table.rowCount()
-            self.history_table.insertRow(row)
-            
-            # ID
-            id_item = QTableWidgetItem(str(item["id"]))
-            id_item.setData(Qt.UserRole, item["id"])
-            self.history_table.setItem(row, 0, id_item)
-            
-            # Filename
-            filename = item.get("file_name", "")
-            filename_item = QTableWidgetItem(filename)
-            self.history_table.setItem(row, 1, filename_item)
-            
-            # Status
-            status = item["status"]
-            status_item = QTableWidgetItem(status.capitalize())
-            if status == "completed":
-                status_item.setForeground(QColor(0, 128, 0))  # Green
-            elif status == "failed":
-                status_item.setForeground(QColor(255, 0, 0))  # Red
-            elif status == "in_progress":
-                status_item.setForeground(QColor(0, 0, 255))  # Blue
-            self.history_table.setItem(row, 2, status_item)
-            
-            # Started
-            started_at = item["started_at"]
-            started_item = QTableWidgetItem(started_at if started_at else "")
-            self.history_table.setItem(row, 3, started_item)
-            
-            # Completed
-            completed_at = item["completed_at"]
-            completed_item = QTableWidgetItem(completed_at if completed_at else "")
-            self.history_table.setItem(row, 4, completed_item)
-            
-            # Error
-            error_message = item["error_message"]
-            error_item = QTableWidgetItem(error_message if error_message else "")
-            self.history_table.setItem(row, 5, error_item)
+        # Hold back repaints and sorting until every row is in place
+        sorting_enabled = self.history_table.isSortingEnabled()
+        self.history_table.setSortingEnabled(False)
+        self.history_table.setUpdatesEnabled(False)
+        try:
+            # Size the table once; the rows kept from the last update reuse
+            # their items instead of allocating new ones
+            self.history_table.setRowCount(len(history))
             
-            # File Path
-            # Get the local file path if available
-            local_file_id = item["local_file_id"]
-            file_path = ""
-            if local_file_id:
-                from src.db.local_file_model import LocalFileModel
-                local_file_model = LocalFileModel()
-                local_file = local_file_model.get_file_by_id(local_file_id)
-                if local_file:
-                    file_path = local_file["path"]
+            for row, item in enumerate(history):
+                # ID
+                id_item = self._set_cell(row, 0, str(item["id"]))
+                id_item.setData(Qt.UserRole, item["id"])
+                
+                # Filename
+                self._set_cell(row, 1, item.get("file_name", ""))
+                
+                # Status
+                status = item["status"]
+                status_item = self._set_cell(row, 2, status.capitalize())
+                status_item.setForeground(STATUS_COLORS.get(status, QBrush()))
+                
+                # Started
+                started_at = item["started_at"]
+                self._set_cell(row, 3, started_at if started_at else "")
+                
+                # Completed
+                completed_at = item["completed_at"]
+                self._set_cell(row, 4, completed_at if completed_at else "")
+                
+                # Error
+                error_message = item["error_message"]
+                self._set_cell(row, 5, error_message if error_message else "")
+                
+                # File Path, joined in by the history query
+                file_path = item.get("file_path")
+                self._set_cell(row, 6, file_path if file_path else "")
+        finally:
+            self.history_table.setUpdatesEnabled(True)
+            self.history_table.setSortingEnabled(sorting_enabled)
+    
+    def _set_cell(self, row: int, column: int, text: str) -> QTableWidgetItem:
+        """Set the text of a history table cell, reusing its item if it has one.
+        
+        Args:
+            row: Row of the cell
+            column: Column of the cell
+            text: Text to show
             
-            path_item = QTableWidgetItem(file_path)
-            self.history_table.setItem(row, 6, path_item)
+        Returns:
+            The item of the cell
+        """
+        item = self.history_table.item(row, column)
+        
+        if item is None:
+            item = QTableWidgetItem(text)
+            self.history_table.setItem(row, column, item)
+        else:
+            item.setText(text)
+        
+        return item
     
     def show_context_menu(self, position):
         """Show context menu for the history table.
@@ -4,9 +4,10 @@ This module provides a tab for managing the download queue.
 """
 
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
-                             QTableWidget, QTableWidgetItem, QHeaderView, QProgressBar,
+                             QTableView, QHeaderView, QStyledItemDelegate,
+                             QStyleOptionProgressBar, QStyle, QApplication,
                              QMenu, QAction, QMessageBox)
-from PyQt5.QtCore import Qt, pyqtSignal, QPoint
+from PyQt5.QtCore import Qt, pyqtSignal, QPoint, QAbstractTableModel, QModelIndex
 from PyQt5.QtGui import QColor
 
 import logging
@@ -17,6 +18,140 @@ from src.core.download_manager import DownloadManager
 
 logger = logging.getLogger(__name__)
 
+# Data role holding the download progress of a row as a percentage (0 to 100)
+PROGRESS_ROLE = Qt.UserRole + 1
+
+# Status text colors
+STATUS_COLORS = {
+    "completed": QColor(0, 128, 0),  # Green
+    "failed": QColor(255, 0, 0),  # Red
+}
+
+
+def _format_size(size_bytes):
+    """Format a size in bytes to a human-readable string.
+
+    Args:
+        size_bytes: Size in bytes
+
+    Returns:
+        Human-readable size string
+    """
+    if size_bytes < 1024:
+        return f"{size_bytes} B"
+    elif size_bytes < 1024 * 1024:
+        return f"{size_bytes / 1024:.1f} KB"
+    elif size_bytes < 1024 * 1024 * 1024:
+        return f"{size_bytes / (1024 * 1024):.1f} MB"
+    else:
+        return f"{size_bytes / (1024 * 1024 * 1024):.1f} GB"
+
+
+class DownloadQueueModel(QAbstractTableModel):
+    """Table model for the download queue.
+
+    Each row is a dictionary with the file_id, name, size, status and
+    progress of a download. The view asks only for the cells it shows, so
+    no item or widget is created per cell.
+    """
+
+    HEADERS = ["ID", "Name", "Size", "Status", "Progress"]
+
+    def __init__(self, parent=None):
+        """Initialize the download queue model."""
+        super().__init__(parent)
+        self._rows = []
+        self._row_by_file_id = {}
+
+    def set_rows(self, rows: List[Dict[str, Any]]):
+        """Replace all rows of the model.
+
+        Args:
+            rows: List of row dictionaries
+        """
+        self.beginResetModel()
+        self._rows = rows
+
+        # Row number of each file, so progress updates don't search the rows
+        self._row_by_file_id = {}
+        for row_number, row in enumerate(rows):
+            self._row_by_file_id.setdefault(row["file_id"], row_number)
+
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        """Get the number of rows."""
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        """Get the number of columns."""
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        """Get the header label of a column."""
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return self.HEADERS[section]
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        """Get the data of a cell for a role."""
+        if not index.isValid():
+            return None
+
+        row = self._rows[index.row()]
+        column = index.column()
+
+        if role == Qt.DisplayRole:
+            if column == 0:
+                return str(row["file_id"])
+            elif column == 1:
+                return row["name"]
+            elif column == 2:
+                return _format_size(row["size"]) if row["size"] else ""
+            elif column == 3:
+                return row["status"].capitalize()
+        elif role == Qt.UserRole and column == 0:
+            return row["file_id"]
+        elif role == Qt.ForegroundRole and column == 3:
+            return STATUS_COLORS.get(row["status"])
+        elif role == PROGRESS_ROLE and column == 4:
+            return int(row["progress"] * 100)
+
+        return None
+
+    def set_progress(self, file_id: int, progress: float):
+        """Update the progress of a download.
+
+        Args:
+            file_id: ID of the file being downloaded
+            progress: Download progress (0.0 to 1.0)
+        """
+        row_number = self._row_by_file_id.get(file_id)
+        if row_number is None:
+            return
+
+        self._rows[row_number]["progress"] = progress
+        index = self.index(row_number, 4)
+        self.dataChanged.emit(index, index, [PROGRESS_ROLE])
+
+
+class ProgressDelegate(QStyledItemDelegate):
+    """Item delegate that paints the progress of a download as a progress bar."""
+
+    def paint(self, painter, option, index):
+        """Paint the progress bar of a cell."""
+        progress = index.data(PROGRESS_ROLE) or 0
+
+        progress_option = QStyleOptionProgressBar()
+        progress_option.rect = option.rect
+        progress_option.minimum = 0
+        progress_option.maximum = 100
+        progress_option.progress = progress
+        progress_option.text = f"{progress}%"
+        progress_option.textVisible = True
+
+        QApplication.style().drawControl(QStyle.CE_ProgressBar, progress_option, painter)
+
 
 class DownloadQueueTab(QWidget):
     """Tab for managing the download queue.
@@ -55,14 +190,25 @@ class DownloadQueueTab(QWidget):
         # Add controls layout to main layout
         main_layout.addLayout(controls_layout)
 
-        # Queue table
-        self.queue_table = QTableWidget()
-        self.queue_table.setColumnCount(5)
-        self.queue_table.setHorizontalHeaderLabels(["ID", "Name", "Size", "Status", "Progress"])
+        # Queue table, showing the rows of the queue model
+        self.queue_model = DownloadQueueModel(self)
+        self.queue_table = QTableView()
+        self.queue_table.setModel(self.queue_model)
+        self.queue_table.setItemDelegateForColumn(4, ProgressDelegate(self.queue_table))
+        # Fixed column widths and row heights, so the view never measures
+        # the cell contents when the queue changes
+        self.queue_table.horizontalHeader().setSectionResizeMode(QHeaderView.Fixed)
         self.queue_table.horizontalHeader().setSectionResizeMode(1, QHeaderView.Stretch)
-        self.queue_table.setSelectionBehavior(QTableWidget.SelectRows)
-        self.queue_table.setSelectionMode(QTableWidget.SingleSelection)
-        self.queue_table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.queue_table.setColumnWidth(0, 60)
+        self.queue_table.setColumnWidth(2, 90)
+        self.queue_table.setColumnWidth(3, 100)
+        self.queue_table.setColumnWidth(4, 150)
+        self.queue_table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        # Size the rows from the font, so that larger fonts aren't cut off
+        self.queue_table.verticalHeader().setDefaultSectionSize(self.queue_table.fontMetrics().height() + 6)
+        self.queue_table.setSelectionBehavior(QTableView.SelectRows)
+        self.queue_table.setSelectionMode(QTableView.SingleSelection)
+        self.queue_table.setEditTriggers(QTableView.NoEditTriggers)
         self.queue_table.setContextMenuPolicy(Qt.CustomContextMenu)
         self.queue_table.customContextMenuRequested.connect(self.show_context_menu)
 
@@ -109,91 +255,29 @@ class DownloadQueueTab(QWidget):
         queue_items = self.download_manager.get_queue_items()
         active_downloads = self.download_manager.get_active_downloads()
 
-        # Clear the table
-        self.queue_table.setRowCount(0)
-
-        # Add active downloads first
-        for file_id, download in active_downloads.items():
-            row = self.queue_table.rowCount()
-            self.queue_table.insertRow(row)
-
-            # ID
-            id_item = QTableWidgetItem(str(file_id))
-            id_item.setData(Qt.UserRole, file_id)
-            self.queue_table.setItem(row, 0, id_item)
-
-            # Name
-            name_item = QTableWidgetItem(download.get("name", ""))
-            self.queue_table.setItem(row, 1, name_item)
-
-            # Size
-            size = download.get("size", 0)
-            size_item = QTableWidgetItem(self._format_size(size) if size else "")
-            self.queue_table.setItem(row, 2, size_item)
-
-            # Status
-            status = download.get("status", "")
-            status_item = QTableWidgetItem(status.capitalize())
-            if status == "completed":
-                status_item.setForeground(QColor(0, 128, 0))  # Green
-            elif status == "failed":
-                status_item.setForeground(QColor(255, 0, 0))  # Red
-            self.queue_table.setItem(row, 3, status_item)
-
-            # Progress
-            progress = download.get("progress", 0.0)
-            progress_bar = QProgressBar()
-            progress_bar.setRange(0, 100)
-            progress_bar.setValue(int(progress * 100))
-            self.queue_table.setCellWidget(row, 4, progress_bar)
-
-        # Add queued items
-        for item in queue_items:
-            row = self.queue_table.rowCount()
-            self.queue_table.insertRow(row)
-
-            # ID
-            file_id = item.get("file_id", 0)
-            id_item = QTableWidgetItem(str(file_id))
-            id_item.setData(Qt.UserRole, file_id)
-            self.queue_table.setItem(row, 0, id_item)
-
-            # Name
-            name_item = QTableWidgetItem(item.get("name", ""))
-            self.queue_table.setItem(row, 1, name_item)
-
-            # Size
-            size = item.get("size", 0)
-            size_item = QTableWidgetItem(self._format_size(size) if size else "")
-            self.queue_table.setItem(row, 2, size_item)
-
-            # Status
-            status_item = QTableWidgetItem("Queued")
-            self.queue_table.setItem(row, 3, status_item)
-
-            # Progress
-            progress_bar = QProgressBar()
-            progress_bar.setRange(0, 100)
-            progress_bar.setValue(0)
-            self.queue_table.setCellWidget(row, 4, progress_bar)
-
-    def _format_size(self, size_bytes):
-        """Format a size in bytes to a human-readable string.
-
-        Args:
-            size_bytes: Size in bytes
+        # Active downloads first, then the queued items
+        rows = [
+            {
+                "file_id": file_id,
+                "name": download.get("name", ""),
+                "size": download.get("size", 0),
+                "status": download.get("status", ""),
+                "progress": download.get("progress", 0.0)
+            }
+            for file_id, download in active_downloads.items()
+        ]
+        rows.extend(
+            {
+                "file_id": item.get("file_id", 0),
+                "name": item.get("name", ""),
+                "size": item.get("size", 0),
+                "status": "queued",
+                "progress": 0.0
+            }
+            for item in queue_items
+        )
 
-        Returns:
-            Human-readable size string
-        """
-        if size_bytes < 1024:
-            return f"{size_bytes} B"
-        elif size_bytes < 1024 * 1024:
-            return f"{size_bytes / 1024:.1f} KB"
-        elif size_bytes < 1024 * 1024 * 1024:
-            return f"{size_bytes / (1024 * 1024):.1f} MB"
-        else:
-            return f"{size_bytes / (1024 * 1024 * 1024):.1f} GB"
+        self.queue_model.set_rows(rows)
 
     def show_context_menu(self, position):
         """Show context menu for the queue table.
@@ -202,12 +286,12 @@ class DownloadQueueTab(QWidget):
             position: Position where the context menu should be shown
         """
         # Get the selected row
-        row = self.queue_table.rowAt(position.y())
-        if row < 0:
+        index = self.queue_table.indexAt(position)
+        if not index.isValid():
             return
 
         # Get the file ID
-        file_id = self.queue_table.item(row, 0).data(Qt.UserRole)
+        file_id = self.queue_model.index(index.row(), 0).data(Qt.UserRole)
 
         # Create menu
         menu = QMenu()
@@ -238,14 +322,7 @@ class DownloadQueueTab(QWidget):
             file_id: ID of the file being downloaded
             progress: Download progress (0.0 to 1.0)
         """
-        # Find the row with the file ID
-        for row in range(self.queue_table.rowCount()):
-            if self.queue_table.item(row, 0).data(Qt.UserRole) == file_id:
-                # Update the progress bar
-                progress_bar = self.queue_table.cellWidget(row, 4)
-                if progress_bar:
-                    progress_bar.setValue(int(progress * 100))
-                break
+        self.queue_model.set_progress(file_id, progress)
 
     def on_download_completed(self, file_id):
         """Handle download completed event.
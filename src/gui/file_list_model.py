@@ -0,0 +1,137 @@
+"""File list model for the PDF Downloader application.
+
+This module contains the FileListModel class, which shows a list of files in
+a table view and hands the rows to the view in batches.
+"""
+
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex
+
+
+# Number of rows handed to the view at a time
+BATCH_SIZE = 200
+
+
+class FileListModel(QAbstractTableModel):
+    """Table model for a list of files.
+
+    The model reports only the rows loaded so far. The view asks for the
+    next batch through canFetchMore/fetchMore when it is scrolled to the
+    bottom, so showing a large library costs one batch instead of one row
+    per file. The files are either given all at once with set_files, or
+    read from the database one page per batch with set_page_source.
+    """
+
+    def __init__(self, columns: Sequence[Tuple[str, Callable[[Dict[str, Any]], str]]], parent=None):
+        """Initialize the file list model.
+
+        Args:
+            columns: Header label and display function of each column; the
+                function gets a file dictionary and returns the cell text
+            parent: Parent object
+        """
+        super().__init__(parent)
+        self._columns = list(columns)
+        self._files = []
+        self._loaded = 0
+        self._fetch_page = None
+
+    def set_files(self, files: List[Dict[str, Any]]):
+        """Replace the files of the model, loading the first batch.
+
+        Args:
+            files: List of file dictionaries
+        """
+        self.beginResetModel()
+        self._files = files
+        self._loaded = min(BATCH_SIZE, len(files))
+        self._fetch_page = None
+        self.endResetModel()
+
+    def set_page_source(self, fetch_page: Callable[[Optional[Dict[str, Any]], int], List[Dict[str, Any]]]):
+        """Replace the files of the model with pages read on demand.
+
+        Only the first page is read now; the next one is read when the view
+        is scrolled to the bottom. A page shorter than a batch is the last.
+
+        Args:
+            fetch_page: Function that gets the last file read, or None for
+                the first page, and the page size, and returns the next page
+        """
+        self.beginResetModel()
+        self._files = list(fetch_page(None, BATCH_SIZE))
+        self._loaded = len(self._files)
+        self._fetch_page = fetch_page if len(self._files) == BATCH_SIZE else None
+        self.endResetModel()
+
+    def file_count(self) -> int:
+        """Get the number of files read, including the ones not loaded yet.
+
+        Returns:
+            Number of files
+        """
+        return len(self._files)
+
+    def file_id(self, row: int) -> int:
+        """Get the ID of the file shown in a row.
+
+        Args:
+            row: Row number
+
+        Returns:
+            ID of the file
+        """
+        return self._files[row]["id"]
+
+    def rowCount(self, parent=QModelIndex()):
+        """Get the number of loaded rows."""
+        return 0 if parent.isValid() else self._loaded
+
+    def columnCount(self, parent=QModelIndex()):
+        """Get the number of columns."""
+        return 0 if parent.isValid() else len(self._columns)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        """Get the header label of a column."""
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return self._columns[section][0]
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        """Get the data of a cell for a role."""
+        if not index.isValid():
+            return None
+
+        file = self._files[index.row()]
+
+        if role == Qt.DisplayRole:
+            return self._columns[index.column()][1](file)
+        elif role == Qt.UserRole and index.column() == 0:
+            return file["id"]
+
+        return None
+
+    def canFetchMore(self, parent=QModelIndex()):
+        """Check whether some files are not loaded yet."""
+        return not parent.isValid() and (self._loaded < len(self._files) or self._fetch_page is not None)
+
+    def fetchMore(self, parent=QModelIndex()):
+        """Load the next batch of files."""
+        if parent.isValid():
+            return
+
+        # Read the next page once all the files read so far are loaded
+        if self._loaded == len(self._files) and self._fetch_page is not None:
+            page = self._fetch_page(self._files[-1], BATCH_SIZE)
+            if len(page) < BATCH_SIZE:
+                self._fetch_page = None
+            self._files.extend(page)
+
+        count = min(BATCH_SIZE, len(self._files) - self._loaded)
+        if count <= 0:
+            return
+
+        self.beginInsertRows(QModelIndex(), self._loaded, self._loaded + count - 1)
+        self._loaded += count
+        self.endInsertRows()
@@ -8,21 +8,25 @@ from typing import Dict, Any, List, Optional
 
 from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit,
-    QPushButton, QTableWidget, QTableWidgetItem, QHeaderView,
+    QPushButton, QTableView, QHeaderView,
     QComboBox, QGroupBox, QRadioButton, QButtonGroup, QMessageBox,
     QMenu, QAction
 )
-from PyQt5.QtCore import Qt, pyqtSignal
+from PyQt5.QtCore import Qt, QTimer, QSortFilterProxyModel, pyqtSignal
 from PyQt5.QtGui import QColor
 
 from src.db.remote_file_model import RemoteFileModel
 from src.db.site_model import SiteModel
-from src.core.site_scanner import SiteScannerThread
 from src.core.download_manager import DownloadManager
+from src.gui.site_management import ScanThread
+from src.gui.file_list_model import FileListModel
 
 
 logger = logging.getLogger(__name__)
 
+# Time to wait after the last keystroke before searching, in milliseconds
+SEARCH_DELAY_MS = 200
+
 
 class LibraryTab(QWidget):
     """Tab for managing remote files.
@@ -43,6 +47,8 @@ class LibraryTab(QWidget):
         self.remote_file_model = RemoteFileModel()
         self.site_model = SiteModel()
         self.download_manager = DownloadManager()
+        self.site_names = {}
+        self.showing_search_results = False
         self.init_ui()
         self.load_sites()
         self.load_file_stats()
@@ -104,9 +110,15 @@ class LibraryTab(QWidget):
         
         self.search_input = QLineEdit()
         self.search_input.setPlaceholderText("Search by filename...")
-        self.search_input.textChanged.connect(self.search_files)
+        self.search_input.textChanged.connect(lambda text: self.search_timer.start())
         search_layout.addWidget(self.search_input)
         
+        # Search once typing pauses instead of on every keystroke
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(SEARCH_DELAY_MS)
+        self.search_timer.timeout.connect(lambda: self.search_files(self.search_input.text()))
+        
         self.search_button = QPushButton("Search")
         self.search_button.clicked.connect(lambda: self.search_files(self.search_input.text()))
         search_layout.addWidget(self.search_button)
@@ -121,12 +133,36 @@ class LibraryTab(QWidget):
         self.stats_label = QLabel("No remote files in database")
         layout.addWidget(self.stats_label)
         
-        # Files table
-        self.files_table = QTableWidget(0, 5)  # 0 rows, 5 columns
-        self.files_table.setHorizontalHeaderLabels(["ID", "Name", "Type", "Size", "Site"])
+        # Files table, showing the rows of the file list model
+        self.files_model = FileListModel([
+            ("ID", lambda file: str(file["id"])),
+            ("Name", lambda file: file["name"]),
+            ("Type", lambda file: file["file_type"].upper()),
+            ("Size", lambda file: "Unknown" if file.get("size") is None else self._format_size(file["size"])),
+            ("Site", lambda file: self.site_names.get(file["site_id"], "Unknown")),
+        ], self)
+        
+        # Proxy model filtering the loaded files by name while searching
+        self.files_proxy = QSortFilterProxyModel(self)
+        self.files_proxy.setSourceModel(self.files_model)
+        self.files_proxy.setFilterKeyColumn(1)
+        self.files_proxy.setFilterCaseSensitivity(Qt.CaseInsensitive)
+        
+        self.files_table = QTableView()
+        self.files_table.setModel(self.files_proxy)
+        # Fixed column widths and row heights, so the view never measures
+        # the cell contents when the files change
+        self.files_table.horizontalHeader().setSectionResizeMode(QHeaderView.Fixed)
         self.files_table.horizontalHeader().setSectionResizeMode(1, QHeaderView.Stretch)  # Stretch name column
-        self.files_table.setSelectionBehavior(QTableWidget.SelectRows)
-        self.files_table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.files_table.setColumnWidth(0, 60)
+        self.files_table.setColumnWidth(2, 60)
+        self.files_table.setColumnWidth(3, 90)
+        self.files_table.setColumnWidth(4, 150)
+        self.files_table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        # Size the rows from the font, so that larger fonts aren't cut off
+        self.files_table.verticalHeader().setDefaultSectionSize(self.files_table.fontMetrics().height() + 6)
+        self.files_table.setSelectionBehavior(QTableView.SelectRows)
+        self.files_table.setEditTriggers(QTableView.NoEditTriggers)
         self.files_table.setContextMenuPolicy(Qt.CustomContextMenu)
         self.files_table.customContextMenuRequested.connect(self.show_context_menu)
         layout.addWidget(self.files_table)
@@ -141,7 +177,10 @@ class LibraryTab(QWidget):
             self.site_combo.addItem("All Sites", None)
             
             # Get sites from the database
-            sites = self.site_model.get_sites()
+            sites = self.site_model.get_all_sites()
+            
+            # Keep the site names for the files table
+            self.site_names = {site["id"]: site["name"] for site in sites}
             
             # Add sites to the combo box
             for site in sites:
@@ -156,10 +195,11 @@ class LibraryTab(QWidget):
         """Load file statistics from the database."""
         try:
             # Get file statistics
-            total_files = self.remote_file_model.count_files()
-            pdf_files = self.remote_file_model.count_files_by_type("pdf")
-            epub_files = self.remote_file_model.count_files_by_type("epub")
-            txt_files = self.remote_file_model.count_files_by_type("txt")
+            total_files = self.remote_file_model.get_file_count()
+            type_counts = self.remote_file_model.get_file_count_by_type()
+            pdf_files = type_counts.get("pdf", 0)
+            epub_files = type_counts.get("epub", 0)
+            txt_files = type_counts.get("txt", 0)
             
             # Update the stats label
             self.stats_label.setText(
@@ -196,7 +236,7 @@ class LibraryTab(QWidget):
                 return
             
             # Create and start the scanner thread
-            self.scanner_thread = SiteScannerThread(site)
+            self.scanner_thread = ScanThread(site_id)
             self.scanner_thread.scan_complete.connect(self.scan_complete)
             self.scanner_thread.start()
             
@@ -220,14 +260,14 @@ class LibraryTab(QWidget):
         self.scan_button.setText("Scan Site")
         
         # Check for errors
-        if "error" in result:
+        if not result["success"]:
             QMessageBox.critical(self, "Scan Error", f"Error scanning site: {result['error']}")
             logger.error(f"Scan error: {result['error']}")
             return
         
         # Show scan results
-        files_found = result.get("files_found", 0)
-        files_added = result.get("files_added", 0)
+        files_found = len(result["files"])
+        files_added = result["stats"]["files_added"]
         
         QMessageBox.information(
             self, "Scan Complete",
@@ -259,57 +299,34 @@ class LibraryTab(QWidget):
             file_type = "txt"
         
         try:
-            # Get files from the database
-            if site_id is None:
-                # All sites
-                if file_type:
-                    files = self.remote_file_model.get_files_by_type(file_type)
-                else:
-                    files = self.remote_file_model.get_files()
-            else:
-                # Specific site
-                if file_type:
-                    files = self.remote_file_model.get_files_by_site_and_type(site_id, file_type)
-                else:
-                    files = self.remote_file_model.get_files_by_site(site_id)
-            
-            # Clear the table
-            self.files_table.setRowCount(0)
-            
-            # Add files to the table
-            for file in files:
-                row_position = self.files_table.rowCount()
-                self.files_table.insertRow(row_position)
-                
-                # ID
-                id_item = QTableWidgetItem(str(file["id"]))
-                id_item.setData(Qt.UserRole, file["id"])  # Store the ID as user data
-                self.files_table.setItem(row_position, 0, id_item)
-                
-                # Name
-                self.files_table.setItem(row_position, 1, QTableWidgetItem(file["name"]))
-                
-                # Type
-                self.files_table.setItem(row_position, 2, QTableWidgetItem(file["file_type"].upper()))
-                
-                # Size
-                size = file.get("size")
-                size_text = "Unknown" if size is None else self._format_size(size)
-                self.files_table.setItem(row_position, 3, QTableWidgetItem(size_text))
-                
-                # Site
-                site_name = "Unknown"
-                if file["site_id"]:
-                    site = self.site_model.get_site_by_id(file["site_id"])
-                    if site:
-                        site_name = site["name"]
-                self.files_table.setItem(row_position, 4, QTableWidgetItem(site_name))
+            # Show all the files again, reading one page from the database per batch
+            self.files_proxy.setFilterFixedString("")
+            self.showing_search_results = False
+            self.files_model.set_page_source(
+                lambda last_file, limit: self._get_files_page(site_id, file_type, last_file, limit)
+            )
             
-            logger.info(f"Loaded {len(files)} files")
+            logger.info(f"Loaded {self.files_model.file_count()} files")
         except Exception as e:
             logger.error(f"Error refreshing files: {e}")
             QMessageBox.critical(self, "Database Error", f"Error refreshing files: {str(e)}")
     
+    def _get_files_page(self, site_id: Optional[int], file_type: Optional[str],
+                        last_file: Optional[Dict[str, Any]], limit: int) -> List[Dict[str, Any]]:
+        """Get the next page of the files of a site, or of all sites.
+        
+        Args:
+            site_id: ID of the site, or None for all sites
+            file_type: Type of the files to get, or None for all types
+            last_file: Last file of the previous page, or None for the first page
+            limit: Maximum number of files to get
+            
+        Returns:
+            List of dictionaries containing file information
+        """
+        after = (last_file["name"], last_file["id"]) if last_file else None
+        return self.remote_file_model.get_files_page(limit, after, site_id=site_id, file_type=file_type)
+    
     def filter_files(self):
         """Filter files based on the selected filter."""
         self.refresh_files()
@@ -317,9 +334,29 @@ class LibraryTab(QWidget):
     def search_files(self, search_text):
         """Search for files by name.
         
+        When every file of the list is loaded, the list is filtered in
+        memory; otherwise the database is searched.
+        
         Args:
             search_text: Text to search for
         """
+        # Searching now replaces any search still waiting for typing to pause
+        self.search_timer.stop()
+        
+        # Go back to the full list if the search was cleared or an earlier
+        # search replaced it
+        if not search_text or self.showing_search_results:
+            self.refresh_files()
+            if not search_text:
+                return
+        
+        if not self.files_model.canFetchMore():
+            # Every file is loaded, so filter them without a query
+            self.files_proxy.setFilterFixedString(search_text)
+            
+            logger.info(f"Found {self.files_proxy.rowCount()} files matching '{search_text}'")
+            return
+        
         # Get the selected site ID
         site_id = self.site_combo.currentData()
         
@@ -335,60 +372,12 @@ class LibraryTab(QWidget):
             file_type = "txt"
         
         try:
-            # Get files from the database
-            if site_id is None:
-                # All sites
-                if file_type:
-                    files = self.remote_file_model.get_files_by_type(file_type)
-                else:
-                    files = self.remote_file_model.get_files()
-            else:
-                # Specific site
-                if file_type:
-                    files = self.remote_file_model.get_files_by_site_and_type(site_id, file_type)
-                else:
-                    files = self.remote_file_model.get_files_by_site(site_id)
+            # Search the files in the database
+            filtered_files = self.remote_file_model.search_files(search_text, site_id, file_type)
             
-            # Apply search filter
-            search_text = search_text.lower()
-            filtered_files = []
-            
-            for file in files:
-                # Check if the search text is in the file name
-                if search_text in file["name"].lower():
-                    filtered_files.append(file)
-            
-            # Clear the table
-            self.files_table.setRowCount(0)
-            
-            # Add filtered files to the table
-            for file in filtered_files:
-                row_position = self.files_table.rowCount()
-                self.files_table.insertRow(row_position)
-                
-                # ID
-                id_item = QTableWidgetItem(str(file["id"]))
-                id_item.setData(Qt.UserRole, file["id"])  # Store the ID as user data
-                self.files_table.setItem(row_position, 0, id_item)
-                
-                # Name
-                self.files_table.setItem(row_position, 1, QTableWidgetItem(file["name"]))
-                
-                # Type
-                self.files_table.setItem(row_position, 2, QTableWidgetItem(file["file_type"].upper()))
-                
-                # Size
-                size = file.get("size")
-                size_text = "Unknown" if size is None else self._format_size(size)
-                self.files_table.setItem(row_position, 3, QTableWidgetItem(size_text))
-                
-                # Site
-                site_name = "Unknown"
-                if file["site_id"]:
-                    site = self.site_model.get_site_by_id(file["site_id"])
-                    if site:
-                        site_name = site["name"]
-                self.files_table.setItem(row_position, 4, QTableWidgetItem(site_name))
+            # Show the filtered files, one batch at a time
+            self.files_model.set_files(filtered_files)
+            self.showing_search_results = True
             
             logger.info(f"Found {len(filtered_files)} files matching '{search_text}'")
         except Exception as e:
@@ -398,6 +387,7 @@ class LibraryTab(QWidget):
     def clear_search(self):
         """Clear the search and show all files."""
         self.search_input.clear()
+        self.search_timer.stop()
         self.refresh_files()
     
     def show_context_menu(self, position):
@@ -407,12 +397,12 @@ class LibraryTab(QWidget):
             position: Position where the context menu should be shown
         """
         # Get the selected row
-        row = self.files_table.rowAt(position.y())
-        if row < 0:
+        index = self.files_table.indexAt(position)
+        if not index.isValid():
             return
         
         # Get the file ID
-        file_id = self.files_table.item(row, 0).data(Qt.UserRole)
+        file_id = self.files_model.file_id(self.files_proxy.mapToSource(index).row())
         
         # Create menu
         menu = QMenu()
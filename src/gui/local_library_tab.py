@@ -9,20 +9,24 @@ from typing import Dict, Any, List, Optional
 
 from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit,
-    QPushButton, QTableWidget, QTableWidgetItem, QHeaderView,
+    QPushButton, QTableView, QHeaderView,
     QFormLayout, QMessageBox, QComboBox, QProgressBar, QFileDialog,
     QGroupBox, QRadioButton, QButtonGroup, QListWidget, QListWidgetItem,
     QMenu, QAction
 )
-from PyQt5.QtCore import Qt, QThread, pyqtSignal
+from PyQt5.QtCore import Qt, QThread, QTimer, QSortFilterProxyModel, pyqtSignal
 
 from src.db.local_file_model import LocalFileModel
 from src.core.directory_scanner import DirectoryScanner
+from src.gui.file_list_model import FileListModel
 from config import config
 
 
 logger = logging.getLogger(__name__)
 
+# Time to wait after the last keystroke before searching, in milliseconds
+SEARCH_DELAY_MS = 200
+
 
 class ScanThread(QThread):
     """Thread for scanning a directory in the background.
@@ -81,6 +85,7 @@ class LocalLibraryTab(QWidget):
         self.local_file_model = LocalFileModel()
         self.directory_scanner = DirectoryScanner()
         self.scan_thread = None
+        self.showing_search_results = False
         self.init_ui()
         self.load_file_stats()
         self.load_directories()
@@ -185,9 +190,15 @@ class LocalLibraryTab(QWidget):
 
         self.search_input = QLineEdit()
         self.search_input.setPlaceholderText("Search by filename or path...")
-        self.search_input.textChanged.connect(self.search_files)
+        self.search_input.textChanged.connect(lambda text: self.search_timer.start())
         search_layout.addWidget(self.search_input)
 
+        # Search once typing pauses instead of on every keystroke
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(SEARCH_DELAY_MS)
+        self.search_timer.timeout.connect(lambda: self.search_files(self.search_input.text()))
+
         self.search_button = QPushButton("Search")
         self.search_button.clicked.connect(lambda: self.search_files(self.search_input.text()))
         search_layout.addWidget(self.search_button)
@@ -199,12 +210,34 @@ class LocalLibraryTab(QWidget):
         # Add search group to main layout
         layout.addWidget(search_group)
         
-        # Table for displaying files
-        self.files_table = QTableWidget(0, 4)  # 0 rows, 4 columns
-        self.files_table.setHorizontalHeaderLabels(["ID", "Path", "Type", "Size"])
-        self.files_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
-        self.files_table.setSelectionBehavior(QTableWidget.SelectRows)
-        self.files_table.setEditTriggers(QTableWidget.NoEditTriggers)
+        # Table for displaying files, showing the rows of the file list model
+        self.files_model = FileListModel([
+            ("ID", lambda file: str(file["id"])),
+            ("Path", lambda file: file["path"]),
+            ("Type", lambda file: file["file_type"].upper()),
+            ("Size", lambda file: "Unknown" if file.get("size") is None else self._format_size(file["size"])),
+        ], self)
+        
+        # Proxy model filtering the loaded files by path while searching
+        self.files_proxy = QSortFilterProxyModel(self)
+        self.files_proxy.setSourceModel(self.files_model)
+        self.files_proxy.setFilterKeyColumn(1)
+        self.files_proxy.setFilterCaseSensitivity(Qt.CaseInsensitive)
+        
+        self.files_table = QTableView()
+        self.files_table.setModel(self.files_proxy)
+        # Fixed column widths and row heights, so the view never measures
+        # the cell contents when the files change
+        self.files_table.horizontalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.files_table.horizontalHeader().setSectionResizeMode(1, QHeaderView.Stretch)  # Stretch path column
+        self.files_table.setColumnWidth(0, 60)
+        self.files_table.setColumnWidth(2, 60)
+        self.files_table.setColumnWidth(3, 90)
+        self.files_table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        # Size the rows from the font, so that larger fonts aren't cut off
+        self.files_table.verticalHeader().setDefaultSectionSize(self.files_table.fontMetrics().height() + 6)
+        self.files_table.setSelectionBehavior(QTableView.SelectRows)
+        self.files_table.setEditTriggers(QTableView.NoEditTriggers)
         layout.addWidget(self.files_table)
         
         # Buttons for table actions
@@ -323,6 +356,10 @@ class LocalLibraryTab(QWidget):
         Args:
             directory: Directory to scan (optional, will use the selected directory if not provided)
         """
+        if self.scan_thread is not None:
+            QMessageBox.warning(self, "Scan In Progress", "Please wait for the current scan to finish.")
+            return
+        
         if directory is None:
             # Get the selected directory
             selected_items = self.dir_list.selectedItems()
@@ -393,6 +430,9 @@ class LocalLibraryTab(QWidget):
         Args:
             result: Dictionary containing scan results
         """
+        # Clear the scan thread, so that the next directory can be scanned
+        self.scan_thread = None
+        
         # Re-enable the scan button and disable the cancel button
         self.scan_all_button.setEnabled(True)
         self.cancel_button.setEnabled(False)
@@ -438,9 +478,6 @@ class LocalLibraryTab(QWidget):
         else:
             self.progress_label.setText(f"Scan failed: {result['error']}")
             QMessageBox.warning(self, "Scan Failed", f"Scan failed: {result['error']}")
-        
-        # Clear the scan thread
-        self.scan_thread = None
     
     def cancel_scan(self):
         """Cancel the current scan operation."""
@@ -483,39 +520,31 @@ class LocalLibraryTab(QWidget):
     def refresh_files(self):
         """Refresh the file list."""
         try:
-            # Clear the table
-            self.files_table.setRowCount(0)
-            
             # Get the selected filter
             filter_id = self.filter_group.checkedId()
             
-            # Get the files based on the filter
-            files = []
+            # Get the file type based on the filter
+            file_type = None
             
-            if filter_id == 0:  # All Files
-                files = self.local_file_model.get_all_files()
-            elif filter_id == 1:  # PDF Files
-                files = self.local_file_model.get_files_by_type("pdf")
+            if filter_id == 1:  # PDF Files
+                file_type = "pdf"
             elif filter_id == 2:  # EPUB Files
-                files = self.local_file_model.get_files_by_type("epub")
+                file_type = "epub"
             elif filter_id == 3:  # Text Files
-                files = self.local_file_model.get_files_by_type("txt")
+                file_type = "txt"
             
-            # Add the files to the table
-            for file in files:
-                row_position = self.files_table.rowCount()
-                self.files_table.insertRow(row_position)
-                
-                self.files_table.setItem(row_position, 0, QTableWidgetItem(str(file["id"])))
-                self.files_table.setItem(row_position, 1, QTableWidgetItem(file["path"]))
-                self.files_table.setItem(row_position, 2, QTableWidgetItem(file["file_type"].upper()))
-                
-                # Format the file size
-                size = file.get("size")
-                size_text = "Unknown" if size is None else self._format_size(size)
-                self.files_table.setItem(row_position, 3, QTableWidgetItem(size_text))
+            # Show all the files again, reading one page from the database per batch
+            self.files_proxy.setFilterFixedString("")
+            self.showing_search_results = False
+            self.files_model.set_page_source(
+                lambda last_file, limit: self.local_file_model.get_files_page(
+                    limit,
+                    (last_file["path"], last_file["id"]) if last_file else None,
+                    file_type=file_type
+                )
+            )
             
-            logger.info(f"Loaded {len(files)} files")
+            logger.info(f"Loaded {self.files_model.file_count()} files")
         except Exception as e:
             logger.error(f"Error refreshing files: {e}")
             QMessageBox.critical(self, "Database Error", f"Error refreshing files: {str(e)}")
@@ -566,9 +595,29 @@ class LocalLibraryTab(QWidget):
     def search_files(self, search_text):
         """Search for files by name or path.
 
+        When every file of the list is loaded, the list is filtered in
+        memory; otherwise the database is searched.
+
         Args:
             search_text: Text to search for
         """
+        # Searching now replaces any search still waiting for typing to pause
+        self.search_timer.stop()
+
+        # Go back to the full list if the search was cleared or an earlier
+        # search replaced it
+        if not search_text or self.showing_search_results:
+            self.refresh_files()
+            if not search_text:
+                return
+
+        if not self.files_model.canFetchMore():
+            # Every file is loaded, so filter them without a query
+            self.files_proxy.setFilterFixedString(search_text)
+
+            logger.info(f"Found {self.files_proxy.rowCount()} files matching '{search_text}'")
+            return
+
         # Get the current filter
         filter_id = self.filter_group.checkedId()
         file_type = None
@@ -580,38 +629,13 @@ class LocalLibraryTab(QWidget):
         elif filter_id == 3:
             file_type = "txt"
 
-        # Get all files matching the filter
+        # Search the files matching the filter in the database
         try:
-            if file_type:
-                files = self.local_file_model.get_files_by_type(file_type)
-            else:
-                files = self.local_file_model.get_files()
-
-            # Apply search filter
-            search_text = search_text.lower()
-            filtered_files = []
-
-            for file in files:
-                # Check if the search text is in the file path
-                if search_text in file["path"].lower():
-                    filtered_files.append(file)
-
-            # Clear the table
-            self.files_table.setRowCount(0)
-
-            # Add the filtered files to the table
-            for file in filtered_files:
-                row_position = self.files_table.rowCount()
-                self.files_table.insertRow(row_position)
-
-                self.files_table.setItem(row_position, 0, QTableWidgetItem(str(file["id"])))
-                self.files_table.setItem(row_position, 1, QTableWidgetItem(file["path"]))
-                self.files_table.setItem(row_position, 2, QTableWidgetItem(file["file_type"].upper()))
+            filtered_files = self.local_file_model.search_files(search_text, file_type)
 
-                # Format the file size
-                size = file.get("size")
-                size_text = "Unknown" if size is None else self._format_size(size)
-                self.files_table.setItem(row_position, 3, QTableWidgetItem(size_text))
+            # Show the filtered files, one batch at a time
+            self.files_model.set_files(filtered_files)
+            self.showing_search_results = True
 
             # Update status message
             if hasattr(self, "status_bar"):
@@ -624,4 +648,5 @@ class LocalLibraryTab(QWidget):
     def clear_search(self):
         """Clear the search and show all files."""
         self.search_input.clear()
+        self.search_timer.stop()
         self.filter_files()
\ No newline at end of file
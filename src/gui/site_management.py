@@ -5,7 +5,6 @@ This module contains the SiteManagementTab class for managing library/archive si
 
 import logging
 import sqlite3
-from urllib.parse import urlparse
 
 from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit,
@@ -17,6 +16,7 @@ from PyQt5.QtCore import Qt, QThread, pyqtSignal
 from src.db.site_model import SiteModel
 from src.core.site_scanner import SiteScanner
 from src.scrapers.registry import ScraperRegistry
+from src.utils import network_utils
 
 
 logger = logging.getLogger(__name__)
@@ -153,21 +153,29 @@ class SiteManagementTab(QWidget):
         try:
             sites = self.site_model.get_all_sites()
             
-            self.sites_table.setRowCount(0)
-            
-            for site in sites:
-                row_position = self.sites_table.rowCount()
-                self.sites_table.insertRow(row_position)
-                
-                self.sites_table.setItem(row_position, 0, QTableWidgetItem(str(site["id"])))
-                self.sites_table.setItem(row_position, 1, QTableWidgetItem(site["name"]))
-                self.sites_table.setItem(row_position, 2, QTableWidgetItem(site["url"]))
-                self.sites_table.setItem(row_position, 3, QTableWidgetItem(site["scraper_type"]))
+            # Hold back repaints and sorting until every row is in place
+            sorting_enabled = self.sites_table.isSortingEnabled()
+            self.sites_table.setSortingEnabled(False)
+            self.sites_table.setUpdatesEnabled(False)
+            try:
+                self.sites_table.setRowCount(0)
                 
-                # Format the last scan date
-                last_scan = site.get("last_scan_date")
-                last_scan_text = "Never" if last_scan is None else last_scan
-                self.sites_table.setItem(row_position, 4, QTableWidgetItem(last_scan_text))
+                for site in sites:
+                    row_position = self.sites_table.rowCount()
+                    self.sites_table.insertRow(row_position)
+                    
+                    self.sites_table.setItem(row_position, 0, QTableWidgetItem(str(site["id"])))
+                    self.sites_table.setItem(row_position, 1, QTableWidgetItem(site["name"]))
+                    self.sites_table.setItem(row_position, 2, QTableWidgetItem(site["url"]))
+                    self.sites_table.setItem(row_position, 3, QTableWidgetItem(site["scraper_type"]))
+                    
+                    # Format the last scan date
+                    last_scan = site.get("last_scan_date")
+                    last_scan_text = "Never" if last_scan is None else last_scan
+                    self.sites_table.setItem(row_position, 4, QTableWidgetItem(last_scan_text))
+            finally:
+                self.sites_table.setUpdatesEnabled(True)
+                self.sites_table.setSortingEnabled(sorting_enabled)
             
             logger.info(f"Loaded {len(sites)} sites from the database")
         except Exception as e:
@@ -192,12 +200,8 @@ class SiteManagementTab(QWidget):
             return (False, "Site URL is required", None, None, None)
         
         # Validate URL format
-        try:
-            result = urlparse(url)
-            if not all([result.scheme, result.netloc]):
-                return (False, "Invalid URL format. Please include http:// or https://", None, None, None)
-        except Exception:
-            return (False, "Invalid URL format", None, None, None)
+        if not network_utils.is_url_valid(url):
+            return (False, "Invalid URL format. Please include http:// or https://", None, None, None)
         
         return (True, name, url, scraper_type)
     
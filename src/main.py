@@ -12,6 +12,7 @@ from PyQt5.QtWidgets import QApplication
 
 from src.gui.main_window import MainWindow
 from src.db.database import DatabaseManager
+from src.db.settings_model import SettingsModel
 from src.scrapers import register_builtin_scrapers, load_scrapers
 from src.plugins.scrapers import scraper_plugin_manager
 from src.plugins.file_types import file_type_plugin_manager
@@ -51,6 +52,10 @@ def initialize_database():
     """
     db_manager = DatabaseManager()
     db_manager.initialize_database()
+    
+    # Add the default settings, which the configuration loaded on import
+    # couldn't add before the tables existed
+    SettingsModel()
     logging.info("Database initialized")
 
 
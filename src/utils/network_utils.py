@@ -4,7 +4,14 @@ This module provides utility functions for network operations.
 """
 
 import logging
+import re
+import socket
+import threading
+from functools import lru_cache
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
+from urllib3.util.retry import Retry
 from typing import Dict, Any, Optional
 from urllib.parse import urlparse
 
@@ -13,6 +20,36 @@ from config import config
 
 logger = logging.getLogger(__name__)
 
+# Connections kept open per host by the shared session; enough for the
+# largest number of concurrent downloads the settings allow
+POOL_SIZE = 10
+
+# Retries of failed connections and of temporary server errors by the
+# shared session, waiting 0.25s, 0.5s, 1s... in between, or as long as a
+# Retry-After header asks up to RETRY_AFTER_MAX seconds
+RETRY_COUNT = 3
+RETRY_BACKOFF = 0.25
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+RETRY_AFTER_MAX = 10
+
+# Socket options of the shared session's connections: urllib3's defaults
+# (TCP_NODELAY), and keepalive so that idle pooled connections stay open
+SOCKET_OPTIONS = HTTPConnection.default_socket_options + [(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)]
+
+# Sessions shared by get and post, created on first use: one retrying
+# failed requests, and one leaving retries to the caller
+_session = None
+_session_without_retries = None
+_session_lock = threading.Lock()
+
+# Absolute HTTP(S) URL with a host name, matched in one pass; the scheme is
+# case-insensitive, and the host may follow credentials, be a bracketed IPv6
+# address or hold non-ASCII letters
+_URL_RE = re.compile(
+    r"^https?://(?:[^\s/?#@]+@)?(?:\[[0-9A-Fa-f:.]+\]|[^\s/?#@:\[\]]+)(?::\d*)?(?:[/?#]\S*)?$",
+    re.IGNORECASE
+)
+
 
 def get_proxy_settings() -> Optional[Dict[str, str]]:
     """Get the proxy settings from the configuration.
@@ -83,11 +120,94 @@ def create_session() -> requests.Session:
     return session
 
 
-def get(url: str, **kwargs) -> requests.Response:
+class KeepAliveAdapter(HTTPAdapter):
+    """HTTP adapter for the shared session.
+    
+    Its connections are opened with SOCKET_OPTIONS. The TLS settings are left
+    to requests, which sets them up for each request's verify argument.
+    """
+    
+    def init_poolmanager(self, *args, **kwargs):
+        """Create the pool manager with the socket options."""
+        kwargs.setdefault("socket_options", SOCKET_OPTIONS)
+        super().init_poolmanager(*args, **kwargs)
+
+
+class CappedRetry(Retry):
+    """Retry configuration waiting at most RETRY_AFTER_MAX seconds.
+    
+    A Retry-After header asking for a longer wait is cut short, so that one
+    busy server can't stall a request for minutes.
+    """
+    
+    def get_retry_after(self, response):
+        """Get the wait asked for by a response, capped at RETRY_AFTER_MAX."""
+        retry_after = super().get_retry_after(response)
+        if retry_after is None:
+            return None
+        
+        return min(retry_after, RETRY_AFTER_MAX)
+
+
+def _get_session(retry: bool = True) -> requests.Session:
+    """Get a session shared by get and post.
+    
+    The session keeps connections open, so repeated requests to a host skip
+    the TCP and TLS handshakes. It carries no headers or proxies of its own;
+    get and post pass the configured ones with every request, so changes to
+    the settings take effect immediately.
+    
+    With retry, idempotent requests that fail to connect or get one of
+    RETRY_STATUSES are retried on the open connections. A response with one of
+    RETRY_STATUSES is returned to the caller once the retries are used up.
+    Without retry, the caller retries failed requests itself, as the file
+    downloader does.
+    
+    The session's default Accept-Encoding header asks for compressed responses
+    (gzip and deflate, and br if brotli is installed), which requests decodes;
+    get and post only add a User-Agent, so the header isn't replaced.
+    
+    Args:
+        retry: Whether the session retries failed requests
+        
+    Returns:
+        Requests session
+    """
+    global _session, _session_without_retries
+    
+    with _session_lock:
+        session = _session if retry else _session_without_retries
+        if session is None:
+            session = requests.Session()
+            if retry:
+                max_retries = CappedRetry(
+                    total=RETRY_COUNT,
+                    backoff_factor=RETRY_BACKOFF,
+                    status_forcelist=RETRY_STATUSES,
+                    raise_on_status=False
+                )
+            else:
+                max_retries = 0
+            adapter = KeepAliveAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE, max_retries=max_retries)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            if retry:
+                _session = session
+            else:
+                _session_without_retries = session
+        
+        return session
+
+
+def get(url: str, use_session: bool = True, retry: bool = True, **kwargs) -> requests.Response:
     """Send a GET request with the configured settings.
     
     Args:
         url: URL to request
+        use_session: Whether to send the request through the shared session,
+                     reusing its open connections
+        retry: Whether the shared session retries the request if it fails;
+               False for callers with their own retries
         **kwargs: Additional arguments to pass to requests.get
         
     Returns:
@@ -109,14 +229,19 @@ def get(url: str, **kwargs) -> requests.Response:
         if proxies:
             kwargs["proxies"] = proxies
     
+    if use_session:
+        return _get_session(retry).get(url, **kwargs)
+    
     return requests.get(url, **kwargs)
 
 
-def post(url: str, **kwargs) -> requests.Response:
+def post(url: str, use_session: bool = True, **kwargs) -> requests.Response:
     """Send a POST request with the configured settings.
     
     Args:
         url: URL to request
+        use_session: Whether to send the request through the shared session,
+                     reusing its open connections
         **kwargs: Additional arguments to pass to requests.post
         
     Returns:
@@ -138,4 +263,61 @@ def post(url: str, **kwargs) -> requests.Response:
         if proxies:
             kwargs["proxies"] = proxies
     
-    return requests.post(url, **kwargs)
\ No newline at end of file
+    if use_session:
+        return _get_session().post(url, **kwargs)
+    
+    return requests.post(url, **kwargs)
+
+
+def is_url_valid(url: str) -> bool:
+    """Check whether a string is an absolute HTTP or HTTPS URL.
+    
+    Args:
+        url: String to check
+        
+    Returns:
+        True if the URL has an http or https scheme and a host name,
+        False otherwise
+    """
+    return isinstance(url, str) and _URL_RE.match(url) is not None
+
+
+@lru_cache(maxsize=4096)
+def get_domain(url: str) -> Optional[str]:
+    """Get the domain of a URL.
+    
+    The host is sliced out of the URL directly rather than with urlparse,
+    and the results are cached, since the same sites' URLs are looked up
+    over and over while scanning.
+    
+    Args:
+        url: URL to get the domain of
+        
+    Returns:
+        Host name of the URL without credentials or port, or None if it
+        has none
+    """
+    if not isinstance(url, str):
+        return None
+    
+    # The host starts after the scheme and ends at the path, query or fragment
+    start = url.find("://")
+    if start < 0:
+        return None
+    start += 3
+    
+    end = len(url)
+    for delimiter in "/?#":
+        index = url.find(delimiter, start, end)
+        if index >= 0:
+            end = index
+    
+    host = url[start:end]
+    
+    # Strip the credentials and the port
+    host = host[host.rfind("@") + 1:]
+    colon = host.rfind(":")
+    if colon >= 0 and host[colon + 1:].isdigit():
+        host = host[:colon]
+    
+    return host or None
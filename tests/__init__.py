@@ -1,4 +1,19 @@
 """Tests for the PDF Downloader application.
 
 This package contains unit and integration tests for all components of the application.
-"""
\ No newline at end of file
+"""
+
+import os
+import tempfile
+
+from src.db import database
+
+
+# Keep the tests away from the application database: the configuration and
+# the models open the default path, which points at a database with the
+# schema in a temporary directory for the test run
+_temp_dir = tempfile.TemporaryDirectory()
+database.DEFAULT_DB_PATH = os.path.join(_temp_dir.name, "pdf_downloader.db")
+_db_manager = database.DatabaseManager()
+_db_manager.initialize_schema()
+_db_manager.close()
@@ -1,6 +1,9 @@
-import unittest
-from unittest.mock import patch, MagicMock, mock_open
 import os
+import tempfile
+import unittest
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+from unittest.mock import patch, MagicMock
 
 from src.core.directory_scanner import DirectoryScanner
 
@@ -10,211 +13,143 @@ class TestDirectoryScanner(unittest.TestCase):
     
     def setUp(self):
         """Set up test fixtures."""
-        # Create mock models
-        self.mock_local_file_model = MagicMock()
-        self.mock_category_model = MagicMock()
+        # Patch the local file model where the scanner looks it up
+        model_patcher = patch("src.core.directory_scanner.LocalFileModel")
+        self.mock_local_file_model = model_patcher.start().return_value
+        self.addCleanup(model_patcher.stop)
+        self.mock_local_file_model.get_file_by_path.return_value = None
+        
+        # A directory with two text files and one unsupported file
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.root_dir = temp_dir.name
+        os.mkdir(os.path.join(self.root_dir, "subdir"))
+        self.paths = [
+            os.path.join(self.root_dir, "file1.txt"),
+            os.path.join(self.root_dir, "subdir", "file2.txt")
+        ]
+        for path in self.paths + [os.path.join(self.root_dir, "notes.doc")]:
+            with open(path, "w") as f:
+                f.write("Some text")
         
         # Create the directory scanner
-        self.scanner = DirectoryScanner(
-            self.mock_local_file_model,
-            self.mock_category_model
-        )
+        self.scanner = DirectoryScanner()
     
     def test_init(self):
         """Test the constructor."""
-        # Check that the models were saved
         self.assertEqual(self.scanner.local_file_model, self.mock_local_file_model)
-        self.assertEqual(self.scanner.category_model, self.mock_category_model)
+        self.assertFalse(self.scanner.cancel_requested)
     
-    @patch('os.walk')
-    @patch('os.path.getsize')
-    @patch('src.utils.file_utils.calculate_file_hash')
-    def test_scan(self, mock_calculate_hash, mock_getsize, mock_walk):
-        """Test the scan method."""
-        # Set up the mock os.walk to return files
-        mock_walk.return_value = [
-            ("/downloads", ["subdir"], ["file1.pdf", "file2.pdf"]),
-            ("/downloads/subdir", [], ["file3.pdf"])
-        ]
-        
-        # Set up the mock os.path.getsize to return file sizes
-        mock_getsize.side_effect = lambda path: {
-            "/downloads/file1.pdf": 1024,
-            "/downloads/file2.pdf": 2048,
-            "/downloads/subdir/file3.pdf": 3072
-        }.get(path)
-        
-        # Set up the mock calculate_file_hash to return file hashes
-        mock_calculate_hash.side_effect = lambda path: {
-            "/downloads/file1.pdf": "abc123",
-            "/downloads/file2.pdf": "def456",
-            "/downloads/subdir/file3.pdf": "ghi789"
-        }.get(path)
-        
-        # Set up the mock local_file_model to return existing files
-        self.mock_local_file_model.get_file_by_path.side_effect = lambda path: None  # No existing files
-        
-        # Set up the mock category_model to return the default category
-        self.mock_category_model.get_default_category.return_value = {
-            "id": 1,
-            "name": "Uncategorized",
-            "parent_id": None
-        }
-        
-        # Call the scan method
-        result = self.scanner.scan("/downloads")
-        
-        # Check that the files were found
-        self.assertEqual(len(result), 3)
-        self.assertEqual(result[0]["path"], "/downloads/file1.pdf")
-        self.assertEqual(result[1]["path"], "/downloads/file2.pdf")
-        self.assertEqual(result[2]["path"], "/downloads/subdir/file3.pdf")
+    def test_scan_directory(self):
+        """Test scanning a directory with new files."""
+        result = self.scanner.scan_directory(self.root_dir)
+        
+        # Check the result
+        self.assertTrue(result["success"])
+        self.assertEqual(
+            (result["files_found"], result["files_added"], result["files_updated"]),
+            (2, 2, 0)
+        )
+        self.assertEqual(result["files_by_type"]["txt"], 2)
         
         # Check that the files were added to the database
-        self.assertEqual(self.mock_local_file_model.add_file.call_count, 3)
-        
-        # Check the first file
-        args, kwargs = self.mock_local_file_model.add_file.call_args_list[0]
-        self.assertEqual(kwargs["path"], "/downloads/file1.pdf")
-        self.assertEqual(kwargs["name"], "file1.pdf")
-        self.assertEqual(kwargs["file_type"], "pdf")
-        self.assertEqual(kwargs["size"], 1024)
-        self.assertEqual(kwargs["category_id"], 1)
-        self.assertEqual(kwargs["hash"], "abc123")
+        added_paths = [call.kwargs["path"] for call in self.mock_local_file_model.add_file.call_args_list]
+        self.assertEqual(sorted(added_paths), sorted(self.paths))
+        self.assertEqual(self.mock_local_file_model.add_file.call_args.kwargs["size"], len("Some text"))
     
-    @patch('os.walk')
-    @patch('os.path.getsize')
-    @patch('src.utils.file_utils.calculate_file_hash')
-    def test_scan_with_existing_files(self, mock_calculate_hash, mock_getsize, mock_walk):
-        """Test the scan method with existing files."""
-        # Set up the mock os.walk to return files
-        mock_walk.return_value = [
-            ("/downloads", [], ["file1.pdf", "file2.pdf"])
-        ]
-        
-        # Set up the mock os.path.getsize to return file sizes
-        mock_getsize.side_effect = lambda path: {
-            "/downloads/file1.pdf": 1024,
-            "/downloads/file2.pdf": 2048
-        }.get(path)
-        
-        # Set up the mock calculate_file_hash to return file hashes
-        mock_calculate_hash.side_effect = lambda path: {
-            "/downloads/file1.pdf": "abc123",
-            "/downloads/file2.pdf": "def456"
-        }.get(path)
-        
-        # Set up the mock local_file_model to return existing files
-        self.mock_local_file_model.get_file_by_path.side_effect = lambda path: {
-            "/downloads/file1.pdf": {
-                "id": 1,
-                "path": "/downloads/file1.pdf",
-                "name": "file1.pdf",
-                "file_type": "pdf",
-                "size": 1024,
-                "category_id": 1,
-                "hash": "abc123",
-                "last_updated": 1609459200
-            }
-        }.get(path)
-        
-        # Set up the mock category_model to return the default category
-        self.mock_category_model.get_default_category.return_value = {
-            "id": 1,
-            "name": "Uncategorized",
-            "parent_id": None
-        }
-        
-        # Call the scan method
-        result = self.scanner.scan("/downloads")
-        
-        # Check that the files were found
-        self.assertEqual(len(result), 2)
-        
-        # Check that only the new file was added to the database
-        self.mock_local_file_model.add_file.assert_called_once()
-        args, kwargs = self.mock_local_file_model.add_file.call_args
-        self.assertEqual(kwargs["path"], "/downloads/file2.pdf")
-    
-    @patch('os.walk')
-    @patch('os.path.getsize')
-    @patch('src.utils.file_utils.calculate_file_hash')
-    def test_scan_with_updated_files(self, mock_calculate_hash, mock_getsize, mock_walk):
-        """Test the scan method with updated files."""
-        # Set up the mock os.walk to return files
-        mock_walk.return_value = [
-            ("/downloads", [], ["file1.pdf"])
-        ]
-        
-        # Set up the mock os.path.getsize to return file sizes
-        mock_getsize.return_value = 2048  # Updated size
-        
-        # Set up the mock calculate_file_hash to return file hashes
-        mock_calculate_hash.return_value = "def456"  # Updated hash
-        
-        # Set up the mock local_file_model to return existing files
-        self.mock_local_file_model.get_file_by_path.return_value = {
-            "id": 1,
-            "path": "/downloads/file1.pdf",
-            "name": "file1.pdf",
-            "file_type": "pdf",
-            "size": 1024,  # Old size
-            "category_id": 1,
-            "hash": "abc123",  # Old hash
-            "last_updated": 1609459200
-        }
-        
-        # Call the scan method
-        result = self.scanner.scan("/downloads")
+    def test_scan_directory_with_existing_file(self):
+        """Test that a file already in the database is updated."""
+        existing_file = {"id": 1, "path": self.paths[0], "remote_file_id": 11}
+        self.mock_local_file_model.get_file_by_path.side_effect = (
+            lambda path: existing_file if path == self.paths[0] else None
+        )
         
-        # Check that the file was found
-        self.assertEqual(len(result), 1)
+        result = self.scanner.scan_directory(self.root_dir)
         
-        # Check that the file was updated in the database
+        # Check that one file was added and the other updated
+        self.assertEqual((result["files_added"], result["files_updated"]), (1, 1))
         self.mock_local_file_model.update_file.assert_called_once_with(
             file_id=1,
-            size=2048,
-            hash="def456"
+            path=self.paths[0],
+            size=len("Some text"),
+            file_type="txt",
+            remote_file_id=11
         )
     
-    @patch('os.walk')
-    def test_scan_empty_directory(self, mock_walk):
-        """Test the scan method with an empty directory."""
-        # Set up the mock os.walk to return no files
-        mock_walk.return_value = [
-            ("/downloads", [], [])
-        ]
-        
-        # Call the scan method
-        result = self.scanner.scan("/downloads")
+    def test_scan_directory_with_invalid_file(self):
+        """Test that files failing validation are not added."""
+        self.scanner.file_validator = MagicMock()
+        self.scanner.file_validator.validate_file.return_value = {"valid": False, "error": "Unreadable"}
         
-        # Check that no files were found
-        self.assertEqual(len(result), 0)
+        result = self.scanner.scan_directory(self.root_dir)
         
-        # Check that no files were added to the database
+        self.assertTrue(result["success"])
+        self.assertEqual(result["files_found"], 2)
         self.mock_local_file_model.add_file.assert_not_called()
     
-    @patch('os.walk')
-    @patch('os.path.getsize')
-    def test_scan_with_error(self, mock_getsize, mock_walk):
-        """Test the scan method with an error."""
-        # Set up the mock os.walk to return files
-        mock_walk.return_value = [
-            ("/downloads", [], ["file1.pdf"])
-        ]
+    def test_scan_directory_in_worker_processes(self):
+        """Test validating the files in worker processes."""
+        with patch("src.core.directory_scanner.PARALLEL_VALIDATION_MIN_FILES", 1):
+            result = self.scanner.scan_directory(self.root_dir)
+        
+        # Check that the results match a scan in this process
+        self.assertTrue(result["success"])
+        self.assertEqual((result["files_found"], result["files_added"]), (2, 2))
+        self.assertEqual(self.mock_local_file_model.add_file.call_count, 2)
+    
+    def test_scan_directory_worker_failure(self):
+        """Test that files whose worker failed are validated in this process."""
+        # The first chunk's worker raises, and the pool breaks before the second
+        failures = [RuntimeError("Worker error"), BrokenProcessPool("Worker died")]
+        
+        def submit(fn, *args):
+            future = Future()
+            future.set_exception(failures.pop(0))
+            return future
+        
+        with patch("src.core.directory_scanner.PARALLEL_VALIDATION_MIN_FILES", 1), \
+                patch("src.core.directory_scanner.VALIDATION_CHUNK_SIZE", 1), \
+                patch("src.core.directory_scanner.ProcessPoolExecutor") as mock_executor, \
+                self.assertLogs("src.core.directory_scanner", level="WARNING"):
+            mock_executor.return_value.submit.side_effect = submit
+            result = self.scanner.scan_directory(self.root_dir)
+        
+        # Check that both files were still validated and added
+        self.assertTrue(result["success"])
+        self.assertEqual((result["files_found"], result["files_added"]), (2, 2))
+        self.assertEqual(self.mock_local_file_model.add_file.call_count, 2)
+        mock_executor.return_value.shutdown.assert_called_once_with(cancel_futures=True)
+    
+    def test_scan_missing_directory(self):
+        """Test scanning a directory that doesn't exist."""
+        result = self.scanner.scan_directory(os.path.join(self.root_dir, "missing"))
+        
+        self.assertFalse(result["success"])
+        self.assertIn("does not exist", result["error"])
+    
+    def test_cancel_scan(self):
+        """Test cancelling a scan from the progress callback."""
+        progress = []
         
-        # Set up the mock os.path.getsize to raise an exception
-        mock_getsize.side_effect = OSError("Permission denied")
+        def progress_callback(files_processed, total_files, current_file):
+            progress.append((files_processed, total_files))
+            self.scanner.cancel_scan()
         
-        # Call the scan method
-        result = self.scanner.scan("/downloads")
+        result = self.scanner.scan_directory(self.root_dir, progress_callback)
         
-        # Check that no files were found (due to the error)
-        self.assertEqual(len(result), 0)
+        # Check that the scan stopped after the first file
+        self.assertTrue(result["cancelled"])
+        self.assertEqual(progress, [(0, 2)])
+        self.assertEqual(self.mock_local_file_model.add_file.call_count, 1)
+    
+    def test_file_counts(self):
+        """Test that the file counts come from the local file model."""
+        self.mock_local_file_model.get_file_count.return_value = 2
+        self.mock_local_file_model.get_file_count_by_type.return_value = {"txt": 2}
         
-        # Check that no files were added to the database
-        self.mock_local_file_model.add_file.assert_not_called()
+        self.assertEqual(self.scanner.get_total_file_count(), 2)
+        self.assertEqual(self.scanner.get_file_count_by_type(), {"txt": 2})
 
 
 if __name__ == "__main__":
-    unittest.main()
\ No newline at end of file
+    unittest.main()
@@ -0,0 +1,138 @@
+import os
+import tempfile
+import unittest
+
+from src.core.download_cache import DownloadCache
+
+
+_URL = "http://example.com/file.pdf"
+_ETAG = '"abc123"'
+_LAST_MODIFIED = "Wed, 21 Oct 2015 07:28:00 GMT"
+
+
+class TestDownloadCache(unittest.TestCase):
+    """Test case for the DownloadCache class."""
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        # A download directory with one downloaded file
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.file_path = os.path.join(temp_dir.name, "file.pdf")
+        with open(self.file_path, "wb") as f:
+            f.write(b"%PDF-1.4")
+        
+        self.cache_file = os.path.join(temp_dir.name, DownloadCache.FILE_NAME)
+        self.cache = DownloadCache(self.cache_file)
+    
+    def test_init(self):
+        """Test that a new cache is empty."""
+        self.assertEqual(self.cache.entries, {})
+        self.assertFalse(os.path.exists(self.cache_file))
+    
+    def test_get_conditional_headers(self):
+        """Test the headers for a file downloaded with validators."""
+        self.cache.update(_URL, self.file_path, 8, _ETAG, _LAST_MODIFIED)
+        
+        self.assertEqual(self.cache.get_conditional_headers(_URL, self.file_path), {
+            "If-None-Match": _ETAG,
+            "If-Modified-Since": _LAST_MODIFIED
+        })
+    
+    def test_get_conditional_headers_stale(self):
+        """Test that no headers are given when the saved file can't be used."""
+        self.cache.update(_URL, self.file_path, 8, _ETAG)
+        
+        with self.subTest("unknown URL"):
+            self.assertEqual(self.cache.get_conditional_headers("http://example.com/other.pdf", self.file_path), {})
+        
+        with self.subTest("other path"):
+            self.assertEqual(self.cache.get_conditional_headers(_URL, self.file_path + ".1"), {})
+        
+        with self.subTest("changed size"):
+            with open(self.file_path, "ab") as f:
+                f.write(b"\n")
+            self.assertEqual(self.cache.get_conditional_headers(_URL, self.file_path), {})
+        
+        with self.subTest("deleted file"):
+            os.remove(self.file_path)
+            self.assertEqual(self.cache.get_conditional_headers(_URL, self.file_path), {})
+    
+    def test_update_without_validators(self):
+        """Test that a download without validators removes the entry."""
+        self.cache.update(_URL, self.file_path, 8, _ETAG)
+        self.cache.update(_URL, self.file_path, 8)
+        
+        self.assertNotIn(_URL, self.cache.entries)
+        self.assertEqual(DownloadCache(self.cache_file).entries, {})
+    
+    def test_persistence(self):
+        """Test that the entries are loaded by a new cache."""
+        self.cache.update(_URL, self.file_path, 8, last_modified=_LAST_MODIFIED)
+        
+        cache = DownloadCache(self.cache_file)
+        
+        self.assertEqual(cache.get_conditional_headers(_URL, self.file_path), {
+            "If-Modified-Since": _LAST_MODIFIED
+        })
+    
+    def test_load_invalid_file(self):
+        """Test that an unreadable cache file gives an empty cache."""
+        with open(self.cache_file, "w") as f:
+            f.write("{not json")
+        
+        with self.assertLogs("src.core.download_cache", level="WARNING"):
+            cache = DownloadCache(self.cache_file)
+        
+        self.assertEqual(cache.entries, {})
+    
+    def test_get_range_headers(self):
+        """Test the headers for resuming a partial download."""
+        part_path = self.file_path + ".part"
+        
+        # Validators of the partial download, and the If-Range header sent
+        cases = (
+            (_ETAG, _LAST_MODIFIED, _ETAG),
+            ("W/" + _ETAG, _LAST_MODIFIED, _LAST_MODIFIED),  # Weak ETags can't be used
+            (None, _LAST_MODIFIED, _LAST_MODIFIED),
+        )
+        
+        for etag, last_modified, validator in cases:
+            with self.subTest(etag=etag):
+                self.cache.update_partial(_URL, part_path, etag, last_modified)
+                self.assertEqual(self.cache.get_range_headers(_URL, part_path, 6), {
+                    "Range": "bytes=6-",
+                    "If-Range": validator
+                })
+    
+    def test_get_range_headers_unknown(self):
+        """Test that partial downloads without known validators aren't resumed."""
+        part_path = self.file_path + ".part"
+        
+        with self.subTest("unknown URL"):
+            self.assertEqual(self.cache.get_range_headers(_URL, part_path, 6), {})
+        
+        with self.subTest("weak ETag only"):
+            self.cache.update_partial(_URL, part_path, "W/" + _ETAG)
+            self.assertEqual(self.cache.get_range_headers(_URL, part_path, 6), {})
+        
+        with self.subTest("other path"):
+            self.cache.update_partial(_URL, part_path, _ETAG)
+            self.assertEqual(self.cache.get_range_headers(_URL, part_path + ".1", 6), {})
+        
+        with self.subTest("no validators"):
+            self.cache.update_partial(_URL, part_path)
+            self.assertEqual(self.cache.get_range_headers(_URL, part_path, 6), {})
+        
+        with self.subTest("removed"):
+            self.cache.update_partial(_URL, part_path, _ETAG)
+            self.cache.remove_partial(_URL)
+            self.assertEqual(self.cache.get_range_headers(_URL, part_path, 6), {})
+        
+        with self.subTest("earlier run"):
+            self.cache.update_partial(_URL, part_path, _ETAG)
+            self.assertEqual(DownloadCache(self.cache_file).get_range_headers(_URL, part_path, 6), {})
+
+
+if __name__ == "__main__":
+    unittest.main()
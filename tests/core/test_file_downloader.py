@@ -1,8 +1,61 @@
-import unittest
-from unittest.mock import patch, MagicMock, mock_open
 import os
+import tempfile
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch, MagicMock
+
+import requests
+from urllib3.exceptions import ProtocolError
+
+from src.core.download_cache import DownloadCache
+from src.core.file_downloader import FileDownloader, CHUNK_SIZE, PART_SUFFIX, WRITE_WINDOW
+
+
+_URL = "http://example.com/file1.pdf"
+_ETAG = '"abc123"'
+
+# Headers asking for the rest of a partial download of 6 bytes
+_RANGE_HEADERS = {"Range": "bytes=6-", "If-Range": _ETAG, "Accept-Encoding": "identity"}
+
+
+def _readinto(chunks):
+    """Create a stand-in for readinto that reads the given chunks.
+    
+    Args:
+        chunks: Chunks of the body
+        
+    Returns:
+        Function copying the next chunk into the buffer and returning its size
+    """
+    chunks = iter(chunks)
+    
+    def readinto(buffer):
+        chunk = next(chunks, b"")
+        buffer[:len(chunk)] = chunk
+        return len(chunk)
+    
+    return readinto
+
 
-from src.core.file_downloader import FileDownloader
+def _response(chunks=(), status_code=200, headers=None):
+    """Create a mock streamed response.
+    
+    Args:
+        chunks: Chunks of the body
+        status_code: HTTP status code
+        headers: Response headers
+    
+    Returns:
+        Mock response, usable as a context manager like network_utils.get's
+    """
+    response = MagicMock()
+    response.status_code = status_code
+    response.headers = headers or {}
+    response.raw.readinto.side_effect = _readinto(chunks)
+    response.iter_content.return_value = list(chunks)
+    response.__enter__.return_value = response
+    return response
 
 
 class TestFileDownloader(unittest.TestCase):
@@ -10,164 +63,383 @@ class TestFileDownloader(unittest.TestCase):
     
     def setUp(self):
         """Set up test fixtures."""
+        # Download into a temporary directory, retrying once without waiting
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.download_dir = temp_dir.name
+        settings = {
+            ("download", "directory"): self.download_dir,
+            ("download", "retry_count"): 1,
+            ("download", "retry_delay"): 0,
+            ("download", "rate_limit_kbps"): 0,
+        }
+        config_patcher = patch("src.core.file_downloader.config")
+        config_patcher.start().get.side_effect = lambda section, key, default=None: settings.get((section, key), default)
+        self.addCleanup(config_patcher.stop)
+        
+        # Patch the requests sent through network_utils
+        get_patcher = patch("src.core.file_downloader.network_utils.get")
+        self.mock_get = get_patcher.start()
+        self.addCleanup(get_patcher.stop)
+        
         # Create the file downloader
         self.downloader = FileDownloader()
+        self.file_path = os.path.join(self.download_dir, "file1.pdf")
+    
+    def read_file(self):
+        """Read the downloaded file."""
+        with open(self.file_path, "rb") as f:
+            return f.read()
+    
+    def write_part(self, data, etag=_ETAG):
+        """Write the partial file of an earlier download.
+        
+        Args:
+            data: Contents of the partial file
+            etag: ETag of the response it came from, None if unknown
+        """
+        part_path = self.file_path + PART_SUFFIX
+        with open(part_path, "wb") as f:
+            f.write(data)
+        if etag:
+            self.downloader.cache.update_partial(_URL, part_path, etag)
     
     def test_init(self):
         """Test the constructor."""
-        # Check that the progress callback is None
-        self.assertIsNone(self.downloader.progress_callback)
-    
-    @patch('requests.get')
-    @patch('os.path.exists')
-    @patch('os.makedirs')
-    def test_download(self, mock_makedirs, mock_exists, mock_get):
-        """Test the download method."""
-        # Set up the mock requests.get to return a response
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.iter_content.return_value = [b'chunk1', b'chunk2']
-        mock_get.return_value = mock_response
-        
-        # Set up the mock os.path.exists to return False for the directory
-        mock_exists.return_value = False
-        
-        # Mock the open function
-        mock_file = MagicMock()
-        with patch('builtins.open', mock_open(mock=mock_file)):
-            # Call the download method
-            result = self.downloader.download(
-                "http://example.com/file1.pdf",
-                "/downloads/file1.pdf"
-            )
-            
-            # Check that the directory was created
-            mock_makedirs.assert_called_once_with("/downloads", exist_ok=True)
-            
-            # Check that the file was downloaded
-            mock_get.assert_called_once_with(
-                "http://example.com/file1.pdf",
-                stream=True
-            )
-            
-            # Check that the file was written
-            mock_file().write.assert_any_call(b'chunk1')
-            mock_file().write.assert_any_call(b'chunk2')
-            
-            # Check the result
-            self.assertEqual(result, "/downloads/file1.pdf")
-    
-    @patch('requests.get')
-    @patch('os.path.exists')
-    def test_download_with_existing_directory(self, mock_exists, mock_get):
-        """Test the download method with an existing directory."""
-        # Set up the mock requests.get to return a response
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.iter_content.return_value = [b'chunk1', b'chunk2']
-        mock_get.return_value = mock_response
-        
-        # Set up the mock os.path.exists to return True for the directory
-        mock_exists.return_value = True
-        
-        # Mock the open function
-        mock_file = MagicMock()
-        with patch('builtins.open', mock_open(mock=mock_file)):
-            # Call the download method
-            result = self.downloader.download(
-                "http://example.com/file1.pdf",
-                "/downloads/file1.pdf"
-            )
-            
-            # Check that the directory was not created
-            # (os.makedirs is not mocked in this test)
-            
-            # Check that the file was downloaded
-            mock_get.assert_called_once_with(
-                "http://example.com/file1.pdf",
-                stream=True
-            )
-            
-            # Check that the file was written
-            mock_file().write.assert_any_call(b'chunk1')
-            mock_file().write.assert_any_call(b'chunk2')
-            
-            # Check the result
-            self.assertEqual(result, "/downloads/file1.pdf")
-    
-    @patch('requests.get')
-    def test_download_with_http_error(self, mock_get):
-        """Test the download method with an HTTP error."""
-        # Set up the mock requests.get to return an error response
-        mock_response = MagicMock()
-        mock_response.status_code = 404
-        mock_get.return_value = mock_response
-        
-        # Call the download method and check that it raises an exception
-        with self.assertRaises(Exception):
-            self.downloader.download(
-                "http://example.com/file1.pdf",
-                "/downloads/file1.pdf"
-            )
-    
-    @patch('requests.get')
-    def test_download_with_network_error(self, mock_get):
-        """Test the download method with a network error."""
-        # Set up the mock requests.get to raise an exception
-        mock_get.side_effect = Exception("Network error")
-        
-        # Call the download method and check that it raises an exception
-        with self.assertRaises(Exception):
-            self.downloader.download(
-                "http://example.com/file1.pdf",
-                "/downloads/file1.pdf"
-            )
-    
-    @patch('requests.get')
-    @patch('os.path.exists')
-    def test_download_with_progress_callback(self, mock_exists, mock_get):
-        """Test the download method with a progress callback."""
-        # Set up the mock requests.get to return a response
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.headers = {"Content-Length": "100"}  # 100 bytes total
-        mock_response.iter_content.return_value = [b'chunk1', b'chunk2']
-        mock_get.return_value = mock_response
-        
-        # Set up the mock os.path.exists to return True for the directory
-        mock_exists.return_value = True
-        
-        # Create a mock progress callback
+        self.assertEqual(self.downloader.download_dir, self.download_dir)
+        self.assertEqual(self.downloader.retry_count, 1)
+        self.assertEqual(
+            self.downloader.cache.cache_file,
+            os.path.join(self.download_dir, DownloadCache.FILE_NAME)
+        )
+    
+    def test_download_file(self):
+        """Test downloading a file."""
+        self.mock_get.return_value = _response([b"chunk1", b"chunk2"], headers={"Content-Length": "12"})
+        
+        result = self.downloader.download_file(_URL)
+        
+        # Check that the file was requested without validators and read into
+        # one buffer until the end of the body
+        self.mock_get.assert_called_once_with(_URL, stream=True, retry=False, headers={})
+        readinto = self.mock_get.return_value.raw.readinto
+        self.assertEqual(readinto.call_count, 3)
+        self.assertEqual({len(call.args[0]) for call in readinto.call_args_list}, {CHUNK_SIZE})
+        self.assertEqual(len({id(call.args[0]) for call in readinto.call_args_list}), 1)
+        self.mock_get.return_value.iter_content.assert_not_called()
+        self.assertEqual(self.read_file(), b"chunk1chunk2")
+        
+        # Check the result
+        self.assertTrue(result["success"])
+        self.assertEqual(result["file_path"], self.file_path)
+        self.assertEqual(result["file_size"], 12)
+        self.assertIsNone(result["error"])
+    
+    def test_download_file_write_window(self):
+        """Test that chunks are gathered into windows before being written."""
+        # Window size, and the writes expected with it
+        cases = (
+            (WRITE_WINDOW, [b"chunk1chunk2"]),
+            (8, [b"chunk1", b"chunk2"]),  # The second chunk doesn't fit
+            (4, [b"chunk1", b"chunk2"]),  # The chunks are larger than the window
+        )
+        write = os.write
+        
+        for window, expected_writes in cases:
+            with self.subTest(window=window):
+                self.mock_get.return_value = _response([b"chunk1", b"chunk2"])
+                writes = []
+                
+                def record_write(fd, data):
+                    writes.append(bytes(data))
+                    return write(fd, data)
+                
+                with patch("src.core.file_downloader.WRITE_WINDOW", window), \
+                        patch("src.core.file_downloader.os.write", side_effect=record_write):
+                    result = self.downloader.download_file(_URL)
+                
+                self.assertTrue(result["success"])
+                self.assertEqual(writes, expected_writes)
+                self.assertEqual(self.read_file(), b"chunk1chunk2")
+    
+    def test_download_file_short_writes(self):
+        """Test that chunks are written in full when os.write writes less."""
+        self.mock_get.return_value = _response([b"chunk1", b"chunk2"])
+        write = os.write
+        
+        # Write one byte per call
+        with patch("src.core.file_downloader.os.write", side_effect=lambda fd, data: write(fd, data[:1])) as mock_write:
+            result = self.downloader.download_file(_URL)
+        
+        self.assertTrue(result["success"])
+        self.assertEqual(mock_write.call_count, 12)
+        self.assertEqual(self.read_file(), b"chunk1chunk2")
+    
+    def test_download_file_compressed(self):
+        """Test that a compressed body is decoded by iter_content."""
+        response = _response([b"chunk1", b"chunk2"], headers={"Content-Encoding": "gzip"})
+        self.mock_get.return_value = response
+        
+        result = self.downloader.download_file(_URL)
+        
+        response.iter_content.assert_called_once_with(chunk_size=CHUNK_SIZE)
+        response.raw.readinto.assert_not_called()
+        self.assertTrue(result["success"])
+        self.assertEqual(self.read_file(), b"chunk1chunk2")
+    
+    def test_download_file_with_category(self):
+        """Test that a file with a category is saved in its subdirectory."""
+        self.mock_get.return_value = _response([b"chunk1"])
+        
+        result = self.downloader.download_file(_URL, file_name="renamed.pdf", category_id=3)
+        
+        self.assertEqual(result["file_path"], os.path.join(self.download_dir, "category_3", "renamed.pdf"))
+        self.assertTrue(os.path.exists(result["file_path"]))
+    
+    def test_download_file_with_progress_callback(self):
+        """Test the progress updates of a download."""
+        self.mock_get.return_value = _response([b"chunk1", b"chunk2"], headers={"Content-Length": "12"})
         mock_callback = MagicMock()
         
-        # Set the progress callback
-        self.downloader.set_progress_callback(mock_callback)
-        
-        # Mock the open function
-        mock_file = MagicMock()
-        with patch('builtins.open', mock_open(mock=mock_file)):
-            # Call the download method
-            self.downloader.download(
-                "http://example.com/file1.pdf",
-                "/downloads/file1.pdf",
-                download_id=1
-            )
-            
-            # Check that the progress callback was called
-            # The exact progress values depend on the implementation
-            mock_callback.assert_called()
+        self.downloader.download_file(_URL, progress_callback=mock_callback)
+        
+        self.assertEqual([call.args[0] for call in mock_callback.call_args_list], [50.0, 100.0])
     
-    def test_set_progress_callback(self):
-        """Test the set_progress_callback method."""
-        # Create a mock callback
+    def test_download_file_progress_throttled(self):
+        """Test that progress is reported once per percent, not per chunk."""
+        self.mock_get.return_value = _response([b"a" * 100] * 1000, headers={"Content-Length": "100000"})
         mock_callback = MagicMock()
         
-        # Call the set_progress_callback method
-        self.downloader.set_progress_callback(mock_callback)
+        self.downloader.download_file(_URL, progress_callback=mock_callback)
         
-        # Check that the callback was saved
-        self.assertEqual(self.downloader.progress_callback, mock_callback)
+        progress = [call.args[0] for call in mock_callback.call_args_list]
+        self.assertEqual([round(percent) for percent in progress], list(range(1, 101)))
+        self.assertEqual(progress[-1], 100.0)
+    
+    def test_download_file_not_modified(self):
+        """Test that an unchanged file is kept instead of downloaded again."""
+        self.mock_get.return_value = _response([b"chunk1", b"chunk2"], headers={"ETag": _ETAG})
+        self.downloader.download_file(_URL)
+        
+        self.mock_get.reset_mock()
+        self.mock_get.return_value = _response(status_code=304)
+        
+        result = self.downloader.download_file(_URL)
+        
+        # Check that the validator was sent and the saved file kept
+        self.mock_get.assert_called_once_with(_URL, stream=True, retry=False, headers={"If-None-Match": _ETAG})
+        self.assertTrue(result["success"])
+        self.assertTrue(result["not_modified"])
+        self.assertEqual(result["file_size"], 12)
+        self.assertEqual(self.read_file(), b"chunk1chunk2")
+    
+    def test_download_file_not_modified_removes_part(self):
+        """Test that a partial download of an unchanged file is removed."""
+        self.mock_get.return_value = _response([b"chunk1", b"chunk2"], headers={"ETag": _ETAG})
+        self.downloader.download_file(_URL)
+        self.write_part(b"chunk1")
+        self.mock_get.return_value = _response(status_code=304)
+        
+        result = self.downloader.download_file(_URL)
+        
+        self.assertTrue(result["not_modified"])
+        self.assertEqual(self.read_file(), b"chunk1chunk2")
+        self.assertFalse(os.path.exists(self.file_path + PART_SUFFIX))
+    
+    def test_download_file_retry(self):
+        """Test that a failed request is retried."""
+        self.mock_get.side_effect = [requests.exceptions.ConnectionError("Network error"), _response([b"chunk1"])]
+        
+        result = self.downloader.download_file(_URL)
+        
+        self.assertEqual(self.mock_get.call_count, 2)
+        self.assertTrue(result["success"])
+    
+    def test_download_file_resumes(self):
+        """Test that a partial download is resumed from where it stopped."""
+        self.write_part(b"chunk1")
+        self.mock_get.return_value = _response([b"chunk2"], status_code=206, headers={
+            "Content-Length": "6", "Content-Range": "bytes 6-11/12", "ETag": _ETAG
+        })
+        
+        result = self.downloader.download_file(_URL)
+        
+        # Check that only the rest of the same file was requested and added to
+        # the partial file
+        self.mock_get.assert_called_once_with(_URL, stream=True, retry=False, headers=_RANGE_HEADERS)
+        self.assertTrue(result["success"])
+        self.assertEqual(result["file_size"], 12)
+        self.assertEqual(self.read_file(), b"chunk1chunk2")
+        self.assertFalse(os.path.exists(self.file_path + PART_SUFFIX))
+    
+    def test_download_file_range_ignored(self):
+        """Test that the partial file is replaced if the whole file is sent."""
+        self.write_part(b"chunk1")
+        self.mock_get.return_value = _response([b"chunk1", b"chunk2"])
+        
+        result = self.downloader.download_file(_URL)
+        
+        self.mock_get.assert_called_once_with(_URL, stream=True, retry=False, headers=_RANGE_HEADERS)
+        self.assertTrue(result["success"])
+        self.assertEqual(self.read_file(), b"chunk1chunk2")
+    
+    def test_download_file_stale_part(self):
+        """Test that a partial file without known validators isn't resumed."""
+        self.write_part(b"stale!", etag=None)
+        self.mock_get.return_value = _response([b"chunk1", b"chunk2"])
+        
+        result = self.downloader.download_file(_URL)
+        
+        self.mock_get.assert_called_once_with(_URL, stream=True, retry=False, headers={})
+        self.assertTrue(result["success"])
+        self.assertEqual(self.read_file(), b"chunk1chunk2")
+    
+    def test_download_file_range_mismatch(self):
+        """Test that the whole file is downloaded again if the rest doesn't fit."""
+        # Responses to the range request that don't continue the partial file
+        cases = (
+            ("other start", 206, {"Content-Range": "bytes 0-11/12"}),
+            ("no Content-Range", 206, {}),
+            ("encoded", 206, {"Content-Range": "bytes 6-11/12", "Content-Encoding": "gzip"}),
+            ("range not satisfiable", 416, {"Content-Range": "bytes */4"}),
+        )
+        
+        for name, status_code, headers in cases:
+            with self.subTest(name):
+                self.write_part(b"stale!")
+                self.mock_get.reset_mock()
+                range_response = _response([b"chunk2"], status_code=status_code, headers=headers)
+                self.mock_get.side_effect = [range_response, _response([b"chunk1", b"chunk2"])]
+                
+                result = self.downloader.download_file(_URL)
+                
+                # Check that the whole file was asked for after the range
+                self.assertEqual([call.kwargs["headers"] for call in self.mock_get.call_args_list],
+                                 [_RANGE_HEADERS, {}])
+                range_response.close.assert_called_once_with()
+                self.assertTrue(result["success"])
+                self.assertEqual(self.read_file(), b"chunk1chunk2")
+                self.assertFalse(os.path.exists(self.file_path + PART_SUFFIX))
+    
+    def test_download_file_retry_resumes(self):
+        """Test that a retry asks only for the rest of the file."""
+        chunks = iter([b"chunk1"])
+        
+        def readinto(buffer):
+            # Fail after the first chunk
+            chunk = next(chunks, None)
+            if chunk is None:
+                raise ProtocolError("Connection reset")
+            buffer[:len(chunk)] = chunk
+            return len(chunk)
+        
+        failed_response = _response(headers={"ETag": _ETAG})
+        failed_response.raw.readinto.side_effect = readinto
+        self.mock_get.side_effect = [
+            failed_response,
+            _response([b"chunk2"], status_code=206, headers={"Content-Range": "bytes 6-11/12", "ETag": _ETAG})
+        ]
+        
+        result = self.downloader.download_file(_URL)
+        
+        self.assertEqual(self.mock_get.call_args.kwargs["headers"], _RANGE_HEADERS)
+        self.assertTrue(result["success"])
+        self.assertEqual(self.read_file(), b"chunk1chunk2")
+    
+    def test_download_file_retry_encoded(self):
+        """Test that a failed download of an encoded body isn't resumed."""
+        failed_response = _response(headers={"ETag": _ETAG, "Content-Encoding": "gzip"})
+        failed_response.iter_content.side_effect = requests.exceptions.ChunkedEncodingError("Connection reset")
+        self.mock_get.side_effect = [failed_response, _response([b"chunk1", b"chunk2"])]
+        self.write_part(b"chunk1")
+        
+        result = self.downloader.download_file(_URL)
+        
+        # The first attempt asked for the rest, the retry for the whole file
+        self.assertEqual(self.mock_get.call_args.kwargs["headers"], {})
+        self.assertTrue(result["success"])
+        self.assertEqual(self.read_file(), b"chunk1chunk2")
+    
+    def test_download_file_error(self):
+        """Test that a failed download is reported and its partial file kept."""
+        response = _response([b"chunk1"])
+        response.raw.readinto.side_effect = ProtocolError("Network error")
+        self.mock_get.return_value = response
+        
+        result = self.downloader.download_file(_URL)
+        
+        # Check that every attempt failed
+        self.assertEqual(self.mock_get.call_count, 2)
+        self.assertFalse(result["success"])
+        self.assertEqual(result["error"], "Network error")
+        self.assertFalse(os.path.exists(self.file_path))
+        self.assertTrue(os.path.exists(self.file_path + PART_SUFFIX))
+    
+    def test_download_files(self):
+        """Test downloading several files at the same time."""
+        urls = [f"http://example.com/file{i}.pdf" for i in range(5)]
+        self.mock_get.side_effect = lambda url, **kwargs: _response([url.encode()])
+        
+        results = self.downloader.download_files(urls + urls[:1], category_id=3, max_workers=4)
+        
+        # Check that each file was downloaded once, into the category
+        self.assertEqual(list(results), urls)
+        self.assertEqual(self.mock_get.call_count, 5)
+        for url, result in results.items():
+            with self.subTest(url=url):
+                self.assertTrue(result["success"])
+                self.assertEqual(os.path.dirname(result["file_path"]), os.path.join(self.download_dir, "category_3"))
+                with open(result["file_path"], "rb") as f:
+                    self.assertEqual(f.read(), url.encode())
+    
+    def test_download_files_same_name(self):
+        """Test that a URL with the file name of an earlier one isn't downloaded."""
+        urls = ["http://example.com/a/file1.pdf", "http://example.com/b/file1.pdf"]
+        self.mock_get.side_effect = lambda url, **kwargs: _response([url.encode()])
+        
+        results = self.downloader.download_files(urls)
+        
+        # Check that the first URL was downloaded and the second reported
+        self.assertEqual(list(results), urls)
+        self.mock_get.assert_called_once()
+        self.assertTrue(results[urls[0]]["success"])
+        self.assertFalse(results[urls[1]]["success"])
+        self.assertEqual(results[urls[1]]["file_path"], self.file_path)
+        self.assertIn(self.file_path, results[urls[1]]["error"])
+        self.assertEqual(self.read_file(), urls[0].encode())
+    
+    def test_download_file_same_path_concurrently(self):
+        """Test that downloads to the same path aren't written into each other."""
+        urls = ["http://example.com/a/file1.pdf", "http://example.com/b/file1.pdf"]
+        bodies = {url: [url.encode()] * 20 for url in urls}
+        
+        def get(url, **kwargs):
+            response = _response(bodies[url])
+            readinto = response.raw.readinto.side_effect
+            
+            def slow_readinto(buffer):
+                # Give the other download time to write to the same path
+                time.sleep(0.001)
+                return readinto(buffer)
+            
+            response.raw.readinto.side_effect = slow_readinto
+            return response
+        
+        self.mock_get.side_effect = get
+        
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            results = list(executor.map(self.downloader.download_file, urls))
+        
+        # Check that both downloads succeeded and the file holds one of the bodies
+        self.assertTrue(all(result["success"] for result in results))
+        self.assertIn(self.read_file(), [b"".join(body) for body in bodies.values()])
+        self.assertFalse(os.path.exists(self.file_path + PART_SUFFIX))
+    
+    def test_download_files_empty(self):
+        """Test that no files give no results."""
+        self.assertEqual(self.downloader.download_files([]), {})
+        self.mock_get.assert_not_called()
 
 
 if __name__ == "__main__":
-    unittest.main()
\ No newline at end of file
+    unittest.main()
@@ -1 +1,117 @@
-"""Database model tests package."""
\ No newline at end of file
+"""Test utilities for database models.
+
+This module provides an in-memory database and a base test case for the
+database models.
+"""
+
+import unittest
+from unittest.mock import patch
+
+from src.db.database import DatabaseManager
+
+
+# Tables cleared between tests, children before parents
+TABLES = ("downloads", "local_files", "remote_files", "categories", "sites", "settings")
+
+# Remote file fields passed to RemoteFileModel.add_file; tests override single fields
+DEFAULT_FILE = {
+    "url": "http://example.com/file.pdf",
+    "name": "file.pdf",
+    "size": 1024,
+    "file_type": "pdf",
+}
+
+
+def make_file(**overrides):
+    """Build the fields of a remote file.
+    
+    Args:
+        **overrides: Fields to change from DEFAULT_FILE
+    
+    Returns:
+        Dictionary containing the file fields
+    """
+    return {**DEFAULT_FILE, **overrides}
+
+
+def make_test_db():
+    """Create an in-memory database with the application schema.
+    
+    Returns:
+        DatabaseManager connected to the new database
+    """
+    db_manager = DatabaseManager(":memory:")
+    db_manager.initialize_schema()
+    return db_manager
+
+
+class ModelTestCase(unittest.TestCase):
+    """Base test case for a database model backed by an in-memory database.
+    
+    Subclasses set model_class. The model is built once per class with its
+    db_manager patched to the test database, and every table is emptied
+    before each test.
+    """
+    
+    model_class = None
+    
+    @classmethod
+    def setUpClass(cls):
+        """Set up fixtures shared by all tests."""
+        cls.db_manager = make_test_db()
+        
+        # Patch the model's DatabaseManager so that nothing the model does on
+        # construction reaches the application database
+        with patch(f"{cls.model_class.__module__}.DatabaseManager", return_value=cls.db_manager):
+            cls.model = cls.model_class()
+    
+    @classmethod
+    def tearDownClass(cls):
+        """Tear down fixtures shared by all tests."""
+        cls.db_manager.close()
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        # Clear rows left over from the previous test
+        conn = self.db_manager.connect()
+        for table in TABLES:
+            conn.execute(f"DELETE FROM {table}")
+        conn.commit()
+    
+    def add_site(self, name="Test Site", url="http://example.com", scraper_type="example"):
+        """Add a site row.
+        
+        Args:
+            name: Name of the site
+            url: URL of the site
+            scraper_type: Type of scraper to use for the site
+        
+        Returns:
+            ID of the new site
+        """
+        conn = self.db_manager.connect()
+        cursor = conn.execute(
+            "INSERT INTO sites (name, url, scraper_type) VALUES (?, ?, ?)",
+            (name, url, scraper_type)
+        )
+        conn.commit()
+        return cursor.lastrowid
+    
+    def add_remote_file(self, site_id, **overrides):
+        """Add a remote file row.
+        
+        Args:
+            site_id: ID of the site the file belongs to
+            **overrides: Fields to change from DEFAULT_FILE
+        
+        Returns:
+            ID of the new file
+        """
+        file = make_file(**overrides)
+        conn = self.db_manager.connect()
+        cursor = conn.execute(
+            "INSERT INTO remote_files (site_id, url, name, size, file_type) VALUES (?, ?, ?, ?, ?)",
+            (site_id, file["url"], file["name"], file["size"], file["file_type"])
+        )
+        conn.commit()
+        return cursor.lastrowid
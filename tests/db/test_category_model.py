@@ -1,265 +1,122 @@
 import unittest
-from unittest.mock import patch, MagicMock
 
 from src.db.category_model import CategoryModel
-from src.db.database import Database
+from tests.db import ModelTestCase
 
 
-class TestCategoryModel(unittest.TestCase):
+class TestCategoryModel(ModelTestCase):
     """Test case for the CategoryModel class."""
     
+    model_class = CategoryModel
+    
     def setUp(self):
         """Set up test fixtures."""
-        # Create a mock database
-        self.mock_db = MagicMock(spec=Database)
+        super().setUp()
         
-        # Create the category model with the mock database
-        self.category_model = CategoryModel(self.mock_db)
+        # Every category belongs to a site
+        self.site_id = self.add_site()
     
     def test_add_category(self):
         """Test adding a category."""
-        # Set up the mock database to return a category ID
-        self.mock_db.execute_query.return_value = [{"id": 1}]
-        
         # Add a category
-        category_id = self.category_model.add_category(
+        category_id = self.model.add_category(
+            site_id=self.site_id,
             name="Test Category",
-            parent_id=None
+            url="http://example.com/category"
         )
         
-        # Check the result
-        self.assertEqual(category_id, 1)
-        
-        # Check that the database was called correctly
-        self.mock_db.execute_query.assert_called_once()
-        args, kwargs = self.mock_db.execute_query.call_args
-        self.assertTrue("INSERT INTO categories" in args[0])
-        self.assertEqual(kwargs["params"][0], "Test Category")
-        self.assertIsNone(kwargs["params"][1])  # parent_id
+        # Check that the category was stored
+        category = self.model.get_category_by_id(category_id)
+        self.assertEqual(
+            (category["site_id"], category["name"], category["url"], category["parent_id"]),
+            (self.site_id, "Test Category", "http://example.com/category", None)
+        )
     
     def test_add_subcategory(self):
         """Test adding a subcategory."""
-        # Set up the mock database to return a category ID
-        self.mock_db.execute_query.return_value = [{"id": 2}]
+        parent_id = self.model.add_category(self.site_id, "Parent", "http://example.com/parent")
         
         # Add a subcategory
-        category_id = self.category_model.add_category(
-            name="Test Subcategory",
-            parent_id=1
+        category_id = self.model.add_category(
+            site_id=self.site_id,
+            name="Child",
+            url="http://example.com/child",
+            parent_id=parent_id
         )
         
-        # Check the result
-        self.assertEqual(category_id, 2)
-        
-        # Check that the database was called correctly
-        self.mock_db.execute_query.assert_called_once()
-        args, kwargs = self.mock_db.execute_query.call_args
-        self.assertTrue("INSERT INTO categories" in args[0])
-        self.assertEqual(kwargs["params"][0], "Test Subcategory")
-        self.assertEqual(kwargs["params"][1], 1)  # parent_id
+        # Check the parent ID
+        self.assertEqual(self.model.get_category_by_id(category_id)["parent_id"], parent_id)
     
     def test_update_category(self):
         """Test updating a category."""
-        # Update a category
-        self.category_model.update_category(
-            category_id=1,
-            name="Updated Category",
-            parent_id=2
-        )
-        
-        # Check that the database was called correctly
-        self.mock_db.execute_query.assert_called_once()
-        args, kwargs = self.mock_db.execute_query.call_args
-        self.assertTrue("UPDATE categories" in args[0])
-        self.assertEqual(kwargs["params"][0], "Updated Category")
-        self.assertEqual(kwargs["params"][1], 2)  # parent_id
-        self.assertEqual(kwargs["params"][2], 1)  # category_id
-    
-    def test_delete_category(self):
-        """Test deleting a category."""
-        # Delete a category
-        self.category_model.delete_category(1)
-        
-        # Check that the database was called correctly
-        self.mock_db.execute_query.assert_called_once()
-        args, kwargs = self.mock_db.execute_query.call_args
-        self.assertTrue("DELETE FROM categories" in args[0])
-        self.assertEqual(kwargs["params"][0], 1)
-    
-    def test_get_category(self):
-        """Test getting a category."""
-        # Set up the mock database to return a category
-        self.mock_db.execute_query.return_value = [{
-            "id": 1,
-            "name": "Test Category",
-            "parent_id": None
-        }]
-        
-        # Get a category
-        category = self.category_model.get_category(1)
-        
-        # Check the result
-        self.assertEqual(category["id"], 1)
-        self.assertEqual(category["name"], "Test Category")
-        self.assertIsNone(category["parent_id"])
-        
-        # Check that the database was called correctly
-        self.mock_db.execute_query.assert_called_once()
-        args, kwargs = self.mock_db.execute_query.call_args
-        self.assertTrue("SELECT * FROM categories" in args[0])
-        self.assertEqual(kwargs["params"][0], 1)
-    
-    def test_get_category_not_found(self):
-        """Test getting a category that doesn't exist."""
-        # Set up the mock database to return no categories
-        self.mock_db.execute_query.return_value = []
-        
-        # Get a category that doesn't exist
-        category = self.category_model.get_category(999)
+        category_id = self.model.add_category(self.site_id, "Test Category", "http://example.com/category")
         
-        # Check the result
-        self.assertIsNone(category)
-    
-    def test_get_all_categories(self):
-        """Test getting all categories."""
-        # Set up the mock database to return categories
-        self.mock_db.execute_query.return_value = [
-            {
-                "id": 1,
-                "name": "Category 1",
-                "parent_id": None
-            },
-            {
-                "id": 2,
-                "name": "Category 2",
-                "parent_id": None
-            },
-            {
-                "id": 3,
-                "name": "Subcategory 1",
-                "parent_id": 1
-            }
-        ]
-        
-        # Get all categories
-        categories = self.category_model.get_all_categories()
+        # Update the category
+        updated = self.model.update_category(category_id, "Updated Category", "http://example.com/updated")
         
         # Check the result
-        self.assertEqual(len(categories), 3)
-        self.assertEqual(categories[0]["name"], "Category 1")
-        self.assertEqual(categories[1]["name"], "Category 2")
-        self.assertEqual(categories[2]["name"], "Subcategory 1")
-        
-        # Check that the database was called correctly
-        self.mock_db.execute_query.assert_called_once()
-        args, kwargs = self.mock_db.execute_query.call_args
-        self.assertTrue("SELECT * FROM categories" in args[0])
+        self.assertTrue(updated)
+        category = self.model.get_category_by_id(category_id)
+        self.assertEqual(
+            (category["name"], category["url"]),
+            ("Updated Category", "http://example.com/updated")
+        )
     
-    def test_get_subcategories(self):
-        """Test getting subcategories."""
-        # Set up the mock database to return subcategories
-        self.mock_db.execute_query.return_value = [
-            {
-                "id": 3,
-                "name": "Subcategory 1",
-                "parent_id": 1
-            },
-            {
-                "id": 4,
-                "name": "Subcategory 2",
-                "parent_id": 1
-            }
-        ]
-        
-        # Get subcategories
-        subcategories = self.category_model.get_subcategories(1)
-        
-        # Check the result
-        self.assertEqual(len(subcategories), 2)
-        self.assertEqual(subcategories[0]["name"], "Subcategory 1")
-        self.assertEqual(subcategories[1]["name"], "Subcategory 2")
+    def test_delete_category(self):
+        """Test deleting a category."""
+        category_id = self.model.add_category(self.site_id, "Test Category")
         
-        # Check that the database was called correctly
-        self.mock_db.execute_query.assert_called_once()
-        args, kwargs = self.mock_db.execute_query.call_args
-        self.assertTrue("SELECT * FROM categories WHERE parent_id" in args[0])
-        self.assertEqual(kwargs["params"][0], 1)
+        self.assertTrue(self.model.delete_category(category_id))
+        self.assertIsNone(self.model.get_category_by_id(category_id))
     
-    def test_get_category_by_name(self):
-        """Test getting a category by name."""
-        # Set up the mock database to return a category
-        self.mock_db.execute_query.return_value = [{
-            "id": 1,
-            "name": "Test Category",
-            "parent_id": None
-        }]
-        
-        # Get a category by name
-        category = self.category_model.get_category_by_name("Test Category")
-        
-        # Check the result
-        self.assertEqual(category["id"], 1)
-        self.assertEqual(category["name"], "Test Category")
+    def test_missing_category(self):
+        """Test the lookups and changes for a category that doesn't exist."""
+        calls = (
+            ("get_category_by_id", (999,), None),
+            ("update_category", (999, "Category"), False),
+            ("delete_category", (999,), False),
+        )
         
-        # Check that the database was called correctly
-        self.mock_db.execute_query.assert_called_once()
-        args, kwargs = self.mock_db.execute_query.call_args
-        self.assertTrue("SELECT * FROM categories WHERE name" in args[0])
-        self.assertEqual(kwargs["params"][0], "Test Category")
+        for method, args, expected in calls:
+            with self.subTest(method=method):
+                self.assertEqual(getattr(self.model, method)(*args), expected)
     
-    def test_get_category_by_name_not_found(self):
-        """Test getting a category by name that doesn't exist."""
-        # Set up the mock database to return no categories
-        self.mock_db.execute_query.return_value = []
-        
-        # Get a category by name that doesn't exist
-        category = self.category_model.get_category_by_name("Nonexistent")
-        
-        # Check the result
-        self.assertIsNone(category)
+    def test_get_categories_by_site(self):
+        """Test getting the categories of a site."""
+        other_site_id = self.add_site(name="Other Site", url="http://other.com")
+        
+        # Add categories to both sites
+        self.model.add_category(self.site_id, "B", "http://example.com/b")
+        self.model.add_category(self.site_id, "A", "http://example.com/a")
+        self.model.add_category(other_site_id, "C", "http://other.com/c")
+        
+        # Only the site's categories come back, sorted by name
+        categories = self.model.get_categories_by_site(self.site_id)
+        self.assertEqual([category["name"] for category in categories], ["A", "B"])
     
-    def test_get_category_path(self):
-        """Test getting the path of a category."""
-        # Set up the mock database to return categories for different queries
-        def mock_execute_query(query, params=None, fetch=False):
-            if "WHERE id = ?" in query and params[0] == 3:
-                return [{
-                    "id": 3,
-                    "name": "Subcategory",
-                    "parent_id": 2
-                }]
-            elif "WHERE id = ?" in query and params[0] == 2:
-                return [{
-                    "id": 2,
-                    "name": "Category",
-                    "parent_id": None
-                }]
-            else:
-                return []
-        
-        self.mock_db.execute_query.side_effect = mock_execute_query
+    def test_add_or_update_categories(self):
+        """Test replacing the categories of a site."""
+        self.model.add_category(self.site_id, "Old", "http://example.com/old")
         
-        # Get the path of a category
-        path = self.category_model.get_category_path(3)
+        # Replace the categories
+        result = self.model.add_or_update_categories(self.site_id, [
+            {"name": "New 1", "url": "http://example.com/new1"},
+            {"name": "New 2", "url": "http://example.com/new2"},
+        ])
         
         # Check the result
-        self.assertEqual(path, "Category/Subcategory")
+        self.assertEqual(result, {"deleted": 1, "added": 2})
+        categories = self.model.get_categories_by_site(self.site_id)
+        self.assertEqual([category["name"] for category in categories], ["New 1", "New 2"])
     
-    def test_get_category_path_root(self):
-        """Test getting the path of a root category."""
-        # Set up the mock database to return a root category
-        self.mock_db.execute_query.return_value = [{
-            "id": 1,
-            "name": "Root Category",
-            "parent_id": None
-        }]
+    def test_delete_categories_by_site(self):
+        """Test deleting the categories of a site."""
+        self.model.add_category(self.site_id, "A", "http://example.com/a")
+        self.model.add_category(self.site_id, "B", "http://example.com/b")
         
-        # Get the path of a root category
-        path = self.category_model.get_category_path(1)
-        
-        # Check the result
-        self.assertEqual(path, "Root Category")
+        self.assertEqual(self.model.delete_categories_by_site(self.site_id), 2)
+        self.assertEqual(self.model.get_categories_by_site(self.site_id), [])
 
 
 if __name__ == "__main__":
-    unittest.main()
\ No newline at end of file
+    unittest.main()
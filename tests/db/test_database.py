@@ -1,38 +1,35 @@
 import os
+import sqlite3
 import unittest
 import tempfile
-from unittest.mock import patch, MagicMock
+from pathlib import Path
+from unittest.mock import patch
 
-from src.db.database import Database
+from src.db import database
+from src.db.database import DatabaseManager
 
 
-class TestDatabase(unittest.TestCase):
-    """Test case for the Database class."""
+# Tables created by the schema
+_TABLES = ("sites", "categories", "remote_files", "local_files", "downloads", "settings",
+           "remote_files_fts", "local_files_fts")
+
+
+class TestDatabaseManager(unittest.TestCase):
+    """Test case for the DatabaseManager class."""
     
     def setUp(self):
         """Set up test fixtures."""
         # Create a temporary directory for the test database
         self.temp_dir = tempfile.TemporaryDirectory()
-        self.db_path = os.path.join(self.temp_dir.name, "test.db")
-        
-        # Patch the config to use the test database
-        self.config_patcher = patch('src.db.database.config')
-        self.mock_config = self.config_patcher.start()
-        self.mock_config.get.side_effect = lambda section, key, default=None: {
-            ("database", "path"): self.db_path
-        }.get((section, key), default)
+        self.db_path = os.path.join(self.temp_dir.name, "data", "test.db")
         
-        # Create the database
-        self.db = Database()
+        # Create the database manager
+        self.db_manager = DatabaseManager(self.db_path)
     
     def tearDown(self):
         """Clean up test fixtures."""
-        # Stop the config patcher
-        self.config_patcher.stop()
-        
         # Close the database connection
-        if hasattr(self.db, "conn") and self.db.conn is not None:
-            self.db.conn.close()
+        self.db_manager.close()
         
         # Remove the temporary directory
         self.temp_dir.cleanup()
@@ -40,151 +37,146 @@ class TestDatabase(unittest.TestCase):
     def test_connect(self):
         """Test connecting to the database."""
         # Connect to the database
-        self.db.connect()
+        conn = self.db_manager.connect()
         
-        # Check that the connection was established
-        self.assertIsNotNone(self.db.conn)
+        # Check that the connection was established and is reused
+        self.assertIsNotNone(conn)
+        self.assertIs(self.db_manager.connect(), conn)
+        self.assertIs(conn.row_factory, sqlite3.Row)
         
-        # Check that the database file was created
+        # Check that the database file and its directory were created
         self.assertTrue(os.path.exists(self.db_path))
     
+    def test_default_path(self):
+        """Test that the tests use a temporary database as the default."""
+        db_manager = DatabaseManager()
+        
+        self.assertEqual(str(db_manager.db_path), database.DEFAULT_DB_PATH)
+        self.assertNotEqual(db_manager.db_path.resolve(), Path("database/pdf_downloader.db").resolve())
+    
+    def test_table_exists(self):
+        """Test checking whether a table exists."""
+        self.assertFalse(self.db_manager.table_exists("settings"))
+        
+        self.db_manager.initialize_schema()
+        
+        self.assertTrue(self.db_manager.table_exists("settings"))
+    
     def test_close(self):
         """Test closing the database connection."""
         # Connect to the database
-        self.db.connect()
+        self.db_manager.connect()
         
         # Close the connection
-        self.db.close()
+        self.db_manager.close()
         
         # Check that the connection was closed
-        self.assertIsNone(self.db.conn)
+        self.assertIsNone(self.db_manager.connection)
     
     def test_execute_query(self):
-        """Test executing a query."""
-        # Connect to the database
-        self.db.connect()
-        
-        # Execute a query to create a table
-        self.db.execute_query(
-            "CREATE TABLE test (id INTEGER PRIMARY KEY, name TEXT)"
-        )
-        
-        # Execute a query to insert data
-        self.db.execute_query(
-            "INSERT INTO test (name) VALUES (?)",
-            ("Test Name",)
-        )
-        
-        # Execute a query to select data
-        result = self.db.execute_query(
-            "SELECT * FROM test",
-            fetch=True
-        )
-        
-        # Check the result
-        self.assertEqual(len(result), 1)
-        self.assertEqual(result[0]["name"], "Test Name")
+        """Test executing queries and committing them."""
+        self.db_manager.execute_script("CREATE TABLE test (id INTEGER PRIMARY KEY, name TEXT)")
+        
+        # Insert a row and commit it
+        cursor = self.db_manager.execute_query("INSERT INTO test (name) VALUES (?)", ("test",))
+        self.db_manager.commit()
+        self.assertEqual(cursor.lastrowid, 1)
+        
+        # Check that the row is still there after reconnecting
+        self.db_manager.close()
+        row = self.db_manager.execute_query("SELECT * FROM test WHERE id = ?", (1,)).fetchone()
+        self.assertEqual(dict(row), {"id": 1, "name": "test"})
     
     def test_execute_query_with_error(self):
-        """Test executing a query that causes an error."""
-        # Connect to the database
-        self.db.connect()
-        
-        # Execute a query with invalid SQL
-        with self.assertRaises(Exception):
-            self.db.execute_query("INVALID SQL")
+        """Test executing an invalid query."""
+        with self.assertRaises(sqlite3.Error):
+            self.db_manager.execute_query("SELECT * FROM nonexistent_table")
     
-    def test_transaction(self):
-        """Test executing queries in a transaction."""
-        # Connect to the database
-        self.db.connect()
-        
-        # Create a test table
-        self.db.execute_query(
-            "CREATE TABLE test (id INTEGER PRIMARY KEY, name TEXT)"
-        )
+    def test_initialize_schema(self):
+        """Test initializing the database schema."""
+        self.db_manager.initialize_schema()
         
-        # Execute queries in a transaction
-        with self.db.transaction():
-            self.db.execute_query(
-                "INSERT INTO test (name) VALUES (?)",
-                ("Name 1",)
-            )
-            self.db.execute_query(
-                "INSERT INTO test (name) VALUES (?)",
-                ("Name 2",)
-            )
-        
-        # Check that both inserts were committed
-        result = self.db.execute_query(
-            "SELECT * FROM test ORDER BY id",
-            fetch=True
-        )
+        # Check that the tables were created
+        cursor = self.db_manager.execute_query("SELECT name FROM sqlite_master WHERE type = 'table'")
+        tables = {row["name"] for row in cursor.fetchall()}
+        for table in _TABLES:
+            with self.subTest(table=table):
+                self.assertIn(table, tables)
         
-        self.assertEqual(len(result), 2)
-        self.assertEqual(result[0]["name"], "Name 1")
-        self.assertEqual(result[1]["name"], "Name 2")
+        # Initializing an existing database leaves it unchanged
+        self.db_manager.initialize_schema()
     
-    def test_transaction_rollback(self):
-        """Test rolling back a transaction."""
-        # Connect to the database
-        self.db.connect()
-        
-        # Create a test table
-        self.db.execute_query(
-            "CREATE TABLE test (id INTEGER PRIMARY KEY, name TEXT)"
+    def test_initialize_schema_indexes_existing_files(self):
+        """Test that files added before the full-text indexes existed get indexed."""
+        self.db_manager.initialize_schema()
+        
+        # A database whose files were added without the remote file index
+        self.db_manager.execute_script("""
+            DROP TRIGGER remote_files_fts_insert;
+            DROP TRIGGER remote_files_fts_replace;
+            DROP TABLE remote_files_fts;
+            INSERT INTO sites (name, url, scraper_type) VALUES ('Site', 'http://example.com', 'example');
+            INSERT INTO remote_files (site_id, name, url) VALUES (1, 'book.pdf', 'http://example.com/book.pdf');
+        """)
+        
+        self.db_manager.initialize_schema()
+        
+        # Check that the file can be found in the new index
+        cursor = self.db_manager.execute_query(
+            "SELECT rowid FROM remote_files_fts WHERE remote_files_fts MATCH ?", ('"book"',)
         )
-        
-        # Insert initial data
-        self.db.execute_query(
-            "INSERT INTO test (name) VALUES (?)",
-            ("Initial",)
+        self.assertEqual([row[0] for row in cursor.fetchall()], [1])
+    
+    def test_initialize_schema_replaced_row(self):
+        """Test that rows replaced on a conflict leave no stale index entries."""
+        self.db_manager.initialize_schema()
+        
+        # Replace a local file and a remote file by inserting rows that conflict
+        self.db_manager.execute_script("""
+            INSERT INTO sites (name, url, scraper_type) VALUES ('Site', 'http://example.com', 'example');
+            INSERT INTO local_files (path) VALUES ('/path/to/book.pdf');
+            INSERT INTO local_files (path) VALUES ('/path/to/book.pdf');
+            INSERT INTO remote_files (site_id, name, url) VALUES (1, 'book.pdf', 'http://example.com/book.pdf');
+            INSERT INTO remote_files (site_id, name, url) VALUES (1, 'novel.pdf', 'http://example.com/book.pdf');
+        """)
+        
+        # Check that only the new rows are indexed
+        searches = (
+            ("local_files_fts", '"book"', [2]),
+            ("remote_files_fts", '"book"', []),
+            ("remote_files_fts", '"novel"', [2]),
         )
-        
-        # Try to execute queries in a transaction that will fail
-        try:
-            with self.db.transaction():
-                self.db.execute_query(
-                    "INSERT INTO test (name) VALUES (?)",
-                    ("Name 1",)
+        for table, phrase, expected in searches:
+            with self.subTest(table=table, phrase=phrase):
+                cursor = self.db_manager.execute_query(
+                    f"SELECT rowid FROM {table} WHERE {table} MATCH ?", (phrase,)
                 )
-                # This will cause an error
-                self.db.execute_query("INVALID SQL")
-        except Exception:
-            pass
-        
-        # Check that the transaction was rolled back
-        result = self.db.execute_query(
-            "SELECT * FROM test",
-            fetch=True
-        )
+                self.assertEqual([row[0] for row in cursor.fetchall()], expected)
         
-        self.assertEqual(len(result), 1)  # Only the initial insert should be there
-        self.assertEqual(result[0]["name"], "Initial")
+        # Check that the indexes match their tables
+        for table in ("local_files_fts", "remote_files_fts"):
+            with self.subTest(table=table):
+                self.db_manager.execute_query(f"INSERT INTO {table} ({table}) VALUES ('integrity-check')")
     
-    def test_initialize_schema(self):
-        """Test initializing the database schema."""
-        # Mock the schema file
-        schema_content = """
-        CREATE TABLE test (id INTEGER PRIMARY KEY, name TEXT);
-        INSERT INTO test (name) VALUES ('Schema Test');
-        """
-        
-        # Patch the open function to return the mock schema
-        with patch('builtins.open', unittest.mock.mock_open(read_data=schema_content)):
-            # Connect to the database and initialize the schema
-            self.db.connect()
-            self.db.initialize_schema()
-            
-            # Check that the schema was applied
-            result = self.db.execute_query(
-                "SELECT * FROM test",
-                fetch=True
-            )
-            
-            self.assertEqual(len(result), 1)
-            self.assertEqual(result[0]["name"], "Schema Test")
+    def test_initialize_schema_without_fts(self):
+        """Test initializing the schema when SQLite has no trigram tokenizer."""
+        with patch("src.db.database.FTS_ENABLED", False), \
+                self.assertLogs("src.db.database", level="WARNING"):
+            self.db_manager.initialize_schema()
+        
+        # Check that the file tables were created without the indexes
+        cursor = self.db_manager.execute_query("SELECT name FROM sqlite_master WHERE type = 'table'")
+        tables = {row["name"] for row in cursor.fetchall()}
+        self.assertIn("local_files", tables)
+        self.assertNotIn("local_files_fts", tables)
+        self.assertNotIn("remote_files_fts", tables)
+    
+    def test_initialize_schema_missing_file(self):
+        """Test initializing the schema without a schema file."""
+        with patch("src.db.database.Path.exists", return_value=False):
+            with self.assertRaises(FileNotFoundError):
+                self.db_manager.initialize_schema()
 
 
 if __name__ == "__main__":
-    unittest.main()
\ No newline at end of file
+    unittest.main()
@@ -1,273 +1,144 @@
 import unittest
-from unittest.mock import patch, MagicMock
+from types import MappingProxyType
 
 from src.db.download_model import DownloadModel
-from src.db.database import Database
+from tests.db import ModelTestCase
 
 
-class TestDownloadModel(unittest.TestCase):
+# Remote files the downloads are for; read-only so that tests can't change
+# them for the tests that run after them
+_REMOTE_FILES = (
+    MappingProxyType({"url": "http://example.com/file1.pdf", "name": "file1.pdf"}),
+    MappingProxyType({"url": "http://example.com/file2.pdf", "name": "file2.pdf"}),
+)
+
+
+class TestDownloadModel(ModelTestCase):
     """Test case for the DownloadModel class."""
     
+    model_class = DownloadModel
+    
     def setUp(self):
         """Set up test fixtures."""
-        # Create a mock database
-        self.mock_db = MagicMock(spec=Database)
+        super().setUp()
         
-        # Create the download model with the mock database
-        self.download_model = DownloadModel(self.mock_db)
+        # Every download is for a remote file
+        site_id = self.add_site()
+        self.file_ids = [self.add_remote_file(site_id, **file) for file in _REMOTE_FILES]
     
-    def test_add_to_queue(self):
-        """Test adding a download to the queue."""
-        # Set up the mock database to return a download ID
-        self.mock_db.execute_query.return_value = [{"id": 1}]
-        
-        # Add a download to the queue
-        download_id = self.download_model.add_to_queue(
-            url="http://example.com/test.pdf",
-            file_name="test.pdf",
-            file_type="pdf",
-            category_id=2,
-            priority=1,
-            status="queued"
-        )
-        
-        # Check the result
-        self.assertEqual(download_id, 1)
-        
-        # Check that the database was called correctly
-        self.mock_db.execute_query.assert_called_once()
-        args, kwargs = self.mock_db.execute_query.call_args
-        self.assertTrue("INSERT INTO downloads" in args[0])
-        self.assertEqual(kwargs["params"][0], "http://example.com/test.pdf")
-        self.assertEqual(kwargs["params"][1], "test.pdf")
-        self.assertEqual(kwargs["params"][2], "pdf")
-        self.assertEqual(kwargs["params"][3], 2)  # category_id
-        self.assertEqual(kwargs["params"][4], 1)  # priority
-        self.assertEqual(kwargs["params"][5], "queued")  # status
+    def add_local_file(self):
+        """Add a local file row.
+        
+        Returns:
+            ID of the new local file
+        """
+        conn = self.db_manager.connect()
+        cursor = conn.execute("INSERT INTO local_files (path) VALUES ('/path/to/file1.pdf')")
+        conn.commit()
+        return cursor.lastrowid
     
-    def test_get_queue(self):
-        """Test getting the download queue."""
-        # Set up the mock database to return downloads
-        self.mock_db.execute_query.return_value = [
-            {
-                "id": 1,
-                "url": "http://example.com/file1.pdf",
-                "file_name": "file1.pdf",
-                "file_type": "pdf",
-                "category_id": 1,
-                "priority": 1,
-                "status": "queued",
-                "created_at": 1609459200,
-                "started_at": None,
-                "completed_at": None
-            },
-            {
-                "id": 2,
-                "url": "http://example.com/file2.pdf",
-                "file_name": "file2.pdf",
-                "file_type": "pdf",
-                "category_id": 1,
-                "priority": 2,
-                "status": "queued",
-                "created_at": 1609459300,
-                "started_at": None,
-                "completed_at": None
-            }
-        ]
-        
-        # Get the download queue
-        queue = self.download_model.get_queue()
-        
-        # Check the result
-        self.assertEqual(len(queue), 2)
-        self.assertEqual(queue[0]["file_name"], "file1.pdf")
-        self.assertEqual(queue[1]["file_name"], "file2.pdf")
-        
-        # Check that the database was called correctly
-        self.mock_db.execute_query.assert_called_once()
-        args, kwargs = self.mock_db.execute_query.call_args
-        self.assertTrue("SELECT * FROM downloads WHERE status IN" in args[0])
-    
-    def test_get_queue_by_status(self):
-        """Test getting the download queue filtered by status."""
-        # Set up the mock database to return downloads
-        self.mock_db.execute_query.return_value = [
-            {
-                "id": 1,
-                "url": "http://example.com/file1.pdf",
-                "file_name": "file1.pdf",
-                "file_type": "pdf",
-                "category_id": 1,
-                "priority": 1,
-                "status": "downloading",
-                "created_at": 1609459200,
-                "started_at": 1609459300,
-                "completed_at": None
-            }
-        ]
-        
-        # Get the download queue filtered by status
-        queue = self.download_model.get_queue_by_status("downloading")
-        
-        # Check the result
-        self.assertEqual(len(queue), 1)
-        self.assertEqual(queue[0]["status"], "downloading")
-        
-        # Check that the database was called correctly
-        self.mock_db.execute_query.assert_called_once()
-        args, kwargs = self.mock_db.execute_query.call_args
-        self.assertTrue("SELECT * FROM downloads WHERE status = ?" in args[0])
-        self.assertEqual(kwargs["params"][0], "downloading")
-    
-    def test_get_download(self):
-        """Test getting a specific download."""
-        # Set up the mock database to return a download
-        self.mock_db.execute_query.return_value = [{
-            "id": 1,
-            "url": "http://example.com/file1.pdf",
-            "file_name": "file1.pdf",
-            "file_type": "pdf",
-            "category_id": 1,
-            "priority": 1,
-            "status": "queued",
-            "created_at": 1609459200,
-            "started_at": None,
-            "completed_at": None
-        }]
-        
-        # Get a specific download
-        download = self.download_model.get_download(1)
-        
-        # Check the result
-        self.assertEqual(download["id"], 1)
-        self.assertEqual(download["file_name"], "file1.pdf")
-        
-        # Check that the database was called correctly
-        self.mock_db.execute_query.assert_called_once()
-        args, kwargs = self.mock_db.execute_query.call_args
-        self.assertTrue("SELECT * FROM downloads WHERE id = ?" in args[0])
-        self.assertEqual(kwargs["params"][0], 1)
+    def test_create_download(self):
+        """Test creating a download record."""
+        # Create a download
+        download_id = self.model.create_download(self.file_ids[0])
+        
+        # Check that the download was stored with the file name
+        download = self.model.get_download_by_id(download_id)
+        self.assertEqual(
+            (download["remote_file_id"], download["status"], download["file_name"]),
+            (self.file_ids[0], "pending", "file1.pdf")
+        )
+        self.assertIsNotNone(download["created_at"])
     
     def test_get_download_not_found(self):
         """Test getting a download that doesn't exist."""
-        # Set up the mock database to return no downloads
-        self.mock_db.execute_query.return_value = []
-        
-        # Get a download that doesn't exist
-        download = self.download_model.get_download(999)
+        self.assertIsNone(self.model.get_download_by_id(999))
+    
+    def test_get_download_unknown_file(self):
+        """Test getting a download whose remote file is gone."""
+        download_id = self.model.create_download(self.file_ids[0])
+        self.db_manager.connect().execute("DELETE FROM remote_files WHERE id = ?", (self.file_ids[0],))
         
-        # Check the result
-        self.assertIsNone(download)
+        self.assertEqual(self.model.get_download_by_id(download_id)["file_name"], "Unknown")
     
     def test_update_status(self):
-        """Test updating the status of a download."""
-        # Update the status of a download
-        self.download_model.update_status(1, "downloading")
+        """Test moving a download through its statuses."""
+        local_file_id = self.add_local_file()
+        updates = (
+            ("update_download_started", (), "in_progress", "started_at"),
+            ("update_download_completed", (local_file_id,), "completed", "completed_at"),
+            ("update_download_failed", ("Connection error",), "failed", "completed_at"),
+        )
         
-        # Check that the database was called correctly
-        self.mock_db.execute_query.assert_called_once()
-        args, kwargs = self.mock_db.execute_query.call_args
-        self.assertTrue("UPDATE downloads SET status = ?" in args[0])
-        self.assertEqual(kwargs["params"][0], "downloading")
-        self.assertEqual(kwargs["params"][2], 1)  # download_id
+        for method, args, status, timestamp in updates:
+            with self.subTest(method=method):
+                download_id = self.model.create_download(self.file_ids[0])
+                
+                # Update the download
+                self.assertTrue(getattr(self.model, method)(download_id, *args))
+                
+                # Check the status and timestamp
+                download = self.model.get_download_by_id(download_id)
+                self.assertEqual(download["status"], status)
+                self.assertIsNotNone(download[timestamp])
+                self.assertEqual(self.model.count_downloads_by_status(status), 1)
     
-    def test_update_status_completed(self):
-        """Test updating the status of a download to completed."""
-        # Update the status of a download to completed
-        self.download_model.update_status(1, "completed")
+    def test_update_completed_links_local_file(self):
+        """Test that completing a download records the local file."""
+        local_file_id = self.add_local_file()
+        download_id = self.model.create_download(self.file_ids[0])
         
-        # Check that the database was called correctly
-        self.mock_db.execute_query.assert_called_once()
-        args, kwargs = self.mock_db.execute_query.call_args
-        self.assertTrue("UPDATE downloads SET status = ?" in args[0])
-        self.assertEqual(kwargs["params"][0], "completed")
-        self.assertEqual(kwargs["params"][2], 1)  # download_id
-    
-    def test_remove_from_queue(self):
-        """Test removing a download from the queue."""
-        # Remove a download from the queue
-        self.download_model.remove_from_queue(1)
+        self.model.update_download_completed(download_id, local_file_id)
         
-        # Check that the database was called correctly
-        self.mock_db.execute_query.assert_called_once()
-        args, kwargs = self.mock_db.execute_query.call_args
-        self.assertTrue("DELETE FROM downloads WHERE id = ?" in args[0])
-        self.assertEqual(kwargs["params"][0], 1)
+        self.assertEqual(self.model.get_download_by_id(download_id)["local_file_id"], local_file_id)
     
-    def test_get_history(self):
-        """Test getting the download history."""
-        # Set up the mock database to return downloads
-        self.mock_db.execute_query.return_value = [
-            {
-                "id": 1,
-                "url": "http://example.com/file1.pdf",
-                "file_name": "file1.pdf",
-                "file_type": "pdf",
-                "category_id": 1,
-                "priority": 1,
-                "status": "completed",
-                "created_at": 1609459200,
-                "started_at": 1609459300,
-                "completed_at": 1609459400
-            },
-            {
-                "id": 2,
-                "url": "http://example.com/file2.pdf",
-                "file_name": "file2.pdf",
-                "file_type": "pdf",
-                "category_id": 1,
-                "priority": 2,
-                "status": "failed",
-                "created_at": 1609459500,
-                "started_at": 1609459600,
-                "completed_at": 1609459700
-            }
-        ]
+    def test_update_failed_records_error(self):
+        """Test that a failed download records the error message."""
+        download_id = self.model.create_download(self.file_ids[0])
         
-        # Get the download history
-        history = self.download_model.get_history()
+        self.model.update_download_failed(download_id, "Connection error")
         
-        # Check the result
-        self.assertEqual(len(history), 2)
-        self.assertEqual(history[0]["status"], "completed")
-        self.assertEqual(history[1]["status"], "failed")
+        self.assertEqual(self.model.get_download_by_id(download_id)["error_message"], "Connection error")
+    
+    def test_get_pending_and_in_progress_downloads(self):
+        """Test getting the pending downloads and the downloads in progress."""
+        started_id = self.model.create_download(self.file_ids[0])
+        pending_id = self.model.create_download(self.file_ids[1])
+        self.model.update_download_started(started_id)
+        
+        self.assertEqual([download["id"] for download in self.model.get_in_progress_downloads()], [started_id])
+        self.assertEqual([download["id"] for download in self.model.get_pending_downloads()], [pending_id])
+    
+    def test_delete_download(self):
+        """Test deleting a download record."""
+        download_id = self.model.create_download(self.file_ids[0])
         
-        # Check that the database was called correctly
-        self.mock_db.execute_query.assert_called_once()
-        args, kwargs = self.mock_db.execute_query.call_args
-        self.assertTrue("SELECT * FROM downloads WHERE status IN" in args[0])
+        self.assertTrue(self.model.delete_download(download_id))
+        self.assertIsNone(self.model.get_download_by_id(download_id))
     
-    def test_get_history_by_status(self):
-        """Test getting the download history filtered by status."""
-        # Set up the mock database to return downloads
-        self.mock_db.execute_query.return_value = [
-            {
-                "id": 1,
-                "url": "http://example.com/file1.pdf",
-                "file_name": "file1.pdf",
-                "file_type": "pdf",
-                "category_id": 1,
-                "priority": 1,
-                "status": "completed",
-                "created_at": 1609459200,
-                "started_at": 1609459300,
-                "completed_at": 1609459400
-            }
-        ]
+    def test_get_download_history(self):
+        """Test getting the download history with file names."""
+        self.model.create_download(self.file_ids[0])
+        self.model.create_download(self.file_ids[1])
         
-        # Get the download history filtered by status
-        history = self.download_model.get_history_by_status("completed")
+        history = self.model.get_download_history(limit=1)
         
         # Check the result
         self.assertEqual(len(history), 1)
-        self.assertEqual(history[0]["status"], "completed")
+        self.assertIn(history[0]["file_name"], [file["name"] for file in _REMOTE_FILES])
+        self.assertEqual(len(self.model.get_download_history()), len(_REMOTE_FILES))
+    
+    def test_get_download_history_file_paths(self):
+        """Test that the download history carries the local file paths."""
+        completed_id = self.model.create_download(self.file_ids[0])
+        self.model.create_download(self.file_ids[1])
+        self.model.update_download_completed(completed_id, self.add_local_file())
+        
+        paths = {download["id"]: download["file_path"] for download in self.model.get_download_history()}
         
-        # Check that the database was called correctly
-        self.mock_db.execute_query.assert_called_once()
-        args, kwargs = self.mock_db.execute_query.call_args
-        self.assertTrue("SELECT * FROM downloads WHERE status = ?" in args[0])
-        self.assertEqual(kwargs["params"][0], "completed")
+        self.assertEqual(paths.pop(completed_id), "/path/to/file1.pdf")
+        self.assertEqual(list(paths.values()), [None])
 
 
 if __name__ == "__main__":
-    unittest.main()
\ No newline at end of file
+    unittest.main()
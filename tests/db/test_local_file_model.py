@@ -1,349 +1,175 @@
 import unittest
-from unittest.mock import patch, MagicMock
+from types import MappingProxyType
+from unittest.mock import patch
 
 from src.db.local_file_model import LocalFileModel
-from src.db.database import Database
+from tests.db import ModelTestCase
 
 
-class TestLocalFileModel(unittest.TestCase):
+# Local files added by the tests; read-only so that tests can't change them
+# for the tests that run after them
+_FILES = (
+    MappingProxyType({"path": "/path/to/file1.pdf", "size": 1024, "file_type": "pdf"}),
+    MappingProxyType({"path": "/path/to/file2.pdf", "size": 2048, "file_type": "pdf"}),
+    MappingProxyType({"path": "/path/to/book.epub", "size": 4096, "file_type": "epub"}),
+)
+
+
+class TestLocalFileModel(ModelTestCase):
     """Test case for the LocalFileModel class."""
     
-    def setUp(self):
-        """Set up test fixtures."""
-        # Create a mock database
-        self.mock_db = MagicMock(spec=Database)
+    model_class = LocalFileModel
+    
+    def add_files(self):
+        """Add the files in _FILES.
         
-        # Create the local file model with the mock database
-        self.local_file_model = LocalFileModel(self.mock_db)
+        Returns:
+            List of the new file IDs
+        """
+        return [self.model.add_file(**file) for file in _FILES]
     
     def test_add_file(self):
-        """Test adding a local file."""
-        # Set up the mock database to return a file ID
-        self.mock_db.execute_query.return_value = [{"id": 1}]
-        
-        # Add a local file
-        file_id = self.local_file_model.add_file(
-            path="/downloads/file.pdf",
-            name="file.pdf",
-            file_type="pdf",
-            size=1024,
-            category_id=2,
-            hash_value="abc123"
+        """Test adding a file."""
+        # Add a file
+        file_id = self.model.add_file(path="/path/to/file.pdf", size=1024, file_type="pdf")
+        
+        # Check that the file was stored
+        file = self.model.get_file_by_id(file_id)
+        self.assertEqual(
+            (file["path"], file["size"], file["file_type"], file["remote_file_id"]),
+            ("/path/to/file.pdf", 1024, "pdf", None)
         )
-        
-        # Check the result
-        self.assertEqual(file_id, 1)
-        
-        # Check that the database was called correctly
-        self.mock_db.execute_query.assert_called_once()
-        args, kwargs = self.mock_db.execute_query.call_args
-        self.assertTrue("INSERT INTO local_files" in args[0])
-        self.assertEqual(kwargs["params"][0], "/downloads/file.pdf")
-        self.assertEqual(kwargs["params"][1], "file.pdf")
-        self.assertEqual(kwargs["params"][2], "pdf")
-        self.assertEqual(kwargs["params"][3], 1024)  # size
-        self.assertEqual(kwargs["params"][4], 2)  # category_id
-        self.assertEqual(kwargs["params"][5], "abc123")  # hash_value
+        self.assertIsNotNone(file["last_checked"])
     
     def test_update_file(self):
-        """Test updating a local file."""
-        # Update a local file
-        self.local_file_model.update_file(
-            file_id=1,
-            path="/downloads/updated.pdf",
-            name="updated.pdf",
-            file_type="pdf",
-            size=2048,
-            category_id=3,
-            hash_value="def456"
-        )
-        
-        # Check that the database was called correctly
-        self.mock_db.execute_query.assert_called_once()
-        args, kwargs = self.mock_db.execute_query.call_args
-        self.assertTrue("UPDATE local_files" in args[0])
-        self.assertEqual(kwargs["params"][0], "/downloads/updated.pdf")
-        self.assertEqual(kwargs["params"][1], "updated.pdf")
-        self.assertEqual(kwargs["params"][2], "pdf")
-        self.assertEqual(kwargs["params"][3], 2048)  # size
-        self.assertEqual(kwargs["params"][4], 3)  # category_id
-        self.assertEqual(kwargs["params"][5], "def456")  # hash_value
-        self.assertEqual(kwargs["params"][6], 1)  # file_id
-    
-    def test_delete_file(self):
-        """Test deleting a local file."""
-        # Delete a local file
-        self.local_file_model.delete_file(1)
-        
-        # Check that the database was called correctly
-        self.mock_db.execute_query.assert_called_once()
-        args, kwargs = self.mock_db.execute_query.call_args
-        self.assertTrue("DELETE FROM local_files" in args[0])
-        self.assertEqual(kwargs["params"][0], 1)
-    
-    def test_get_file(self):
-        """Test getting a local file."""
-        # Set up the mock database to return a file
-        self.mock_db.execute_query.return_value = [{
-            "id": 1,
-            "path": "/downloads/file.pdf",
-            "name": "file.pdf",
-            "file_type": "pdf",
-            "size": 1024,
-            "category_id": 2,
-            "hash": "abc123",
-            "last_updated": 1609459200
-        }]
-        
-        # Get a local file
-        file = self.local_file_model.get_file(1)
-        
-        # Check the result
-        self.assertEqual(file["id"], 1)
-        self.assertEqual(file["path"], "/downloads/file.pdf")
-        self.assertEqual(file["name"], "file.pdf")
-        
-        # Check that the database was called correctly
-        self.mock_db.execute_query.assert_called_once()
-        args, kwargs = self.mock_db.execute_query.call_args
-        self.assertTrue("SELECT * FROM local_files" in args[0])
-        self.assertEqual(kwargs["params"][0], 1)
-    
-    def test_get_file_not_found(self):
-        """Test getting a local file that doesn't exist."""
-        # Set up the mock database to return no files
-        self.mock_db.execute_query.return_value = []
+        """Test updating a file."""
+        file_id = self.model.add_file("/path/to/file.pdf", 1024, "pdf")
         
-        # Get a local file that doesn't exist
-        file = self.local_file_model.get_file(999)
+        # Update the file
+        updated = self.model.update_file(file_id, "/path/to/updated.pdf", 2048, "pdf")
         
         # Check the result
-        self.assertIsNone(file)
+        self.assertTrue(updated)
+        file = self.model.get_file_by_id(file_id)
+        self.assertEqual((file["path"], file["size"]), ("/path/to/updated.pdf", 2048))
     
-    def test_get_files_by_category(self):
-        """Test getting local files by category."""
-        # Set up the mock database to return files
-        self.mock_db.execute_query.return_value = [
-            {
-                "id": 1,
-                "path": "/downloads/file1.pdf",
-                "name": "file1.pdf",
-                "file_type": "pdf",
-                "size": 1024,
-                "category_id": 2,
-                "hash": "abc123",
-                "last_updated": 1609459200
-            },
-            {
-                "id": 2,
-                "path": "/downloads/file2.pdf",
-                "name": "file2.pdf",
-                "file_type": "pdf",
-                "size": 2048,
-                "category_id": 2,
-                "hash": "def456",
-                "last_updated": 1609459300
-            }
-        ]
-        
-        # Get local files by category
-        files = self.local_file_model.get_files_by_category(2)
-        
-        # Check the result
-        self.assertEqual(len(files), 2)
-        self.assertEqual(files[0]["name"], "file1.pdf")
-        self.assertEqual(files[1]["name"], "file2.pdf")
+    def test_delete_file(self):
+        """Test deleting a file."""
+        file_id = self.model.add_file("/path/to/file.pdf", 1024, "pdf")
         
-        # Check that the database was called correctly
-        self.mock_db.execute_query.assert_called_once()
-        args, kwargs = self.mock_db.execute_query.call_args
-        self.assertTrue("SELECT * FROM local_files WHERE category_id" in args[0])
-        self.assertEqual(kwargs["params"][0], 2)
+        self.assertTrue(self.model.delete_file(file_id))
+        self.assertIsNone(self.model.get_file_by_id(file_id))
     
-    def test_get_files_by_type(self):
-        """Test getting local files by type."""
-        # Set up the mock database to return files
-        self.mock_db.execute_query.return_value = [
-            {
-                "id": 1,
-                "path": "/downloads/file1.pdf",
-                "name": "file1.pdf",
-                "file_type": "pdf",
-                "size": 1024,
-                "category_id": 2,
-                "hash": "abc123",
-                "last_updated": 1609459200
-            },
-            {
-                "id": 2,
-                "path": "/downloads/file2.pdf",
-                "name": "file2.pdf",
-                "file_type": "pdf",
-                "size": 2048,
-                "category_id": 3,
-                "hash": "def456",
-                "last_updated": 1609459300
-            }
-        ]
-        
-        # Get local files by type
-        files = self.local_file_model.get_files_by_type("pdf")
-        
-        # Check the result
-        self.assertEqual(len(files), 2)
-        self.assertEqual(files[0]["name"], "file1.pdf")
-        self.assertEqual(files[1]["name"], "file2.pdf")
+    def test_missing_file(self):
+        """Test the lookups and changes for a file that doesn't exist."""
+        calls = (
+            ("get_file_by_id", (999,), None),
+            ("get_file_by_path", ("/nonexistent.pdf",), None),
+            ("get_file_by_remote_id", (999,), None),
+            ("update_file", (999, "/path/to/file.pdf", 1024, "pdf"), False),
+            ("delete_file", (999,), False),
+            ("update_remote_file_id", (999, 1), False),
+        )
         
-        # Check that the database was called correctly
-        self.mock_db.execute_query.assert_called_once()
-        args, kwargs = self.mock_db.execute_query.call_args
-        self.assertTrue("SELECT * FROM local_files WHERE file_type" in args[0])
-        self.assertEqual(kwargs["params"][0], "pdf")
+        for method, args, expected in calls:
+            with self.subTest(method=method):
+                self.assertEqual(getattr(self.model, method)(*args), expected)
     
     def test_get_file_by_path(self):
-        """Test getting a local file by path."""
-        # Set up the mock database to return a file
-        self.mock_db.execute_query.return_value = [{
-            "id": 1,
-            "path": "/downloads/file.pdf",
-            "name": "file.pdf",
-            "file_type": "pdf",
-            "size": 1024,
-            "category_id": 2,
-            "hash": "abc123",
-            "last_updated": 1609459200
-        }]
+        """Test getting a file by path."""
+        file_ids = self.add_files()
         
-        # Get a local file by path
-        file = self.local_file_model.get_file_by_path("/downloads/file.pdf")
+        file = self.model.get_file_by_path("/path/to/file2.pdf")
         
-        # Check the result
-        self.assertEqual(file["id"], 1)
-        self.assertEqual(file["path"], "/downloads/file.pdf")
-        
-        # Check that the database was called correctly
-        self.mock_db.execute_query.assert_called_once()
-        args, kwargs = self.mock_db.execute_query.call_args
-        self.assertTrue("SELECT * FROM local_files WHERE path" in args[0])
-        self.assertEqual(kwargs["params"][0], "/downloads/file.pdf")
+        self.assertEqual(file["id"], file_ids[1])
     
-    def test_get_file_by_path_not_found(self):
-        """Test getting a local file by path that doesn't exist."""
-        # Set up the mock database to return no files
-        self.mock_db.execute_query.return_value = []
+    def test_get_files_by_type(self):
+        """Test getting files by type."""
+        self.add_files()
         
-        # Get a local file by path that doesn't exist
-        file = self.local_file_model.get_file_by_path("/downloads/nonexistent.pdf")
+        files = self.model.get_files_by_type("pdf")
         
-        # Check the result
-        self.assertIsNone(file)
+        self.assertEqual(
+            [file["path"] for file in files],
+            ["/path/to/file1.pdf", "/path/to/file2.pdf"]
+        )
     
-    def test_get_file_by_hash(self):
-        """Test getting a local file by hash."""
-        # Set up the mock database to return a file
-        self.mock_db.execute_query.return_value = [{
-            "id": 1,
-            "path": "/downloads/file.pdf",
-            "name": "file.pdf",
-            "file_type": "pdf",
-            "size": 1024,
-            "category_id": 2,
-            "hash": "abc123",
-            "last_updated": 1609459200
-        }]
-        
-        # Get a local file by hash
-        file = self.local_file_model.get_file_by_hash("abc123")
+    def test_get_files_page(self):
+        """Test getting the files one page at a time."""
+        file_ids = self.add_files()
         
-        # Check the result
-        self.assertEqual(file["id"], 1)
-        self.assertEqual(file["hash"], "abc123")
-        
-        # Check that the database was called correctly
-        self.mock_db.execute_query.assert_called_once()
-        args, kwargs = self.mock_db.execute_query.call_args
-        self.assertTrue("SELECT * FROM local_files WHERE hash" in args[0])
-        self.assertEqual(kwargs["params"][0], "abc123")
-    
-    def test_get_file_by_hash_not_found(self):
-        """Test getting a local file by hash that doesn't exist."""
-        # Set up the mock database to return no files
-        self.mock_db.execute_query.return_value = []
+        first_page = self.model.get_files_page(2)
+        second_page = self.model.get_files_page(2, (first_page[-1]["path"], first_page[-1]["id"]))
         
-        # Get a local file by hash that doesn't exist
-        file = self.local_file_model.get_file_by_hash("nonexistent")
+        # Check that the pages follow each other in path order
+        self.assertEqual(
+            [file["path"] for file in first_page + second_page],
+            ["/path/to/book.epub", "/path/to/file1.pdf", "/path/to/file2.pdf"]
+        )
+        self.assertEqual(second_page[0]["id"], file_ids[1])
         
-        # Check the result
-        self.assertIsNone(file)
+        # Check filtering by type
+        files = self.model.get_files_page(2, file_type="epub")
+        self.assertEqual([file["path"] for file in files], ["/path/to/book.epub"])
     
     def test_search_files(self):
-        """Test searching for local files."""
-        # Set up the mock database to return files
-        self.mock_db.execute_query.return_value = [
-            {
-                "id": 1,
-                "path": "/downloads/test_file.pdf",
-                "name": "test_file.pdf",
-                "file_type": "pdf",
-                "size": 1024,
-                "category_id": 2,
-                "hash": "abc123",
-                "last_updated": 1609459200
-            }
-        ]
-        
-        # Search for local files
-        files = self.local_file_model.search_files("test")
-        
-        # Check the result
-        self.assertEqual(len(files), 1)
-        self.assertEqual(files[0]["name"], "test_file.pdf")
+        """Test searching files by path."""
+        self.add_files()
+        searches = (
+            ("BOOK", None, ["/path/to/book.epub"]),
+            ("file", "pdf", ["/path/to/file1.pdf", "/path/to/file2.pdf"]),
+            ("2.", None, ["/path/to/file2.pdf"]),
+            ("file", "epub", []),
+        )
         
-        # Check that the database was called correctly
-        self.mock_db.execute_query.assert_called_once()
-        args, kwargs = self.mock_db.execute_query.call_args
-        self.assertTrue("SELECT * FROM local_files WHERE name LIKE" in args[0])
-        self.assertEqual(kwargs["params"][0], "%test%")
+        # Search through the full-text index, and with LIKE as without it
+        for fts_enabled in (True, False):
+            with patch("src.db.local_file_model.FTS_ENABLED", fts_enabled):
+                for search_text, file_type, expected in searches:
+                    with self.subTest(search_text=search_text, file_type=file_type, fts_enabled=fts_enabled):
+                        files = self.model.search_files(search_text, file_type)
+                        self.assertEqual([file["path"] for file in files], expected)
     
     def test_get_all_files(self):
-        """Test getting all local files."""
-        # Set up the mock database to return files
-        self.mock_db.execute_query.return_value = [
-            {
-                "id": 1,
-                "path": "/downloads/file1.pdf",
-                "name": "file1.pdf",
-                "file_type": "pdf",
-                "size": 1024,
-                "category_id": 2,
-                "hash": "abc123",
-                "last_updated": 1609459200
-            },
-            {
-                "id": 2,
-                "path": "/downloads/file2.pdf",
-                "name": "file2.pdf",
-                "file_type": "pdf",
-                "size": 2048,
-                "category_id": 3,
-                "hash": "def456",
-                "last_updated": 1609459300
-            }
-        ]
+        """Test getting all files and counting them."""
+        self.add_files()
         
-        # Get all local files
-        files = self.local_file_model.get_all_files()
+        files = self.model.get_all_files()
         
         # Check the result
-        self.assertEqual(len(files), 2)
-        self.assertEqual(files[0]["name"], "file1.pdf")
-        self.assertEqual(files[1]["name"], "file2.pdf")
-        
-        # Check that the database was called correctly
-        self.mock_db.execute_query.assert_called_once()
-        args, kwargs = self.mock_db.execute_query.call_args
-        self.assertTrue("SELECT * FROM local_files" in args[0])
+        self.assertEqual(
+            sorted(file["path"] for file in files),
+            sorted(file["path"] for file in _FILES)
+        )
+        self.assertEqual(self.model.get_file_count(), len(_FILES))
+        self.assertEqual(self.model.get_file_count_by_type(), {"pdf": 2, "epub": 1})
+    
+    def test_add_or_update_file(self):
+        """Test adding a file or updating the one at the same path."""
+        file_id = self.model.add_or_update_file("/path/to/file.pdf", 1024, "pdf")
+        
+        # The second call updates the same file
+        self.assertEqual(self.model.add_or_update_file("/path/to/file.pdf", 2048, "pdf"), file_id)
+        self.assertEqual(self.model.get_file_by_id(file_id)["size"], 2048)
+        self.assertEqual(self.model.get_file_count(), 1)
+    
+    def test_remote_file_link(self):
+        """Test linking a local file to a remote file."""
+        site_id = self.add_site()
+        remote_file_id = self.add_remote_file(site_id)
+        file_id = self.model.add_file("/path/to/file.pdf", 1024, "pdf")
+        other_file_id = self.model.add_file("/path/to/other.pdf", 1024, "pdf")
+        
+        # Link the first file
+        self.assertTrue(self.model.update_remote_file_id(file_id, remote_file_id))
+        
+        # Check the lookups
+        self.assertEqual(self.model.get_file_by_remote_id(remote_file_id)["id"], file_id)
+        self.assertEqual(
+            [file["id"] for file in self.model.get_files_without_remote_id()],
+            [other_file_id]
+        )
 
 
 if __name__ == "__main__":
-    unittest.main()
\ No newline at end of file
+    unittest.main()
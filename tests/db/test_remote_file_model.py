@@ -1,362 +1,215 @@
 import unittest
-from unittest.mock import patch, MagicMock
+from types import MappingProxyType
+from unittest.mock import patch
 
 from src.db.remote_file_model import RemoteFileModel
-from src.db.database import Database
+from tests.db import ModelTestCase, make_file
 
 
-class TestRemoteFileModel(unittest.TestCase):
+# Remote files added by the tests, in name order; read-only so that tests
+# can't change them for the tests that run after them
+_FILES = (
+    MappingProxyType(make_file(url="http://example.com/a.pdf", name="a.pdf")),
+    MappingProxyType(make_file(url="http://example.com/b.epub", name="b.epub", file_type="epub", size=2048)),
+    MappingProxyType(make_file(url="http://example.com/c.pdf", name="c.pdf", size=4096)),
+)
+
+
+class TestRemoteFileModel(ModelTestCase):
     """Test case for the RemoteFileModel class."""
     
+    model_class = RemoteFileModel
+    
     def setUp(self):
         """Set up test fixtures."""
-        # Create a mock database
-        self.mock_db = MagicMock(spec=Database)
+        super().setUp()
         
-        # Create the remote file model with the mock database
-        self.remote_file_model = RemoteFileModel(self.mock_db)
+        # Every remote file belongs to a site
+        self.site_id = self.add_site()
     
-    def test_add_file(self):
-        """Test adding a remote file."""
-        # Set up the mock database to return a file ID
-        self.mock_db.execute_query.return_value = [{"id": 1}]
-        
-        # Add a remote file
-        file_id = self.remote_file_model.add_file(
-            site_id=1,
-            url="http://example.com/file.pdf",
-            name="file.pdf",
-            file_type="pdf",
-            size=1024,
-            category_id=2,
-            hash_value="abc123"
-        )
+    def add_files(self, site_id=None):
+        """Add the files in _FILES.
         
-        # Check the result
-        self.assertEqual(file_id, 1)
+        Args:
+            site_id: ID of the site to add the files to (default: the test site)
         
-        # Check that the database was called correctly
-        self.mock_db.execute_query.assert_called_once()
-        args, kwargs = self.mock_db.execute_query.call_args
-        self.assertTrue("INSERT INTO remote_files" in args[0])
-        self.assertEqual(kwargs["params"][0], 1)  # site_id
-        self.assertEqual(kwargs["params"][1], "http://example.com/file.pdf")
-        self.assertEqual(kwargs["params"][2], "file.pdf")
-        self.assertEqual(kwargs["params"][3], "pdf")
-        self.assertEqual(kwargs["params"][4], 1024)  # size
-        self.assertEqual(kwargs["params"][5], 2)  # category_id
-        self.assertEqual(kwargs["params"][6], "abc123")  # hash_value
+        Returns:
+            List of the new file IDs
+        """
+        site_id = self.site_id if site_id is None else site_id
+        return [self.model.add_file(site_id=site_id, **file) for file in _FILES]
+    
+    def test_add_file(self):
+        """Test adding a file."""
+        conn = self.db_manager.connect()
+        category_id = conn.execute(
+            "INSERT INTO categories (site_id, name) VALUES (?, ?)", (self.site_id, "Books")
+        ).lastrowid
+        
+        # Add a file
+        file_id = self.model.add_file(site_id=self.site_id, category_id=category_id, **make_file())
+        
+        # Check that the file was stored
+        file = self.model.get_file_by_id(file_id)
+        self.assertEqual(
+            (file["site_id"], file["category_id"], file["url"], file["name"], file["size"], file["file_type"]),
+            (self.site_id, category_id, "http://example.com/file.pdf", "file.pdf", 1024, "pdf")
+        )
+        self.assertIsNotNone(file["last_checked"])
     
     def test_update_file(self):
-        """Test updating a remote file."""
-        # Update a remote file
-        self.remote_file_model.update_file(
-            file_id=1,
-            url="http://example.com/updated.pdf",
-            name="updated.pdf",
-            file_type="pdf",
-            size=2048,
-            category_id=3,
-            hash_value="def456"
+        """Test updating a file."""
+        file_id = self.model.add_file(site_id=self.site_id, **make_file())
+        
+        # Update the file
+        updated = self.model.update_file(
+            file_id, site_id=self.site_id, **make_file(name="updated.pdf", size=2048)
         )
         
-        # Check that the database was called correctly
-        self.mock_db.execute_query.assert_called_once()
-        args, kwargs = self.mock_db.execute_query.call_args
-        self.assertTrue("UPDATE remote_files" in args[0])
-        self.assertEqual(kwargs["params"][0], "http://example.com/updated.pdf")
-        self.assertEqual(kwargs["params"][1], "updated.pdf")
-        self.assertEqual(kwargs["params"][2], "pdf")
-        self.assertEqual(kwargs["params"][3], 2048)  # size
-        self.assertEqual(kwargs["params"][4], 3)  # category_id
-        self.assertEqual(kwargs["params"][5], "def456")  # hash_value
-        self.assertEqual(kwargs["params"][6], 1)  # file_id
+        # Check the result
+        self.assertTrue(updated)
+        file = self.model.get_file_by_id(file_id)
+        self.assertEqual((file["name"], file["size"]), ("updated.pdf", 2048))
     
     def test_delete_file(self):
-        """Test deleting a remote file."""
-        # Delete a remote file
-        self.remote_file_model.delete_file(1)
+        """Test deleting a file."""
+        file_id = self.model.add_file(site_id=self.site_id, **make_file())
         
-        # Check that the database was called correctly
-        self.mock_db.execute_query.assert_called_once()
-        args, kwargs = self.mock_db.execute_query.call_args
-        self.assertTrue("DELETE FROM remote_files" in args[0])
-        self.assertEqual(kwargs["params"][0], 1)
+        self.assertTrue(self.model.delete_file(file_id))
+        self.assertIsNone(self.model.get_file_by_id(file_id))
     
-    def test_get_file(self):
-        """Test getting a remote file."""
-        # Set up the mock database to return a file
-        self.mock_db.execute_query.return_value = [{
-            "id": 1,
-            "site_id": 1,
-            "url": "http://example.com/file.pdf",
-            "name": "file.pdf",
-            "file_type": "pdf",
-            "size": 1024,
-            "category_id": 2,
-            "hash": "abc123",
-            "last_updated": 1609459200
-        }]
-        
-        # Get a remote file
-        file = self.remote_file_model.get_file(1)
-        
-        # Check the result
-        self.assertEqual(file["id"], 1)
-        self.assertEqual(file["url"], "http://example.com/file.pdf")
-        self.assertEqual(file["name"], "file.pdf")
+    def test_missing_file(self):
+        """Test the lookups and changes for a file that doesn't exist."""
+        calls = (
+            ("get_file_by_id", (999,), None),
+            ("get_file_by_url", ("http://example.com/nonexistent.pdf",), None),
+            ("update_file", (999, self.site_id, "http://example.com/file.pdf", "file.pdf", 1024, "pdf"), False),
+            ("delete_file", (999,), False),
+        )
         
-        # Check that the database was called correctly
-        self.mock_db.execute_query.assert_called_once()
-        args, kwargs = self.mock_db.execute_query.call_args
-        self.assertTrue("SELECT * FROM remote_files" in args[0])
-        self.assertEqual(kwargs["params"][0], 1)
+        for method, args, expected in calls:
+            with self.subTest(method=method):
+                self.assertEqual(getattr(self.model, method)(*args), expected)
     
-    def test_get_file_not_found(self):
-        """Test getting a remote file that doesn't exist."""
-        # Set up the mock database to return no files
-        self.mock_db.execute_query.return_value = []
-        
-        # Get a remote file that doesn't exist
-        file = self.remote_file_model.get_file(999)
+    def test_lookups(self):
+        """Test looking up one file and the files of a site."""
+        file_ids = self.add_files()
+        lookups = (
+            ("get_file_by_id", file_ids[2], [file_ids[2]]),
+            ("get_file_by_url", "http://example.com/b.epub", [file_ids[1]]),
+            ("get_files_by_site", self.site_id, file_ids),
+        )
         
-        # Check the result
-        self.assertIsNone(file)
+        for method, value, expected in lookups:
+            with self.subTest(method=method):
+                result = getattr(self.model, method)(value)
+                
+                # Single-file lookups return the file itself
+                files = result if isinstance(result, list) else [result]
+                self.assertEqual([file["id"] for file in files], expected)
     
     def test_get_files_by_site(self):
-        """Test getting remote files by site."""
-        # Set up the mock database to return files
-        self.mock_db.execute_query.return_value = [
-            {
-                "id": 1,
-                "site_id": 1,
-                "url": "http://example.com/file1.pdf",
-                "name": "file1.pdf",
-                "file_type": "pdf",
-                "size": 1024,
-                "category_id": 2,
-                "hash": "abc123",
-                "last_updated": 1609459200
-            },
-            {
-                "id": 2,
-                "site_id": 1,
-                "url": "http://example.com/file2.pdf",
-                "name": "file2.pdf",
-                "file_type": "pdf",
-                "size": 2048,
-                "category_id": 2,
-                "hash": "def456",
-                "last_updated": 1609459300
-            }
-        ]
-        
-        # Get remote files by site
-        files = self.remote_file_model.get_files_by_site(1)
+        """Test getting and counting the files of a site."""
+        other_site_id = self.add_site(name="Other Site", url="http://other.com")
+        self.add_files()
+        self.model.add_file(site_id=other_site_id, **make_file(url="http://other.com/d.pdf", name="d.pdf"))
         
-        # Check the result
-        self.assertEqual(len(files), 2)
-        self.assertEqual(files[0]["name"], "file1.pdf")
-        self.assertEqual(files[1]["name"], "file2.pdf")
+        files = self.model.get_files_by_site(self.site_id)
         
-        # Check that the database was called correctly
-        self.mock_db.execute_query.assert_called_once()
-        args, kwargs = self.mock_db.execute_query.call_args
-        self.assertTrue("SELECT * FROM remote_files WHERE site_id" in args[0])
-        self.assertEqual(kwargs["params"][0], 1)
+        # Only the site's files come back, sorted by name
+        self.assertEqual([file["name"] for file in files], [file["name"] for file in _FILES])
+        self.assertEqual(self.model.get_file_count_by_site(self.site_id), len(_FILES))
+        self.assertEqual(self.model.get_file_count(), len(_FILES) + 1)
     
-    def test_get_files_by_category(self):
-        """Test getting remote files by category."""
-        # Set up the mock database to return files
-        self.mock_db.execute_query.return_value = [
-            {
-                "id": 1,
-                "site_id": 1,
-                "url": "http://example.com/file1.pdf",
-                "name": "file1.pdf",
-                "file_type": "pdf",
-                "size": 1024,
-                "category_id": 2,
-                "hash": "abc123",
-                "last_updated": 1609459200
-            },
-            {
-                "id": 2,
-                "site_id": 1,
-                "url": "http://example.com/file2.pdf",
-                "name": "file2.pdf",
-                "file_type": "pdf",
-                "size": 2048,
-                "category_id": 2,
-                "hash": "def456",
-                "last_updated": 1609459300
-            }
-        ]
-        
-        # Get remote files by category
-        files = self.remote_file_model.get_files_by_category(2)
-        
-        # Check the result
-        self.assertEqual(len(files), 2)
-        self.assertEqual(files[0]["name"], "file1.pdf")
-        self.assertEqual(files[1]["name"], "file2.pdf")
-        
-        # Check that the database was called correctly
-        self.mock_db.execute_query.assert_called_once()
-        args, kwargs = self.mock_db.execute_query.call_args
-        self.assertTrue("SELECT * FROM remote_files WHERE category_id" in args[0])
-        self.assertEqual(kwargs["params"][0], 2)
+    def test_get_files_page(self):
+        """Test getting the files one page at a time."""
+        other_site_id = self.add_site(name="Other Site", url="http://other.com")
+        self.add_files()
+        self.model.add_file(site_id=other_site_id, **make_file(url="http://other.com/a.pdf", name="a.pdf"))
+        
+        # Read all the files two at a time
+        pages = []
+        after = None
+        while True:
+            page = self.model.get_files_page(2, after)
+            if not page:
+                break
+            pages.append([file["name"] for file in page])
+            after = (page[-1]["name"], page[-1]["id"])
+        
+        # Files with the same name are all listed, in ID order
+        self.assertEqual(pages, [["a.pdf", "a.pdf"], ["b.epub", "c.pdf"]])
+        
+        # The site and the type narrow the pages down
+        files = self.model.get_files_page(10, ("a.pdf", 0), site_id=self.site_id, file_type="pdf")
+        self.assertEqual([file["name"] for file in files], ["a.pdf", "c.pdf"])
     
-    def test_get_files_by_type(self):
-        """Test getting remote files by type."""
-        # Set up the mock database to return files
-        self.mock_db.execute_query.return_value = [
-            {
-                "id": 1,
-                "site_id": 1,
-                "url": "http://example.com/file1.pdf",
-                "name": "file1.pdf",
-                "file_type": "pdf",
-                "size": 1024,
-                "category_id": 2,
-                "hash": "abc123",
-                "last_updated": 1609459200
-            },
-            {
-                "id": 2,
-                "site_id": 1,
-                "url": "http://example.com/file2.pdf",
-                "name": "file2.pdf",
-                "file_type": "pdf",
-                "size": 2048,
-                "category_id": 3,
-                "hash": "def456",
-                "last_updated": 1609459300
-            }
-        ]
-        
-        # Get remote files by type
-        files = self.remote_file_model.get_files_by_type("pdf")
-        
-        # Check the result
-        self.assertEqual(len(files), 2)
-        self.assertEqual(files[0]["name"], "file1.pdf")
-        self.assertEqual(files[1]["name"], "file2.pdf")
+    def test_search_files(self):
+        """Test searching files by name."""
+        other_site_id = self.add_site(name="Other Site", url="http://other.com")
+        self.add_files()
+        searches = (
+            ("PDF", {}, ["a.pdf", "c.pdf"]),
+            ("b.e", {}, ["b.epub"]),
+            (".p", {}, ["a.pdf", "c.pdf"]),
+            ("%", {}, []),
+            ("", {"file_type": "epub"}, ["b.epub"]),
+            ("pdf", {"site_id": other_site_id}, []),
+        )
         
-        # Check that the database was called correctly
-        self.mock_db.execute_query.assert_called_once()
-        args, kwargs = self.mock_db.execute_query.call_args
-        self.assertTrue("SELECT * FROM remote_files WHERE file_type" in args[0])
-        self.assertEqual(kwargs["params"][0], "pdf")
+        # Search through the full-text index, and with LIKE as without it
+        for fts_enabled in (True, False):
+            with patch("src.db.remote_file_model.FTS_ENABLED", fts_enabled):
+                for search_text, filters, expected in searches:
+                    with self.subTest(search_text=search_text, fts_enabled=fts_enabled, **filters):
+                        files = self.model.search_files(search_text, **filters)
+                        self.assertEqual([file["name"] for file in files], expected)
     
-    def test_get_file_by_url(self):
-        """Test getting a remote file by URL."""
-        # Set up the mock database to return a file
-        self.mock_db.execute_query.return_value = [{
-            "id": 1,
-            "site_id": 1,
-            "url": "http://example.com/file.pdf",
-            "name": "file.pdf",
-            "file_type": "pdf",
-            "size": 1024,
-            "category_id": 2,
-            "hash": "abc123",
-            "last_updated": 1609459200
-        }]
-        
-        # Get a remote file by URL
-        file = self.remote_file_model.get_file_by_url("http://example.com/file.pdf")
-        
-        # Check the result
-        self.assertEqual(file["id"], 1)
-        self.assertEqual(file["url"], "http://example.com/file.pdf")
+    def test_search_renamed_file(self):
+        """Test that searches find files by their new name."""
+        file_id = self.model.add_file(site_id=self.site_id, **make_file(name="old.pdf"))
+        self.model.update_file(file_id, site_id=self.site_id, **make_file(name="new.pdf"))
         
-        # Check that the database was called correctly
-        self.mock_db.execute_query.assert_called_once()
-        args, kwargs = self.mock_db.execute_query.call_args
-        self.assertTrue("SELECT * FROM remote_files WHERE url" in args[0])
-        self.assertEqual(kwargs["params"][0], "http://example.com/file.pdf")
+        self.assertEqual(self.model.search_files("old"), [])
+        self.assertEqual([file["id"] for file in self.model.search_files("new")], [file_id])
     
-    def test_get_file_by_url_not_found(self):
-        """Test getting a remote file by URL that doesn't exist."""
-        # Set up the mock database to return no files
-        self.mock_db.execute_query.return_value = []
-        
-        # Get a remote file by URL that doesn't exist
-        file = self.remote_file_model.get_file_by_url("http://example.com/nonexistent.pdf")
+    def test_delete_files_by_site(self):
+        """Test deleting the files of a site."""
+        self.add_files()
         
-        # Check the result
-        self.assertIsNone(file)
+        self.assertEqual(self.model.delete_files_by_site(self.site_id), len(_FILES))
+        self.assertEqual(self.model.get_file_count(), 0)
     
-    def test_get_file_by_hash(self):
-        """Test getting a remote file by hash."""
-        # Set up the mock database to return a file
-        self.mock_db.execute_query.return_value = [{
-            "id": 1,
-            "site_id": 1,
-            "url": "http://example.com/file.pdf",
-            "name": "file.pdf",
-            "file_type": "pdf",
-            "size": 1024,
-            "category_id": 2,
-            "hash": "abc123",
-            "last_updated": 1609459200
-        }]
+    def test_get_file_count_by_type(self):
+        """Test counting files by type."""
+        self.add_files()
         
-        # Get a remote file by hash
-        file = self.remote_file_model.get_file_by_hash("abc123")
+        counts = self.model.get_file_count_by_type()
         
-        # Check the result
-        self.assertEqual(file["id"], 1)
-        self.assertEqual(file["hash"], "abc123")
-        
-        # Check that the database was called correctly
-        self.mock_db.execute_query.assert_called_once()
-        args, kwargs = self.mock_db.execute_query.call_args
-        self.assertTrue("SELECT * FROM remote_files WHERE hash" in args[0])
-        self.assertEqual(kwargs["params"][0], "abc123")
+        self.assertIn("epub", counts)
+        self.assertEqual(counts, {"pdf": 2, "epub": 1})
     
-    def test_get_file_by_hash_not_found(self):
-        """Test getting a remote file by hash that doesn't exist."""
-        # Set up the mock database to return no files
-        self.mock_db.execute_query.return_value = []
-        
-        # Get a remote file by hash that doesn't exist
-        file = self.remote_file_model.get_file_by_hash("nonexistent")
-        
-        # Check the result
-        self.assertIsNone(file)
+    def test_add_or_update_file(self):
+        """Test adding a file or updating the one with the same URL."""
+        file_id = self.model.add_or_update_file(site_id=self.site_id, **make_file())
+        
+        # The second call updates the same file
+        self.assertEqual(
+            self.model.add_or_update_file(site_id=self.site_id, **make_file(size=2048)),
+            file_id
+        )
+        self.assertEqual(self.model.get_file_by_id(file_id)["size"], 2048)
+        self.assertEqual(self.model.get_file_count(), 1)
     
-    def test_search_files(self):
-        """Test searching for remote files."""
-        # Set up the mock database to return files
-        self.mock_db.execute_query.return_value = [
-            {
-                "id": 1,
-                "site_id": 1,
-                "url": "http://example.com/test_file.pdf",
-                "name": "test_file.pdf",
-                "file_type": "pdf",
-                "size": 1024,
-                "category_id": 2,
-                "hash": "abc123",
-                "last_updated": 1609459200
-            }
-        ]
-        
-        # Search for remote files
-        files = self.remote_file_model.search_files("test")
+    def test_get_all_sites(self):
+        """Test getting the sites files can belong to."""
+        sites = self.model.get_all_sites()
         
-        # Check the result
-        self.assertEqual(len(files), 1)
-        self.assertEqual(files[0]["name"], "test_file.pdf")
-        
-        # Check that the database was called correctly
-        self.mock_db.execute_query.assert_called_once()
-        args, kwargs = self.mock_db.execute_query.call_args
-        self.assertTrue("SELECT * FROM remote_files WHERE name LIKE" in args[0])
-        self.assertEqual(kwargs["params"][0], "%test%")
+        self.assertEqual(
+            [(site["id"], site["name"], site["scraper_type"]) for site in sites],
+            [(self.site_id, "Test Site", "example")]
+        )
 
 
 if __name__ == "__main__":
-    unittest.main()
\ No newline at end of file
+    unittest.main()
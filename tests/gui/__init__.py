@@ -1 +1,60 @@
-"""GUI component tests package."""
\ No newline at end of file
+"""GUI component tests package.
+
+This module provides the QApplication shared by the GUI tests, a base test
+case that makes sure it exists, and helpers for reading widgets.
+"""
+
+import unittest
+
+from PyQt5.QtWidgets import QApplication
+
+
+def get_app():
+    """Get the QApplication shared by the GUI tests.
+    
+    The application is created the first time this is called and reused by
+    every GUI test module after that.
+    
+    Returns:
+        The QApplication instance
+    """
+    return QApplication.instance() or QApplication([])
+
+
+def column_texts(table, column):
+    """Get the text of every cell in a table column.
+    
+    Args:
+        table: QTableWidget to read
+        column: Index of the column
+    
+    Returns:
+        List of the cell texts, top to bottom
+    """
+    return [table.item(row, column).text() for row in range(table.rowCount())]
+
+
+def model_column_texts(model, column):
+    """Get the text of every loaded row in a table model column.
+    
+    Args:
+        model: QAbstractTableModel to read
+        column: Index of the column
+    
+    Returns:
+        List of the cell texts, top to bottom
+    """
+    return [model.index(row, column).data() for row in range(model.rowCount())]
+
+
+class GuiTestCase(unittest.TestCase):
+    """Base test case for a GUI component.
+    
+    Widgets need a QApplication, so the shared one is created before the
+    first test of the class runs.
+    """
+    
+    @classmethod
+    def setUpClass(cls):
+        """Set up fixtures shared by all tests."""
+        cls.app = get_app()
@@ -1,275 +1,183 @@
 import unittest
-from unittest.mock import patch, MagicMock
+from types import MappingProxyType
+from unittest.mock import patch
 
-from PyQt5.QtWidgets import QApplication, QWidget
+from PyQt5.QtCore import Qt
+from PyQt5.QtWidgets import QWidget
 from src.gui.comparison_tab import ComparisonTab
+from tests.gui import GuiTestCase
 
 
-# Create a QApplication instance for testing
-app = QApplication.instance()
-if app is None:
-    app = QApplication([])
+# Sites offered in the site combo box
+_SITES = (
+    MappingProxyType({"id": 1, "name": "Site 1"}),
+    MappingProxyType({"id": 2, "name": "Site 2"}),
+)
 
+# Comparison results with one file of each kind; shared read-only by the
+# tests, since the tab only reads them
+_RESULTS = MappingProxyType({
+    "new_files": (
+        {
+            "id": 3,
+            "name": "file3.pdf",
+            "size": 3072,
+            "file_type": "pdf",
+            "category": "Category 1",
+            "url": "http://example.com/file3.pdf"
+        },
+    ),
+    "updated_files": (
+        {
+            "remote": {"id": 2, "name": "file2.pdf", "size": 4096, "file_type": "pdf",
+                       "url": "http://example.com/file2.pdf"},
+            "local": {"id": 12, "path": "/downloads/file2.pdf", "size": 2048}
+        },
+    ),
+    "corrupted_files": (
+        {
+            "remote": {"id": 4, "name": "file4.pdf", "size": 1024, "file_type": "pdf",
+                       "url": "http://example.com/file4.pdf"},
+            "local": {"id": 14, "path": "/downloads/file4.pdf", "size": 1024},
+            "error": "Invalid PDF"
+        },
+    ),
+    "ok_files": (
+        {
+            "remote": {"id": 1, "name": "file1.pdf", "size": 1024, "file_type": "pdf",
+                       "url": "http://example.com/file1.pdf"},
+            "local": {"id": 11, "path": "/downloads/file1.pdf", "size": 1024}
+        },
+    )
+})
 
-class TestComparisonTab(unittest.TestCase):
+
+class TestComparisonTab(GuiTestCase):
     """Test case for the ComparisonTab class."""
     
+    @classmethod
+    def setUpClass(cls):
+        """Set up fixtures shared by all tests."""
+        super().setUpClass()
+        
+        # Patch the services and models where the tab looks them up
+        with patch("src.gui.comparison_tab.FileComparisonService") as mock_service_class, \
+                patch("src.gui.comparison_tab.RemoteFileModel") as mock_model_class, \
+                patch("src.gui.comparison_tab.DownloadManager") as mock_manager_class:
+            cls.mock_service = mock_service_class.return_value
+            cls.mock_remote_file_model = mock_model_class.return_value
+            cls.mock_download_manager = mock_manager_class.return_value
+            
+            # Set up the mock model to return sites
+            cls.mock_remote_file_model.get_all_sites.return_value = _SITES
+            
+            # Create the comparison tab once for all tests
+            cls.tab = ComparisonTab()
+    
+    @classmethod
+    def tearDownClass(cls):
+        """Tear down fixtures shared by all tests."""
+        # Close the tab
+        cls.tab.close()
+        super().tearDownClass()
+    
     def setUp(self):
         """Set up test fixtures."""
-        # Create mock models
-        self.mock_local_file_model = MagicMock()
-        self.mock_remote_file_model = MagicMock()
-        self.mock_category_model = MagicMock()
-        self.mock_download_model = MagicMock()
-        
-        # Set up the mock models to return data
-        self.mock_local_file_model.get_all_files.return_value = [
-            {
-                "id": 1,
-                "path": "/downloads/file1.pdf",
-                "name": "file1.pdf",
-                "file_type": "pdf",
-                "size": 1024,
-                "category_id": 1,
-                "hash": "abc123",
-                "last_updated": 1609459200
-            },
-            {
-                "id": 2,
-                "path": "/downloads/file2.pdf",
-                "name": "file2.pdf",
-                "file_type": "pdf",
-                "size": 2048,
-                "category_id": 1,
-                "hash": "def456",
-                "last_updated": 1609459300
-            }
-        ]
+        # Forget the calls made by earlier tests, keeping the return values
+        self.mock_service.reset_mock()
+        self.mock_remote_file_model.reset_mock()
+        self.mock_download_manager.reset_mock()
         
-        self.mock_remote_file_model.get_files_by_category.return_value = [
-            {
-                "id": 1,
-                "site_id": 1,
-                "url": "http://example.com/file1.pdf",
-                "name": "file1.pdf",
-                "file_type": "pdf",
-                "size": 1024,
-                "category_id": 1,
-                "hash": "abc123",
-                "last_updated": 1609459200
-            },
-            {
-                "id": 2,
-                "site_id": 1,
-                "url": "http://example.com/file3.pdf",
-                "name": "file3.pdf",
-                "file_type": "pdf",
-                "size": 3072,
-                "category_id": 1,
-                "hash": "ghi789",
-                "last_updated": 1609459400
-            }
-        ]
+        # Patch the message boxes for every test so that none can block
+        message_box_patcher = patch("src.gui.comparison_tab.QMessageBox")
+        self.mock_message_box = message_box_patcher.start()
+        self.addCleanup(message_box_patcher.stop)
         
-        self.mock_category_model.get_all_categories.return_value = [
-            {
-                "id": 1,
-                "name": "Category 1",
-                "parent_id": None
-            },
-            {
-                "id": 2,
-                "name": "Category 2",
-                "parent_id": None
-            }
-        ]
-        
-        # Create the comparison tab
-        self.tab = ComparisonTab(
-            self.mock_local_file_model,
-            self.mock_remote_file_model,
-            self.mock_category_model,
-            self.mock_download_model
-        )
-    
-    def tearDown(self):
-        """Clean up test fixtures."""
-        # Close the tab
-        self.tab.close()
+        # Drop the results shown by earlier tests
+        self.tab.comparison_results = None
+        for table in (self.tab.new_files_table, self.tab.updated_files_table,
+                      self.tab.corrupted_files_table, self.tab.ok_files_table):
+            table.setRowCount(0)
     
     def test_init(self):
         """Test the constructor."""
         # Check that the tab was created
         self.assertIsInstance(self.tab, QWidget)
         
-        # Check that the models were saved
-        self.assertEqual(self.tab.local_file_model, self.mock_local_file_model)
+        # Check that the services were saved
+        self.assertEqual(self.tab.comparison_service, self.mock_service)
         self.assertEqual(self.tab.remote_file_model, self.mock_remote_file_model)
-        self.assertEqual(self.tab.category_model, self.mock_category_model)
-        self.assertEqual(self.tab.download_model, self.mock_download_model)
+        self.assertEqual(self.tab.download_manager, self.mock_download_manager)
+        self.assertIsNone(self.tab.comparison_results)
     
-    def test_create_ui(self):
-        """Test the create_ui method."""
-        # Check that the category combo was created
-        self.assertIsNotNone(self.tab.category_combo)
+    def test_load_sites(self):
+        """Test that the sites are loaded into the site combo box."""
+        self.assertEqual(self.tab.site_combo.count(), 3)
+        self.assertEqual(self.tab.site_combo.itemText(0), "All Sites")
+        self.assertIsNone(self.tab.site_combo.itemData(0))
+        self.assertEqual(self.tab.site_combo.itemText(2), "Site 2")
+        self.assertEqual(self.tab.site_combo.itemData(2), 2)
+    
+    def test_start_comparison(self):
+        """Test starting a comparison for the selected site."""
+        self.tab.site_combo.setCurrentIndex(1)
         
-        # Check that the tables were created
-        self.assertIsNotNone(self.tab.local_table)
-        self.assertIsNotNone(self.tab.remote_table)
-        self.assertIsNotNone(self.tab.missing_table)
+        with patch("src.gui.comparison_tab.ComparisonThread") as mock_thread_class:
+            self.tab.start_comparison()
         
-        # Check that the buttons were created
-        self.assertIsNotNone(self.tab.compare_button)
-        self.assertIsNotNone(self.tab.queue_all_button)
+        # Check that a thread was started for the site
+        mock_thread_class.assert_called_once_with(1)
+        mock_thread_class.return_value.start.assert_called_once()
+        self.assertFalse(self.tab.compare_button.isEnabled())
+        self.assertEqual(self.tab.status_label.text(), "Comparing files...")
     
-    def test_refresh(self):
-        """Test the refresh method."""
-        # Call the refresh method
-        self.tab.refresh()
+    def test_handle_comparison_complete(self):
+        """Test showing the comparison results."""
+        self.tab.handle_comparison_complete(_RESULTS)
         
-        # Check that the category model was queried
-        self.mock_category_model.get_all_categories.assert_called_once()
+        # Check that the tables were populated
+        self.assertEqual(self.tab.new_files_table.rowCount(), 1)
+        self.assertEqual(self.tab.new_files_table.item(0, 0).text(), "file3.pdf")
+        self.assertEqual(self.tab.new_files_table.item(0, 0).data(Qt.UserRole), 3)
+        self.assertEqual(self.tab.updated_files_table.item(0, 1).text(), "2048")
+        self.assertEqual(self.tab.updated_files_table.item(0, 2).text(), "4096")
+        self.assertEqual(self.tab.corrupted_files_table.item(0, 4).text(), "Invalid PDF")
+        self.assertEqual(self.tab.ok_files_table.item(0, 4).text(), "/downloads/file1.pdf")
         
-        # Check that the category combo was populated
-        self.assertEqual(self.tab.category_combo.count(), 3)  # Including "All Categories"
-        self.assertEqual(self.tab.category_combo.itemText(1), "Category 1")
-        self.assertEqual(self.tab.category_combo.itemText(2), "Category 2")
-    
-    def test_compare_files(self):
-        """Test the compare_files method."""
-        # Mock the FileComparison class
-        with patch('src.core.file_comparison.FileComparison') as mock_comparison_class:
-            # Set up the mock comparison
-            mock_comparison = MagicMock()
-            mock_comparison_class.return_value = mock_comparison
-            
-            # Set up the comparison results
-            mock_comparison.compare.return_value = {
-                "matching": [
-                    {
-                        "local": {"name": "file1.pdf", "hash": "abc123"},
-                        "remote": {"name": "file1.pdf", "hash": "abc123"}
-                    }
-                ],
-                "missing": [
-                    {"name": "file3.pdf", "hash": "ghi789"}
-                ],
-                "different": []
-            }
-            
-            # Select a category
-            self.tab.category_combo.setCurrentIndex(1)  # Category 1
-            
-            # Call the compare_files method
-            self.tab.compare_files()
-            
-            # Check that the comparison was created and used
-            mock_comparison_class.assert_called_once_with(
-                self.mock_local_file_model,
-                self.mock_remote_file_model
-            )
-            mock_comparison.compare.assert_called_once_with(category_id=1)
-            
-            # Check that the tables were populated
-            self.assertEqual(self.tab.local_table.rowCount(), 1)  # Matching files
-            self.assertEqual(self.tab.remote_table.rowCount(), 1)  # Matching files
-            self.assertEqual(self.tab.missing_table.rowCount(), 1)  # Missing files
+        # Check the tab titles and the status
+        self.assertEqual(self.tab.tab_widget.tabText(0), "New Files (1)")
+        self.assertEqual(self.tab.tab_widget.tabText(3), "OK Files (1)")
+        self.assertTrue(self.tab.compare_button.isEnabled())
+        self.assertEqual(
+            self.tab.status_label.text(),
+            "Comparison complete: 1 new, 1 updated, 1 corrupted, 1 OK"
+        )
     
-    def test_queue_all_missing(self):
-        """Test the queue_all_missing method."""
-        # Mock the FileComparison class
-        with patch('src.core.file_comparison.FileComparison') as mock_comparison_class:
-            # Set up the mock comparison
-            mock_comparison = MagicMock()
-            mock_comparison_class.return_value = mock_comparison
-            
-            # Set up the comparison results
-            mock_comparison.compare.return_value = {
-                "matching": [],
-                "missing": [
-                    {
-                        "id": 2,
-                        "site_id": 1,
-                        "url": "http://example.com/file3.pdf",
-                        "name": "file3.pdf",
-                        "file_type": "pdf",
-                        "size": 3072,
-                        "category_id": 1,
-                        "hash": "ghi789",
-                        "last_updated": 1609459400
-                    }
-                ],
-                "different": []
-            }
-            
-            # Select a category
-            self.tab.category_combo.setCurrentIndex(1)  # Category 1
-            
-            # Call the compare_files method to populate the tables
-            self.tab.compare_files()
-            
-            # Call the queue_all_missing method
-            self.tab.queue_all_missing()
-            
-            # Check that the download was added to the queue
-            self.mock_download_model.add_to_queue.assert_called_once_with(
-                url="http://example.com/file3.pdf",
-                file_name="file3.pdf",
-                file_type="pdf",
-                category_id=1,
-                priority=1,
-                status="queued"
-            )
+    def test_handle_comparison_error(self):
+        """Test handling a comparison error."""
+        self.tab.compare_button.setEnabled(False)
+        self.tab.handle_comparison_error("Connection error")
+        
+        # Check that the error was shown and the tab reset
+        self.mock_message_box.warning.assert_called_once()
+        self.assertTrue(self.tab.compare_button.isEnabled())
+        self.assertEqual(self.tab.status_label.text(), "Ready")
     
-    def test_queue_selected_missing(self):
-        """Test the queue_selected_missing method."""
-        # Mock the FileComparison class
-        with patch('src.core.file_comparison.FileComparison') as mock_comparison_class:
-            # Set up the mock comparison
-            mock_comparison = MagicMock()
-            mock_comparison_class.return_value = mock_comparison
-            
-            # Set up the comparison results
-            mock_comparison.compare.return_value = {
-                "matching": [],
-                "missing": [
-                    {
-                        "id": 2,
-                        "site_id": 1,
-                        "url": "http://example.com/file3.pdf",
-                        "name": "file3.pdf",
-                        "file_type": "pdf",
-                        "size": 3072,
-                        "category_id": 1,
-                        "hash": "ghi789",
-                        "last_updated": 1609459400
-                    }
-                ],
-                "different": []
-            }
-            
-            # Select a category
-            self.tab.category_combo.setCurrentIndex(1)  # Category 1
-            
-            # Call the compare_files method to populate the tables
-            self.tab.compare_files()
-            
-            # Select a row in the missing table
-            self.tab.missing_table.selectRow(0)
-            
-            # Call the queue_selected_missing method
-            self.tab.queue_selected_missing()
-            
-            # Check that the download was added to the queue
-            self.mock_download_model.add_to_queue.assert_called_once_with(
-                url="http://example.com/file3.pdf",
-                file_name="file3.pdf",
-                file_type="pdf",
-                category_id=1,
-                priority=1,
-                status="queued"
-            )
+    def test_queue_new_file(self):
+        """Test adding a new file to the download queue from the context menu."""
+        self.tab.handle_comparison_complete(_RESULTS)
+        position = self.tab.new_files_table.visualItemRect(self.tab.new_files_table.item(0, 0)).center()
+        self.mock_download_manager.queue_download.return_value = True
+        
+        # Choose the "Add to Download Queue" action
+        with patch("src.gui.comparison_tab.QMenu") as mock_menu_class, \
+                patch("src.gui.comparison_tab.QAction") as mock_action_class:
+            mock_menu_class.return_value.exec_.return_value = mock_action_class.return_value
+            self.tab.show_new_files_context_menu(position)
+        
+        # Check that the file was queued
+        self.mock_download_manager.queue_download.assert_called_once_with(3)
 
 
 if __name__ == "__main__":
-    unittest.main()
\ No newline at end of file
+    unittest.main()
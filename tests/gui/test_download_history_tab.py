@@ -1,167 +1,150 @@
 import unittest
-from unittest.mock import patch, MagicMock
+from types import MappingProxyType
+from unittest.mock import patch
 
-from PyQt5.QtWidgets import QApplication, QWidget
-from src.gui.download_history_tab import DownloadHistoryTab
+from PyQt5.QtCore import Qt
+from PyQt5.QtWidgets import QWidget, QMessageBox
+from src.gui.download_history_tab import DownloadHistoryTab, STATUS_COLORS
+from tests.gui import GuiTestCase, column_texts
 
 
-# Create a QApplication instance for testing
-app = QApplication.instance()
-if app is None:
-    app = QApplication([])
+# Download history returned by the model; read-only so that tests can't
+# change it for the tests that run after them
+_HISTORY = (
+    MappingProxyType({
+        "id": 1,
+        "remote_file_id": 11,
+        "local_file_id": 21,
+        "file_name": "file1.pdf",
+        "file_path": "/downloads/file1.pdf",
+        "status": "completed",
+        "started_at": None,
+        "completed_at": None,
+        "error_message": None
+    }),
+    MappingProxyType({
+        "id": 2,
+        "remote_file_id": 12,
+        "local_file_id": None,
+        "file_name": "file2.pdf",
+        "file_path": None,
+        "status": "failed",
+        "started_at": None,
+        "completed_at": None,
+        "error_message": "Connection error"
+    }),
+)
 
 
-class TestDownloadHistoryTab(unittest.TestCase):
+class TestDownloadHistoryTab(GuiTestCase):
     """Test case for the DownloadHistoryTab class."""
     
-    def setUp(self):
-        """Set up test fixtures."""
-        # Create mock models
-        self.mock_download_model = MagicMock()
-        self.mock_category_model = MagicMock()
-        
-        # Set up the mock download model to return downloads
-        self.mock_download_model.get_history.return_value = [
-            {
-                "id": 1,
-                "url": "http://example.com/file1.pdf",
-                "file_name": "file1.pdf",
-                "file_type": "pdf",
-                "category_id": 1,
-                "priority": 1,
-                "status": "completed",
-                "created_at": 1609459200,
-                "started_at": 1609459300,
-                "completed_at": 1609459400
-            },
-            {
-                "id": 2,
-                "url": "http://example.com/file2.pdf",
-                "file_name": "file2.pdf",
-                "file_type": "pdf",
-                "category_id": 1,
-                "priority": 2,
-                "status": "failed",
-                "created_at": 1609459500,
-                "started_at": 1609459600,
-                "completed_at": 1609459700
-            }
-        ]
-        
-        # Set up the mock category model to return categories
-        self.mock_category_model.get_category.return_value = {
-            "id": 1,
-            "name": "Category 1",
-            "parent_id": None
-        }
-        
-        # Create the download history tab
-        self.tab = DownloadHistoryTab(self.mock_download_model, self.mock_category_model)
+    @classmethod
+    def setUpClass(cls):
+        """Set up fixtures shared by all tests."""
+        super().setUpClass()
+        
+        # Patch the download model where the tab looks it up
+        with patch("src.gui.download_history_tab.DownloadModel") as mock_model_class:
+            cls.mock_download_model = mock_model_class.return_value
+            
+            # Set up the mock download model to return downloads
+            cls.mock_download_model.get_download_history.return_value = _HISTORY
+            
+            # Create the download history tab once for all tests
+            cls.tab = DownloadHistoryTab()
     
-    def tearDown(self):
-        """Clean up test fixtures."""
+    @classmethod
+    def tearDownClass(cls):
+        """Tear down fixtures shared by all tests."""
         # Close the tab
-        self.tab.close()
+        cls.tab.close()
+        super().tearDownClass()
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        # Clear the filters set by earlier tests
+        self.tab.status_filter.setCurrentIndex(0)
+        self.tab.search_box.clear()
+        
+        # Forget the calls made so far, keeping the return values, and show
+        # the full history again
+        self.mock_download_model.reset_mock()
+        self.tab.load_history()
     
     def test_init(self):
         """Test the constructor."""
         # Check that the tab was created
         self.assertIsInstance(self.tab, QWidget)
         
-        # Check that the models were saved
+        # Check that the model was saved
         self.assertEqual(self.tab.download_model, self.mock_download_model)
-        self.assertEqual(self.tab.category_model, self.mock_category_model)
-    
-    def test_create_ui(self):
-        """Test the create_ui method."""
-        # Check that the history table was created
-        self.assertIsNotNone(self.tab.history_table)
         
-        # Check that the buttons were created
-        self.assertIsNotNone(self.tab.retry_button)
-        self.assertIsNotNone(self.tab.delete_button)
-        self.assertIsNotNone(self.tab.clear_button)
+        # Check that the widgets were created
+        self.assertIsNotNone(self.tab.history_table)
+        self.assertIsNotNone(self.tab.status_filter)
+        self.assertIsNotNone(self.tab.search_box)
     
-    def test_refresh(self):
-        """Test the refresh method."""
-        # Call the refresh method
-        self.tab.refresh()
-        
+    def test_load_history(self):
+        """Test that the history is loaded into the table."""
         # Check that the download model was queried
-        self.mock_download_model.get_history.assert_called_once()
+        self.mock_download_model.get_download_history.assert_called_with(limit=1000)
         
         # Check that the history table was populated
-        self.assertEqual(self.tab.history_table.rowCount(), 2)
-        self.assertEqual(self.tab.history_table.item(0, 1).text(), "file1.pdf")
-        self.assertEqual(self.tab.history_table.item(1, 1).text(), "file2.pdf")
+        self.assertEqual(column_texts(self.tab.history_table, 1), ["file1.pdf", "file2.pdf"])
+        self.assertEqual(column_texts(self.tab.history_table, 2), ["Completed", "Failed"])
+        self.assertEqual(column_texts(self.tab.history_table, 5), ["", "Connection error"])
+        self.assertEqual(column_texts(self.tab.history_table, 6), ["/downloads/file1.pdf", ""])
     
-    def test_retry_selected(self):
-        """Test the retry_selected method."""
-        # Refresh the tab to populate the history table
-        self.tab.refresh()
-        
-        # Select a row in the history table
-        self.tab.history_table.selectRow(1)  # Select the failed download
-        
-        # Call the retry_selected method
-        self.tab.retry_selected()
+    def test_filter_by_status(self):
+        """Test filtering the history by status."""
+        self.tab.status_filter.setCurrentIndex(self.tab.status_filter.findData("failed"))
         
-        # Check that the download was requeued
-        self.mock_download_model.requeue.assert_called_once_with(2)
-        
-        # Check that the history was refreshed
-        self.assertEqual(self.mock_download_model.get_history.call_count, 2)
+        self.assertEqual(column_texts(self.tab.history_table, 1), ["file2.pdf"])
     
-    def test_delete_selected(self):
-        """Test the delete_selected method."""
-        # Refresh the tab to populate the history table
-        self.tab.refresh()
-        
-        # Select a row in the history table
-        self.tab.history_table.selectRow(0)
+    def test_update_table_reuses_items(self):
+        """Test that updating the table reuses the items of the kept rows."""
+        first_item = self.tab.history_table.item(0, 1)
+        
+        self.tab.update_table([_HISTORY[1]])
+        
+        # Check that the item now shows the new row, colors included
+        self.assertEqual(self.tab.history_table.rowCount(), 1)
+        self.assertIs(self.tab.history_table.item(0, 1), first_item)
+        self.assertEqual(first_item.text(), "file2.pdf")
+        self.assertEqual(self.tab.history_table.item(0, 0).data(Qt.UserRole), 2)
+        self.assertEqual(self.tab.history_table.item(0, 2).foreground().color(), STATUS_COLORS["failed"])
+    
+    def test_filter_by_search_text(self):
+        """Test filtering the history by file name."""
+        self.tab.search_box.setText("file1")
         
-        # Call the delete_selected method
-        self.tab.delete_selected()
+        self.assertEqual(column_texts(self.tab.history_table, 1), ["file1.pdf"])
+    
+    def test_delete_record(self):
+        """Test deleting a download record."""
+        self.mock_download_model.delete_download.return_value = True
         
-        # Check that the download was deleted from history
-        self.mock_download_model.delete_from_history.assert_called_once_with(1)
+        # Confirm the deletion
+        with patch("src.gui.download_history_tab.QMessageBox.question", return_value=QMessageBox.Yes):
+            self.tab.delete_record(1)
         
-        # Check that the history was refreshed
-        self.assertEqual(self.mock_download_model.get_history.call_count, 2)
-    
-    def test_clear_history(self):
-        """Test the clear_history method."""
-        # Mock the QMessageBox.question method to return Yes
-        with patch('PyQt5.QtWidgets.QMessageBox.question') as mock_question:
-            mock_question.return_value = QMessageBox.Yes
-            
-            # Call the clear_history method
-            self.tab.clear_history()
-            
-            # Check that the history was cleared
-            self.mock_download_model.clear_history.assert_called_once()
-            
-            # Check that the history was refreshed
-            self.assertEqual(self.mock_download_model.get_history.call_count, 2)
+        # Check that the record was deleted and the history reloaded
+        self.mock_download_model.delete_download.assert_called_once_with(1)
+        self.assertEqual(self.mock_download_model.get_download_history.call_count, 2)
     
-    def test_filter_history(self):
-        """Test the filter_history method."""
-        # Refresh the tab to populate the history table
-        self.tab.refresh()
-        
-        # Set up the filter combo and text
-        self.tab.filter_combo.setCurrentIndex(1)  # Filter by file name
-        self.tab.filter_text.setText("file1")
+    def test_retry_download(self):
+        """Test retrying a failed download."""
+        self.mock_download_model.get_download_by_id.return_value = {"id": 2, "remote_file_id": 12}
         
-        # Call the filter_history method
-        self.tab.filter_history()
+        with patch("src.core.download_manager.DownloadManager") as mock_manager_class, \
+                patch("src.gui.download_history_tab.QMessageBox"):
+            mock_manager_class.return_value.queue_download.return_value = True
+            self.tab.retry_download(2)
         
-        # Check that the history table was filtered
-        # In a real implementation, this would filter the table to show only rows with "file1" in the file name
-        # For this test, we'll just check that the filter was applied
-        self.assertEqual(self.tab.filter_combo.currentIndex(), 1)
-        self.assertEqual(self.tab.filter_text.text(), "file1")
+        # Check that the remote file was queued again
+        mock_manager_class.return_value.queue_download.assert_called_once_with(12)
 
 
 if __name__ == "__main__":
-    unittest.main()
\ No newline at end of file
+    unittest.main()
@@ -1,178 +1,152 @@
 import unittest
-from unittest.mock import patch, MagicMock
+from types import MappingProxyType
+from unittest.mock import patch, call
 
-from PyQt5.QtWidgets import QApplication, QWidget
-from src.gui.download_queue_tab import DownloadQueueTab
+from PyQt5.QtCore import Qt
+from PyQt5.QtWidgets import QWidget, QMessageBox, QHeaderView
+from src.gui.download_queue_tab import DownloadQueueTab, PROGRESS_ROLE
+from tests.gui import GuiTestCase
 
 
-# Create a QApplication instance for testing
-app = QApplication.instance()
-if app is None:
-    app = QApplication([])
+# One active download and one queued file; shared read-only by the tests
+_ACTIVE_DOWNLOADS = MappingProxyType({
+    1: MappingProxyType({"name": "file1.pdf", "size": 1024, "status": "downloading", "progress": 0.0})
+})
+_QUEUE_ITEMS = (
+    MappingProxyType({"file_id": 2, "name": "file2.pdf", "size": 2048}),
+)
 
 
-class TestDownloadQueueTab(unittest.TestCase):
+class TestDownloadQueueTab(GuiTestCase):
     """Test case for the DownloadQueueTab class."""
     
-    def setUp(self):
-        """Set up test fixtures."""
-        # Create mock models
-        self.mock_download_model = MagicMock()
-        self.mock_category_model = MagicMock()
-        
-        # Set up the mock download model to return downloads
-        self.mock_download_model.get_queue.return_value = [
-            {
-                "id": 1,
-                "url": "http://example.com/file1.pdf",
-                "file_name": "file1.pdf",
-                "file_type": "pdf",
-                "category_id": 1,
-                "priority": 1,
-                "status": "queued",
-                "created_at": 1609459200,
-                "started_at": None,
-                "completed_at": None
-            },
-            {
-                "id": 2,
-                "url": "http://example.com/file2.pdf",
-                "file_name": "file2.pdf",
-                "file_type": "pdf",
-                "category_id": 1,
-                "priority": 2,
-                "status": "downloading",
-                "created_at": 1609459300,
-                "started_at": 1609459400,
-                "completed_at": None
-            }
-        ]
+    @classmethod
+    def setUpClass(cls):
+        """Set up fixtures shared by all tests."""
+        super().setUpClass()
         
-        # Set up the mock category model to return categories
-        self.mock_category_model.get_category.return_value = {
-            "id": 1,
-            "name": "Category 1",
-            "parent_id": None
-        }
+        # Patch the download manager where the tab looks it up
+        with patch("src.gui.download_queue_tab.DownloadManager") as mock_manager_class:
+            cls.mock_download_manager = mock_manager_class.return_value
+            
+            # Create the download queue tab once for all tests
+            cls.tab = DownloadQueueTab()
         
-        # Create the download queue tab
-        self.tab = DownloadQueueTab(self.mock_download_model, self.mock_category_model)
+        # Keep the calls made by the constructor for test_init
+        cls.construction_calls = list(cls.mock_download_manager.mock_calls)
     
-    def tearDown(self):
-        """Clean up test fixtures."""
+    @classmethod
+    def tearDownClass(cls):
+        """Tear down fixtures shared by all tests."""
         # Close the tab
-        self.tab.close()
+        cls.tab.close()
+        super().tearDownClass()
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        # Forget the calls made by earlier tests and restore the return
+        # values they replaced
+        self.mock_download_manager.reset_mock()
+        self.mock_download_manager.get_active_downloads.return_value = _ACTIVE_DOWNLOADS
+        self.mock_download_manager.get_queue_items.return_value = _QUEUE_ITEMS
+        
+        # Show them in place of the rows left by earlier tests
+        self.tab.update_queue_table()
+        self.tab.start_stop_button.setText("Start Downloads")
     
     def test_init(self):
         """Test the constructor."""
         # Check that the tab was created
         self.assertIsInstance(self.tab, QWidget)
         
-        # Check that the models were saved
-        self.assertEqual(self.tab.download_model, self.mock_download_model)
-        self.assertEqual(self.tab.category_model, self.mock_category_model)
-    
-    def test_create_ui(self):
-        """Test the create_ui method."""
-        # Check that the queue table was created
-        self.assertIsNotNone(self.tab.queue_table)
+        # Check that the download manager was saved and started
+        self.assertEqual(self.tab.download_manager, self.mock_download_manager)
+        self.assertIn(call.start(), self.construction_calls)
         
-        # Check that the buttons were created
-        self.assertIsNotNone(self.tab.start_button)
-        self.assertIsNotNone(self.tab.pause_button)
-        self.assertIsNotNone(self.tab.remove_button)
-        self.assertIsNotNone(self.tab.clear_button)
+        # Check that the download manager signals were connected
+        self.assertIn(call.download_started.connect(self.tab.on_download_started), self.construction_calls)
+        self.assertIn(call.download_failed.connect(self.tab.on_download_failed), self.construction_calls)
     
-    def test_refresh(self):
-        """Test the refresh method."""
-        # Call the refresh method
-        self.tab.refresh()
-        
-        # Check that the download model was queried
-        self.mock_download_model.get_queue.assert_called_once()
-        
-        # Check that the queue table was populated
-        self.assertEqual(self.tab.queue_table.rowCount(), 2)
-        self.assertEqual(self.tab.queue_table.item(0, 1).text(), "file1.pdf")
-        self.assertEqual(self.tab.queue_table.item(1, 1).text(), "file2.pdf")
+    def test_fixed_sections(self):
+        """Test that no table section is sized from its contents."""
+        horizontal_header = self.tab.queue_table.horizontalHeader()
+        vertical_header = self.tab.queue_table.verticalHeader()
+        self.assertEqual(horizontal_header.sectionResizeMode(0), QHeaderView.Fixed)
+        self.assertEqual(horizontal_header.sectionResizeMode(1), QHeaderView.Stretch)
+        self.assertEqual(vertical_header.sectionResizeMode(0), QHeaderView.Fixed)
+        self.assertGreater(vertical_header.defaultSectionSize(), self.tab.queue_table.fontMetrics().height())
     
-    def test_start_downloads(self):
-        """Test the start_downloads method."""
-        # Mock the DownloadManager class
-        with patch('src.core.download_manager.DownloadManager') as mock_manager_class:
-            # Set up the mock manager
-            mock_manager = MagicMock()
-            mock_manager_class.return_value = mock_manager
-            
-            # Call the start_downloads method
-            self.tab.start_downloads()
-            
-            # Check that the download manager was created and started
-            mock_manager_class.assert_called_once_with(
-                self.mock_download_model,
-                self.mock_category_model
-            )
-            mock_manager.start.assert_called_once()
-            
-            # Check that the download manager was saved
-            self.assertEqual(self.tab.download_manager, mock_manager)
+    def test_update_queue_table(self):
+        """Test that active downloads are listed before queued files."""
+        model = self.tab.queue_model
+        self.assertIs(self.tab.queue_table.model(), model)
+        self.assertEqual(model.rowCount(), 2)
+        self.assertEqual(model.index(0, 0).data(Qt.UserRole), 1)
+        self.assertEqual(model.index(0, 1).data(), "file1.pdf")
+        self.assertEqual(model.index(0, 2).data(), "1.0 KB")
+        self.assertEqual(model.index(0, 3).data(), "Downloading")
+        self.assertEqual(model.index(1, 1).data(), "file2.pdf")
+        self.assertEqual(model.index(1, 3).data(), "Queued")
+        self.assertEqual(model.index(1, 4).data(PROGRESS_ROLE), 0)
     
-    def test_pause_downloads(self):
-        """Test the pause_downloads method."""
-        # Create a mock download manager
-        self.tab.download_manager = MagicMock()
+    def test_on_download_progress(self):
+        """Test that download progress updates only the progress cell."""
+        model = self.tab.queue_model
+        changed = []
+        model.dataChanged.connect(
+            lambda top_left, bottom_right, roles: changed.append((top_left.row(), top_left.column(), list(roles)))
+        )
         
-        # Call the pause_downloads method
-        self.tab.pause_downloads()
+        self.tab.on_download_progress(1, 0.5)
         
-        # Check that the download manager was paused
-        self.tab.download_manager.pause.assert_called_once()
+        self.assertEqual(model.index(0, 4).data(PROGRESS_ROLE), 50)
+        self.assertEqual(changed, [(0, 4, [PROGRESS_ROLE])])
     
-    def test_remove_selected(self):
-        """Test the remove_selected method."""
-        # Refresh the tab to populate the queue table
-        self.tab.refresh()
+    def test_on_download_progress_for_unknown_file(self):
+        """Test that progress of a file not in the queue is ignored."""
+        model = self.tab.queue_model
+        changed = []
+        model.dataChanged.connect(lambda top_left, bottom_right, roles: changed.append(top_left.row()))
         
-        # Select a row in the queue table
-        self.tab.queue_table.selectRow(0)
+        self.tab.on_download_progress(99, 0.5)
         
-        # Call the remove_selected method
-        self.tab.remove_selected()
-        
-        # Check that the download was removed from the queue
-        self.mock_download_model.remove_from_queue.assert_called_once_with(1)
+        self.assertEqual(changed, [])
+        self.assertEqual(model.index(0, 4).data(PROGRESS_ROLE), 0)
+    
+    def test_toggle_downloads(self):
+        """Test pausing and resuming the downloads."""
+        # Pause the running downloads
+        self.mock_download_manager.is_running.return_value = True
+        self.tab.toggle_downloads()
+        self.mock_download_manager.stop.assert_called_once()
+        self.assertEqual(self.tab.start_stop_button.text(), "Start Downloads")
         
-        # Check that the queue was refreshed
-        self.assertEqual(self.mock_download_model.get_queue.call_count, 2)
+        # Resume them
+        self.mock_download_manager.is_running.return_value = False
+        self.tab.toggle_downloads()
+        self.mock_download_manager.start.assert_called_once()
+        self.assertEqual(self.tab.start_stop_button.text(), "Pause Downloads")
     
     def test_clear_queue(self):
-        """Test the clear_queue method."""
-        # Mock the QMessageBox.question method to return Yes
-        with patch('PyQt5.QtWidgets.QMessageBox.question') as mock_question:
-            mock_question.return_value = QMessageBox.Yes
-            
-            # Call the clear_queue method
+        """Test clearing the queue."""
+        self.mock_download_manager.get_queue_items.return_value = []
+        
+        # Confirm clearing the queue
+        with patch("src.gui.download_queue_tab.QMessageBox.question", return_value=QMessageBox.Yes):
             self.tab.clear_queue()
-            
-            # Check that each download was removed from the queue
-            self.mock_download_model.remove_from_queue.assert_any_call(1)
-            self.mock_download_model.remove_from_queue.assert_any_call(2)
-            
-            # Check that the queue was refreshed
-            self.assertEqual(self.mock_download_model.get_queue.call_count, 2)
-    
-    def test_update_progress(self):
-        """Test the update_progress method."""
-        # Refresh the tab to populate the queue table
-        self.tab.refresh()
         
-        # Call the update_progress method
-        self.tab.update_progress(1, 0.5)  # 50% progress for download ID 1
+        # Check that the queue was cleared and the table updated
+        self.mock_download_manager.clear_queue.assert_called_once()
+        self.assertEqual(self.tab.queue_model.rowCount(), 1)
+    
+    def test_on_download_failed(self):
+        """Test that a failed download is reported."""
+        with patch("src.gui.download_queue_tab.QMessageBox") as mock_message_box:
+            self.tab.on_download_failed(1, "Connection error")
         
-        # Check that the progress bar was updated
-        progress_bar = self.tab.queue_table.cellWidget(0, 5)
-        self.assertEqual(progress_bar.value(), 50)  # 50% progress
+        mock_message_box.warning.assert_called_once()
+        self.assertIn("Connection error", mock_message_box.warning.call_args[0][2])
 
 
 if __name__ == "__main__":
-    unittest.main()
\ No newline at end of file
+    unittest.main()
@@ -0,0 +1,85 @@
+import unittest
+
+from PyQt5.QtCore import Qt
+from src.gui.file_list_model import FileListModel, BATCH_SIZE
+from tests.gui import GuiTestCase, model_column_texts
+
+
+class TestFileListModel(GuiTestCase):
+    """Test case for the FileListModel class."""
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        self.model = FileListModel([
+            ("ID", lambda file: str(file["id"])),
+            ("Name", lambda file: file["name"]),
+        ])
+        
+        # One and a half batches of files
+        self.files = [{"id": i, "name": f"file{i}.pdf"} for i in range(BATCH_SIZE + BATCH_SIZE // 2)]
+    
+    def test_headers(self):
+        """Test the header labels."""
+        self.assertEqual(self.model.columnCount(), 2)
+        self.assertEqual(self.model.headerData(1, Qt.Horizontal), "Name")
+    
+    def test_set_files(self):
+        """Test that only the first batch is loaded."""
+        self.model.set_files(self.files)
+        
+        self.assertEqual(self.model.rowCount(), BATCH_SIZE)
+        self.assertEqual(self.model.file_count(), len(self.files))
+        self.assertTrue(self.model.canFetchMore())
+        self.assertEqual(model_column_texts(self.model, 1)[:2], ["file0.pdf", "file1.pdf"])
+        self.assertEqual(self.model.index(3, 0).data(Qt.UserRole), 3)
+        self.assertEqual(self.model.file_id(3), 3)
+    
+    def test_fetch_more(self):
+        """Test loading the remaining files."""
+        self.model.set_files(self.files)
+        inserted = []
+        self.model.rowsInserted.connect(lambda parent, first, last: inserted.append((first, last)))
+        
+        self.model.fetchMore()
+        
+        self.assertEqual(inserted, [(BATCH_SIZE, len(self.files) - 1)])
+        self.assertEqual(self.model.rowCount(), len(self.files))
+        self.assertFalse(self.model.canFetchMore())
+    
+    def test_set_files_resets(self):
+        """Test that replacing the files starts again from the first batch."""
+        self.model.set_files(self.files)
+        self.model.fetchMore()
+        
+        self.model.set_files(self.files[:3])
+        
+        self.assertEqual(model_column_texts(self.model, 0), ["0", "1", "2"])
+        self.assertFalse(self.model.canFetchMore())
+
+    
+    def test_set_page_source(self):
+        """Test reading the files one page per batch."""
+        requests = []
+        
+        def fetch_page(last_file, limit):
+            requests.append((last_file["id"] if last_file else None, limit))
+            start = last_file["id"] + 1 if last_file else 0
+            return self.files[start:start + limit]
+        
+        # Only the first page is read
+        self.model.set_page_source(fetch_page)
+        self.assertEqual(requests, [(None, BATCH_SIZE)])
+        self.assertEqual(self.model.rowCount(), BATCH_SIZE)
+        self.assertTrue(self.model.canFetchMore())
+        
+        # The second page starts after the last file of the first
+        self.model.fetchMore()
+        self.assertEqual(requests, [(None, BATCH_SIZE), (BATCH_SIZE - 1, BATCH_SIZE)])
+        self.assertEqual(self.model.rowCount(), len(self.files))
+        
+        # The second page is short, so it is the last
+        self.assertFalse(self.model.canFetchMore())
+        self.assertEqual(self.model.file_id(len(self.files) - 1), len(self.files) - 1)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,93 +1,75 @@
 import unittest
-from unittest.mock import patch, MagicMock
+from types import MappingProxyType
+from unittest.mock import patch
 
-from PyQt5.QtWidgets import QApplication, QWidget
+from PyQt5.QtCore import Qt
+from PyQt5.QtWidgets import QWidget
+from src.gui.file_list_model import BATCH_SIZE
 from src.gui.library_tab import LibraryTab
+from tests.gui import GuiTestCase, model_column_texts
 
 
-# Create a QApplication instance for testing
-app = QApplication.instance()
-if app is None:
-    app = QApplication([])
+# Remote files of one site; shared read-only by the tests
+_FILES = (
+    MappingProxyType({"id": 1, "site_id": 1, "name": "file1.pdf", "file_type": "pdf", "size": 1024}),
+    MappingProxyType({"id": 2, "site_id": 1, "name": "book2.epub", "file_type": "epub", "size": 2048}),
+    MappingProxyType({"id": 3, "site_id": 1, "name": "file3.pdf", "file_type": "pdf", "size": None}),
+)
 
 
-class TestLibraryTab(unittest.TestCase):
+def _get_files_page(limit, after=None, site_id=None, file_type=None):
+    """Stand in for RemoteFileModel.get_files_page; all the files fit in one page."""
+    return [file for file in _FILES if not file_type or file["file_type"] == file_type]
+
+
+class TestLibraryTab(GuiTestCase):
     """Test case for the LibraryTab class."""
     
-    def setUp(self):
-        """Set up test fixtures."""
-        # Create mock models
-        self.mock_remote_file_model = MagicMock()
-        self.mock_category_model = MagicMock()
-        self.mock_site_model = MagicMock()
-        
-        # Set up the mock remote file model to return files
-        self.mock_remote_file_model.get_all_files.return_value = [
-            {
-                "id": 1,
-                "site_id": 1,
-                "url": "http://example.com/file1.pdf",
-                "name": "file1.pdf",
-                "file_type": "pdf",
-                "size": 1024,
-                "category_id": 1,
-                "hash": "abc123",
-                "last_updated": 1609459200
-            },
-            {
-                "id": 2,
-                "site_id": 1,
-                "url": "http://example.com/file2.pdf",
-                "name": "file2.pdf",
-                "file_type": "pdf",
-                "size": 2048,
-                "category_id": 2,
-                "hash": "def456",
-                "last_updated": 1609459300
-            }
-        ]
-        
-        # Set up the mock category model to return categories
-        self.mock_category_model.get_all_categories.return_value = [
-            {
-                "id": 1,
-                "name": "Category 1",
-                "parent_id": None
-            },
-            {
-                "id": 2,
-                "name": "Category 2",
-                "parent_id": None
-            }
-        ]
-        
-        self.mock_category_model.get_category.side_effect = lambda category_id: {
-            1: {"id": 1, "name": "Category 1", "parent_id": None},
-            2: {"id": 2, "name": "Category 2", "parent_id": None}
-        }.get(category_id)
-        
-        # Set up the mock site model to return sites
-        self.mock_site_model.get_site.return_value = {
-            "id": 1,
-            "name": "Site 1",
-            "url": "http://example.com",
-            "scraper_type": "generic",
-            "username": "user",
-            "password": "pass",
-            "last_scan": 1609459200
-        }
-        
-        # Create the library tab
-        self.tab = LibraryTab(
-            self.mock_remote_file_model,
-            self.mock_category_model,
-            self.mock_site_model
-        )
+    @classmethod
+    def setUpClass(cls):
+        """Set up fixtures shared by all tests."""
+        super().setUpClass()
+        
+        # Patch the models and the download manager where the tab looks them up
+        with patch("src.gui.library_tab.RemoteFileModel") as mock_remote_file_model_class, \
+                patch("src.gui.library_tab.SiteModel") as mock_site_model_class, \
+                patch("src.gui.library_tab.DownloadManager") as mock_manager_class:
+            cls.mock_remote_file_model = mock_remote_file_model_class.return_value
+            cls.mock_site_model = mock_site_model_class.return_value
+            cls.mock_download_manager = mock_manager_class.return_value
+            
+            # Set up the mock models to return a site and its files
+            cls.mock_site_model.get_all_sites.return_value = [{"id": 1, "name": "Site 1"}]
+            cls.mock_remote_file_model.get_files_page.side_effect = _get_files_page
+            cls.mock_remote_file_model.get_file_count.return_value = 3
+            cls.mock_remote_file_model.get_file_count_by_type.return_value = {"pdf": 2, "epub": 1}
+            
+            # Create the library tab once for all tests
+            cls.tab = LibraryTab()
     
-    def tearDown(self):
-        """Clean up test fixtures."""
+    @classmethod
+    def tearDownClass(cls):
+        """Tear down fixtures shared by all tests."""
         # Close the tab
-        self.tab.close()
+        cls.tab.close()
+        super().tearDownClass()
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        # Undo the selections made by earlier tests
+        self.tab.site_combo.setCurrentIndex(0)
+        self.tab.filter_all.setChecked(True)
+        self.tab.search_input.clear()
+        self.tab.search_timer.stop()
+        self.tab.scan_button.setEnabled(True)
+        self.tab.scan_button.setText("Scan Site")
+        
+        # Forget the calls made so far, keeping the return values, and show
+        # all the files again
+        self.mock_remote_file_model.reset_mock()
+        self.mock_site_model.reset_mock()
+        self.mock_download_manager.reset_mock()
+        self.tab.refresh_files()
     
     def test_init(self):
         """Test the constructor."""
@@ -96,170 +78,113 @@ class TestLibraryTab(unittest.TestCase):
         
         # Check that the models were saved
         self.assertEqual(self.tab.remote_file_model, self.mock_remote_file_model)
-        self.assertEqual(self.tab.category_model, self.mock_category_model)
         self.assertEqual(self.tab.site_model, self.mock_site_model)
-    
-    def test_create_ui(self):
-        """Test the create_ui method."""
-        # Check that the category tree was created
-        self.assertIsNotNone(self.tab.category_tree)
+        self.assertEqual(self.tab.download_manager, self.mock_download_manager)
         
-        # Check that the file table was created
-        self.assertIsNotNone(self.tab.file_table)
-        
-        # Check that the search box was created
-        self.assertIsNotNone(self.tab.search_box)
+        # Check that the sites were loaded
+        self.assertEqual(self.tab.site_combo.count(), 2)
+        self.assertEqual(self.tab.site_combo.itemText(0), "All Sites")
+        self.assertEqual(self.tab.site_combo.itemData(1), 1)
     
-    def test_refresh(self):
-        """Test the refresh method."""
-        # Call the refresh method
-        self.tab.refresh()
-        
-        # Check that the category model was queried
-        self.mock_category_model.get_all_categories.assert_called_once()
-        
-        # Check that the category tree was populated
-        self.assertEqual(self.tab.category_tree.topLevelItemCount(), 2)
-        self.assertEqual(self.tab.category_tree.topLevelItem(0).text(0), "Category 1")
-        self.assertEqual(self.tab.category_tree.topLevelItem(1).text(0), "Category 2")
+    def test_load_file_stats(self):
+        """Test that the file statistics are shown."""
+        self.assertEqual(
+            self.tab.stats_label.text(),
+            "Total Files: 3 | PDF: 2 | EPUB: 1 | TXT: 0"
+        )
     
-    def test_category_selected(self):
-        """Test the category_selected method."""
-        # Refresh the tab to populate the category tree
-        self.tab.refresh()
-        
-        # Select a category
-        self.tab.category_tree.setCurrentItem(self.tab.category_tree.topLevelItem(0))
+    def test_refresh_files(self):
+        """Test that the files of all sites are shown."""
+        self.tab.refresh_files()
+        
+        # Check the table contents
+        self.assertEqual(model_column_texts(self.tab.files_model, 1), ["file1.pdf", "book2.epub", "file3.pdf"])
+        self.assertEqual(model_column_texts(self.tab.files_model, 2), ["PDF", "EPUB", "PDF"])
+        self.assertEqual(model_column_texts(self.tab.files_model, 3), ["1.0 KB", "2.0 KB", "Unknown"])
+        self.assertEqual(model_column_texts(self.tab.files_model, 4), ["Site 1"] * 3)
+        self.assertEqual(self.tab.files_model.index(0, 0).data(Qt.UserRole), 1)
+    
+    def test_refresh_files_for_site(self):
+        """Test that the files of the selected site are fetched."""
+        self.tab.site_combo.setCurrentIndex(1)
         
-        # Call the category_selected method
-        self.tab.category_selected()
+        self.mock_remote_file_model.get_files_page.assert_called_with(BATCH_SIZE, None, site_id=1, file_type=None)
+        self.assertEqual(self.tab.files_model.rowCount(), 3)
+    
+    def test_filter_files(self):
+        """Test filtering the files by type."""
+        self.tab.filter_pdf.setChecked(True)
+        self.tab.filter_files()
         
-        # Check that the remote file model was queried
-        self.mock_remote_file_model.get_files_by_category.assert_called_once_with(1)
+        self.assertEqual(model_column_texts(self.tab.files_model, 1), ["file1.pdf", "file3.pdf"])
     
-    def test_search_files(self):
-        """Test the search_files method."""
-        # Set up the search box
-        self.tab.search_box.setText("file1")
+    def test_search_loaded_files(self):
+        """Test that a search filters the loaded files without a query."""
+        self.tab.search_files("BOOK")
         
-        # Call the search_files method
-        self.tab.search_files()
+        self.mock_remote_file_model.search_files.assert_not_called()
+        self.assertEqual(model_column_texts(self.tab.files_proxy, 1), ["book2.epub"])
         
-        # Check that the remote file model was queried
-        self.mock_remote_file_model.search_files.assert_called_once_with("file1")
+        # Clearing the search shows all the files again
+        self.tab.search_files("")
+        self.assertEqual(self.tab.files_proxy.rowCount(), 3)
     
-    def test_show_file_details(self):
-        """Test the show_file_details method."""
-        # Refresh the tab to populate the category tree
-        self.tab.refresh()
-        
-        # Select a category
-        self.tab.category_tree.setCurrentItem(self.tab.category_tree.topLevelItem(0))
+    def test_search_files_in_database(self):
+        """Test that the database is searched while files are left to load."""
+        self.mock_remote_file_model.search_files.return_value = [_FILES[1]]
         
-        # Call the category_selected method to populate the file table
-        self.tab.category_selected()
+        with patch.object(self.tab.files_model, "canFetchMore", return_value=True):
+            self.tab.search_files("BOOK")
         
-        # Select a file
-        self.tab.file_table.selectRow(0)
+        self.mock_remote_file_model.search_files.assert_called_once_with("BOOK", None, None)
+        self.assertEqual(model_column_texts(self.tab.files_proxy, 1), ["book2.epub"])
         
-        # Mock the QMessageBox.information method
-        with patch('PyQt5.QtWidgets.QMessageBox.information') as mock_info:
-            # Call the show_file_details method
-            self.tab.show_file_details()
-            
-            # Check that the message box was shown
-            mock_info.assert_called_once()
+        # The next search starts again from the full list
+        self.tab.search_files("file")
+        self.assertEqual(model_column_texts(self.tab.files_proxy, 1), ["file1.pdf", "file3.pdf"])
     
-    def test_add_category(self):
-        """Test the add_category method."""
-        # Refresh the tab to populate the category tree
-        self.tab.refresh()
+    def test_search_waits_for_typing_to_pause(self):
+        """Test that typing starts one delayed search."""
+        self.tab.search_input.setText("f")
+        self.tab.search_input.setText("file")
         
-        # Mock the QInputDialog.getText method to return a category name
-        with patch('PyQt5.QtWidgets.QInputDialog.getText') as mock_getText:
-            mock_getText.return_value = ("New Category", True)
-            
-            # Call the add_category method
-            self.tab.add_category()
-            
-            # Check that the category was added
-            self.mock_category_model.add_category.assert_called_once_with(
-                name="New Category",
-                parent_id=None
-            )
-            
-            # Check that the category tree was refreshed
-            self.assertEqual(self.mock_category_model.get_all_categories.call_count, 2)
-    
-    def test_add_subcategory(self):
-        """Test the add_subcategory method."""
-        # Refresh the tab to populate the category tree
-        self.tab.refresh()
+        # Nothing is searched until the timer fires
+        self.assertEqual(self.tab.files_proxy.rowCount(), 3)
+        self.assertTrue(self.tab.search_timer.isActive())
         
-        # Select a category
-        self.tab.category_tree.setCurrentItem(self.tab.category_tree.topLevelItem(0))
+        self.tab.search_timer.timeout.emit()
         
-        # Mock the QInputDialog.getText method to return a category name
-        with patch('PyQt5.QtWidgets.QInputDialog.getText') as mock_getText:
-            mock_getText.return_value = ("New Subcategory", True)
-            
-            # Call the add_subcategory method
-            self.tab.add_subcategory()
-            
-            # Check that the subcategory was added
-            self.mock_category_model.add_category.assert_called_once_with(
-                name="New Subcategory",
-                parent_id=1
-            )
-            
-            # Check that the category tree was refreshed
-            self.assertEqual(self.mock_category_model.get_all_categories.call_count, 2)
+        self.assertEqual(self.tab.files_proxy.rowCount(), 2)
+        self.assertFalse(self.tab.search_timer.isActive())
     
-    def test_edit_category(self):
-        """Test the edit_category method."""
-        # Refresh the tab to populate the category tree
-        self.tab.refresh()
-        
-        # Select a category
-        self.tab.category_tree.setCurrentItem(self.tab.category_tree.topLevelItem(0))
-        
-        # Mock the QInputDialog.getText method to return a new category name
-        with patch('PyQt5.QtWidgets.QInputDialog.getText') as mock_getText:
-            mock_getText.return_value = ("Updated Category", True)
-            
-            # Call the edit_category method
-            self.tab.edit_category()
-            
-            # Check that the category was updated
-            self.mock_category_model.update_category.assert_called_once_with(
-                category_id=1,
-                name="Updated Category"
-            )
-            
-            # Check that the category tree was refreshed
-            self.assertEqual(self.mock_category_model.get_all_categories.call_count, 2)
+    def test_queue_download(self):
+        """Test adding a file to the download queue."""
+        self.mock_download_manager.queue_download.return_value = True
+        queued = []
+        self.tab.file_queued.connect(queued.append)
+        
+        with patch("src.gui.library_tab.QMessageBox") as mock_message_box:
+            self.tab.queue_download(2)
+        
+        # Check that the file was queued and the signal emitted
+        self.mock_download_manager.queue_download.assert_called_once_with(2)
+        self.assertEqual(queued, [2])
+        mock_message_box.information.assert_called_once()
     
-    def test_delete_category(self):
-        """Test the delete_category method."""
-        # Refresh the tab to populate the category tree
-        self.tab.refresh()
-        
-        # Select a category
-        self.tab.category_tree.setCurrentItem(self.tab.category_tree.topLevelItem(0))
-        
-        # Mock the QMessageBox.question method to return Yes
-        with patch('PyQt5.QtWidgets.QMessageBox.question') as mock_question:
-            mock_question.return_value = QMessageBox.Yes
-            
-            # Call the delete_category method
-            self.tab.delete_category()
-            
-            # Check that the category was deleted
-            self.mock_category_model.delete_category.assert_called_once_with(1)
-            
-            # Check that the category tree was refreshed
-            self.assertEqual(self.mock_category_model.get_all_categories.call_count, 2)
+    def test_scan_complete(self):
+        """Test handling the completion of a site scan."""
+        self.tab.scan_button.setEnabled(False)
+        result = {"success": True, "error": None, "files": [{}, {}], "stats": {"files_added": 1}}
+        
+        with patch("src.gui.library_tab.QMessageBox") as mock_message_box:
+            self.tab.scan_complete(result)
+        
+        # Check that the results were shown and the tab reset
+        mock_message_box.information.assert_called_once()
+        self.assertTrue(self.tab.scan_button.isEnabled())
+        self.assertEqual(self.tab.scan_button.text(), "Scan Site")
+        self.assertEqual(self.tab.files_model.rowCount(), 3)
 
 
 if __name__ == "__main__":
-    unittest.main()
\ No newline at end of file
+    unittest.main()
@@ -1,248 +1,177 @@
 import unittest
-from unittest.mock import patch, MagicMock
+from types import MappingProxyType
+from unittest.mock import patch
 
-from PyQt5.QtWidgets import QApplication, QWidget
+from PyQt5.QtWidgets import QWidget, QMessageBox
+from src.gui.file_list_model import BATCH_SIZE
 from src.gui.local_library_tab import LocalLibraryTab
+from tests.gui import GuiTestCase, model_column_texts
 
 
-# Create a QApplication instance for testing
-app = QApplication.instance()
-if app is None:
-    app = QApplication([])
+# Local files in the database; shared read-only by the tests
+_FILES = (
+    MappingProxyType({"id": 1, "path": "/downloads/file1.pdf", "file_type": "pdf", "size": 1024}),
+    MappingProxyType({"id": 2, "path": "/downloads/books/book2.epub", "file_type": "epub", "size": 2048}),
+)
 
 
-class TestLocalLibraryTab(unittest.TestCase):
+def _get_files_page(limit, after=None, file_type=None):
+    """Stand in for LocalFileModel.get_files_page; all the files fit in one page."""
+    return [file for file in _FILES if not file_type or file["file_type"] == file_type]
+
+
+class TestLocalLibraryTab(GuiTestCase):
     """Test case for the LocalLibraryTab class."""
     
+    @classmethod
+    def setUpClass(cls):
+        """Set up fixtures shared by all tests."""
+        super().setUpClass()
+        
+        # Patch the configuration for the whole class, since the tab reads it
+        # again when scanning and reloading directories
+        cls.config_patcher = patch("src.gui.local_library_tab.config")
+        cls.mock_config = cls.config_patcher.start()
+        cls.mock_config.get_local_directories.return_value = ["/downloads"]
+        
+        # Patch the model and the scanner where the tab looks them up
+        with patch("src.gui.local_library_tab.LocalFileModel") as mock_model_class, \
+                patch("src.gui.local_library_tab.DirectoryScanner") as mock_scanner_class:
+            cls.mock_local_file_model = mock_model_class.return_value
+            cls.mock_directory_scanner = mock_scanner_class.return_value
+            
+            # Set up the mocks to return the files
+            cls.mock_directory_scanner.get_total_file_count.return_value = 2
+            cls.mock_directory_scanner.get_file_count_by_type.return_value = {"pdf": 1, "epub": 1}
+            cls.mock_local_file_model.get_files_page.side_effect = _get_files_page
+            
+            # Create the local library tab once for all tests
+            cls.tab = LocalLibraryTab()
+    
+    @classmethod
+    def tearDownClass(cls):
+        """Tear down fixtures shared by all tests."""
+        # Close the tab and stop patching the configuration
+        cls.tab.close()
+        cls.config_patcher.stop()
+        super().tearDownClass()
+    
     def setUp(self):
         """Set up test fixtures."""
-        # Create mock models
-        self.mock_local_file_model = MagicMock()
-        self.mock_category_model = MagicMock()
-        self.mock_settings_model = MagicMock()
-        
-        # Set up the mock local file model to return files
-        self.mock_local_file_model.get_all_files.return_value = [
-            {
-                "id": 1,
-                "path": "/downloads/file1.pdf",
-                "name": "file1.pdf",
-                "file_type": "pdf",
-                "size": 1024,
-                "category_id": 1,
-                "hash": "abc123",
-                "last_updated": 1609459200
-            },
-            {
-                "id": 2,
-                "path": "/downloads/file2.pdf",
-                "name": "file2.pdf",
-                "file_type": "pdf",
-                "size": 2048,
-                "category_id": 2,
-                "hash": "def456",
-                "last_updated": 1609459300
-            }
-        ]
-        
-        # Set up the mock category model to return categories
-        self.mock_category_model.get_all_categories.return_value = [
-            {
-                "id": 1,
-                "name": "Category 1",
-                "parent_id": None
-            },
-            {
-                "id": 2,
-                "name": "Category 2",
-                "parent_id": None
-            }
-        ]
-        
-        self.mock_category_model.get_category.side_effect = lambda category_id: {
-            1: {"id": 1, "name": "Category 1", "parent_id": None},
-            2: {"id": 2, "name": "Category 2", "parent_id": None}
-        }.get(category_id)
-        
-        # Set up the mock settings model to return settings
-        self.mock_settings_model.get_setting.return_value = "/downloads"
-        
-        # Create the local library tab
-        self.tab = LocalLibraryTab(
-            self.mock_local_file_model,
-            self.mock_category_model,
-            self.mock_settings_model
-        )
-    
-    def tearDown(self):
-        """Clean up test fixtures."""
-        # Close the tab
-        self.tab.close()
+        # Undo the scans and selections made by earlier tests
+        self.tab.scan_thread = None
+        self.tab.scan_all_button.setEnabled(True)
+        self.tab.cancel_button.setEnabled(False)
+        self.tab.filter_all.setChecked(True)
+        self.tab.search_input.clear()
+        self.tab.search_timer.stop()
+        
+        # Forget the calls made so far, keeping the return values, and show
+        # all the files again
+        self.mock_config.reset_mock()
+        self.mock_local_file_model.reset_mock()
+        self.mock_directory_scanner.reset_mock()
+        self.tab.refresh_files()
     
     def test_init(self):
         """Test the constructor."""
         # Check that the tab was created
         self.assertIsInstance(self.tab, QWidget)
         
-        # Check that the models were saved
+        # Check that the model and the scanner were saved
         self.assertEqual(self.tab.local_file_model, self.mock_local_file_model)
-        self.assertEqual(self.tab.category_model, self.mock_category_model)
-        self.assertEqual(self.tab.settings_model, self.mock_settings_model)
-    
-    def test_create_ui(self):
-        """Test the create_ui method."""
-        # Check that the category tree was created
-        self.assertIsNotNone(self.tab.category_tree)
+        self.assertEqual(self.tab.directory_scanner, self.mock_directory_scanner)
+        self.assertIsNone(self.tab.scan_thread)
         
-        # Check that the file table was created
-        self.assertIsNotNone(self.tab.file_table)
-        
-        # Check that the search box was created
-        self.assertIsNotNone(self.tab.search_box)
-        
-        # Check that the scan button was created
-        self.assertIsNotNone(self.tab.scan_button)
+        # Check that the directories and the statistics were loaded
+        self.assertEqual(self.tab.dir_list.count(), 1)
+        self.assertEqual(self.tab.dir_list.item(0).text(), "/downloads")
+        self.assertEqual(self.tab.stats_label.text(), "Total files: 2\nPDF files: 1\nEPUB files: 1\n")
     
-    def test_refresh(self):
-        """Test the refresh method."""
-        # Call the refresh method
-        self.tab.refresh()
-        
-        # Check that the category model was queried
-        self.mock_category_model.get_all_categories.assert_called_once()
-        
-        # Check that the category tree was populated
-        self.assertEqual(self.tab.category_tree.topLevelItemCount(), 2)
-        self.assertEqual(self.tab.category_tree.topLevelItem(0).text(0), "Category 1")
-        self.assertEqual(self.tab.category_tree.topLevelItem(1).text(0), "Category 2")
+    def test_refresh_files(self):
+        """Test that the files are shown."""
+        self.tab.refresh_files()
+        
+        # Check the table contents
+        self.assertEqual(model_column_texts(self.tab.files_model, 0), ["1", "2"])
+        self.assertEqual(model_column_texts(self.tab.files_model, 1), [file["path"] for file in _FILES])
+        self.assertEqual(model_column_texts(self.tab.files_model, 2), ["PDF", "EPUB"])
+        self.assertEqual(model_column_texts(self.tab.files_model, 3), ["1.0 KB", "2.0 KB"])
     
-    def test_category_selected(self):
-        """Test the category_selected method."""
-        # Refresh the tab to populate the category tree
-        self.tab.refresh()
-        
-        # Select a category
-        self.tab.category_tree.setCurrentItem(self.tab.category_tree.topLevelItem(0))
-        
-        # Call the category_selected method
-        self.tab.category_selected()
+    def test_filter_files(self):
+        """Test filtering the files by type."""
+        self.tab.filter_pdf.setChecked(True)
+        self.tab.filter_files()
         
-        # Check that the local file model was queried
-        self.mock_local_file_model.get_files_by_category.assert_called_once_with(1)
+        self.mock_local_file_model.get_files_page.assert_called_with(BATCH_SIZE, None, file_type="pdf")
+        self.assertEqual(model_column_texts(self.tab.files_model, 1), ["/downloads/file1.pdf"])
     
-    def test_search_files(self):
-        """Test the search_files method."""
-        # Set up the search box
-        self.tab.search_box.setText("file1")
+    def test_search_loaded_files(self):
+        """Test that a search filters the loaded files without a query."""
+        self.tab.search_files("BOOKS")
         
-        # Call the search_files method
-        self.tab.search_files()
-        
-        # Check that the local file model was queried
-        self.mock_local_file_model.search_files.assert_called_once_with("file1")
+        self.mock_local_file_model.search_files.assert_not_called()
+        self.assertEqual(model_column_texts(self.tab.files_proxy, 1), ["/downloads/books/book2.epub"])
     
-    def test_show_file_details(self):
-        """Test the show_file_details method."""
-        # Refresh the tab to populate the category tree
-        self.tab.refresh()
-        
-        # Select a category
-        self.tab.category_tree.setCurrentItem(self.tab.category_tree.topLevelItem(0))
+    def test_search_files_in_database(self):
+        """Test that the database is searched while files are left to load."""
+        self.mock_local_file_model.search_files.return_value = [_FILES[1]]
         
-        # Call the category_selected method to populate the file table
-        self.tab.category_selected()
+        with patch.object(self.tab.files_model, "canFetchMore", return_value=True):
+            self.tab.search_files("BOOKS")
         
-        # Select a file
-        self.tab.file_table.selectRow(0)
-        
-        # Mock the QMessageBox.information method
-        with patch('PyQt5.QtWidgets.QMessageBox.information') as mock_info:
-            # Call the show_file_details method
-            self.tab.show_file_details()
-            
-            # Check that the message box was shown
-            mock_info.assert_called_once()
+        self.mock_local_file_model.search_files.assert_called_once_with("BOOKS", None)
+        self.assertEqual(model_column_texts(self.tab.files_proxy, 1), ["/downloads/books/book2.epub"])
     
     def test_scan_directory(self):
-        """Test the scan_directory method."""
-        # Mock the DirectoryScanner class
-        with patch('src.core.directory_scanner.DirectoryScanner') as mock_scanner_class:
-            # Set up the mock scanner
-            mock_scanner = MagicMock()
-            mock_scanner_class.return_value = mock_scanner
-            mock_scanner.scan.return_value = [
-                {"path": "/downloads/file1.pdf", "name": "file1.pdf"},
-                {"path": "/downloads/file2.pdf", "name": "file2.pdf"}
-            ]
-            
-            # Call the scan_directory method
-            self.tab.scan_directory()
-            
-            # Check that the settings model was queried
-            self.mock_settings_model.get_setting.assert_called_once_with(
-                "download_dir",
-                default="/downloads"
-            )
-            
-            # Check that the scanner was created and used
-            mock_scanner_class.assert_called_once_with(
-                self.mock_local_file_model,
-                self.mock_category_model
-            )
-            mock_scanner.scan.assert_called_once_with("/downloads")
-            
-            # Check that the file table was refreshed
-            self.mock_local_file_model.get_all_files.assert_called()
+        """Test starting a directory scan."""
+        with patch("src.gui.local_library_tab.ScanThread") as mock_thread_class, \
+                patch("src.gui.local_library_tab.os.path.isdir", return_value=True):
+            self.tab.scan_directory("/downloads")
+        
+        # Check that a thread was started for the directory
+        mock_thread_class.assert_called_once_with("/downloads")
+        mock_thread_class.return_value.start.assert_called_once()
+        self.assertFalse(self.tab.scan_all_button.isEnabled())
+        self.assertTrue(self.tab.cancel_button.isEnabled())
     
-    def test_open_file(self):
-        """Test the open_file method."""
-        # Refresh the tab to populate the category tree
-        self.tab.refresh()
-        
-        # Select a category
-        self.tab.category_tree.setCurrentItem(self.tab.category_tree.topLevelItem(0))
-        
-        # Call the category_selected method to populate the file table
-        self.tab.category_selected()
-        
-        # Select a file
-        self.tab.file_table.selectRow(0)
-        
-        # Mock the QDesktopServices.openUrl method
-        with patch('PyQt5.QtGui.QDesktopServices.openUrl') as mock_open_url:
-            # Call the open_file method
-            self.tab.open_file()
-            
-            # Check that the file was opened
-            mock_open_url.assert_called_once()
+    def test_scan_directory_while_scanning(self):
+        """Test that a second scan is refused while one is running."""
+        with patch("src.gui.local_library_tab.ScanThread") as mock_thread_class, \
+                patch("src.gui.local_library_tab.os.path.isdir", return_value=True), \
+                patch("src.gui.local_library_tab.QMessageBox") as mock_message_box:
+            self.tab.scan_directory("/downloads")
+            self.tab.scan_directory("/downloads")
+        
+        # Check that only the first scan was started
+        mock_thread_class.assert_called_once_with("/downloads")
+        mock_message_box.warning.assert_called_once()
     
-    def test_assign_category(self):
-        """Test the assign_category method."""
-        # Refresh the tab to populate the category tree
-        self.tab.refresh()
-        
-        # Select a category
-        self.tab.category_tree.setCurrentItem(self.tab.category_tree.topLevelItem(0))
-        
-        # Call the category_selected method to populate the file table
-        self.tab.category_selected()
+    def test_on_scan_complete(self):
+        """Test handling the completion of a directory scan."""
+        result = {"cancelled": False, "success": True, "files_found": 2, "files_added": 1, "files_updated": 0}
+        
+        with patch("src.gui.local_library_tab.QMessageBox") as mock_message_box:
+            self.tab.on_scan_complete(result)
+        
+        # Check that the results were shown and the files refreshed
+        mock_message_box.information.assert_called_once()
+        self.assertEqual(self.tab.progress_label.text(), "Scan completed successfully")
+        self.assertEqual(self.tab.files_model.rowCount(), 2)
+        self.assertTrue(self.tab.scan_all_button.isEnabled())
+    
+    def test_clear_database(self):
+        """Test clearing the local files from the database."""
+        self.mock_local_file_model.delete_all_files.return_value = 2
         
-        # Select a file
-        self.tab.file_table.selectRow(0)
+        with patch("src.gui.local_library_tab.QMessageBox.question", return_value=QMessageBox.Yes), \
+                patch("src.gui.local_library_tab.QMessageBox.information") as mock_information:
+            self.tab.clear_database()
         
-        # Mock the QInputDialog.getItem method to return a category
-        with patch('PyQt5.QtWidgets.QInputDialog.getItem') as mock_getItem:
-            mock_getItem.return_value = ("Category 2", True)
-            
-            # Call the assign_category method
-            self.tab.assign_category()
-            
-            # Check that the file's category was updated
-            self.mock_local_file_model.update_category.assert_called_once_with(1, 2)
-            
-            # Check that the file table was refreshed
-            self.mock_local_file_model.get_files_by_category.assert_called()
+        # Check that the files were deleted
+        self.mock_local_file_model.delete_all_files.assert_called_once()
+        mock_information.assert_called_once()
 
 
 if __name__ == "__main__":
-    unittest.main()
\ No newline at end of file
+    unittest.main()
@@ -1,156 +1,120 @@
 import unittest
-from unittest.mock import patch, MagicMock
+from contextlib import ExitStack
+from unittest.mock import patch, Mock
 
-from PyQt5.QtWidgets import QApplication, QMainWindow
+from PyQt5.QtWidgets import QMainWindow, QWidget, QSystemTrayIcon
 from src.gui.main_window import MainWindow
+from tests.gui import GuiTestCase
 
 
-# Create a QApplication instance for testing
-app = QApplication.instance()
-if app is None:
-    app = QApplication([])
+# Tab attributes of the main window, the classes they are built from and
+# their labels, in tab order
+_TABS = (
+    ("site_management_tab", "SiteManagementTab", "Site Management"),
+    ("local_library_tab", "LocalLibraryTab", "Local Library"),
+    ("library_tab", "LibraryTab", "Remote Library"),
+    ("comparison_tab", "ComparisonTab", "File Comparison"),
+    ("download_queue_tab", "DownloadQueueTab", "Download Queue"),
+    ("download_history_tab", "DownloadHistoryTab", "Download History"),
+)
 
 
-class TestMainWindow(unittest.TestCase):
+class TestMainWindow(GuiTestCase):
     """Test case for the MainWindow class."""
     
-    def setUp(self):
-        """Set up test fixtures."""
-        # Mock the database and models
-        self.mock_db = MagicMock()
-        self.mock_site_model = MagicMock()
-        self.mock_category_model = MagicMock()
-        self.mock_remote_file_model = MagicMock()
-        self.mock_local_file_model = MagicMock()
-        self.mock_download_model = MagicMock()
-        self.mock_settings_model = MagicMock()
+    @classmethod
+    def setUpClass(cls):
+        """Set up fixtures shared by all tests."""
+        super().setUpClass()
         
-        # Mock the database connection
-        with patch('src.db.database.Database') as mock_db_class:
-            mock_db_class.return_value = self.mock_db
+        # Build plain widgets in place of the tabs, so that the window
+        # doesn't open the database or start the download manager
+        with ExitStack() as stack:
+            for _, class_name, _ in _TABS:
+                stack.enter_context(patch(f"src.gui.main_window.{class_name}", QWidget))
             
-            # Mock the models
-            with patch('src.db.site_model.SiteModel') as mock_site_model_class, \
-                 patch('src.db.category_model.CategoryModel') as mock_category_model_class, \
-                 patch('src.db.remote_file_model.RemoteFileModel') as mock_remote_file_model_class, \
-                 patch('src.db.local_file_model.LocalFileModel') as mock_local_file_model_class, \
-                 patch('src.db.download_model.DownloadModel') as mock_download_model_class, \
-                 patch('src.db.settings_model.SettingsModel') as mock_settings_model_class:
-                
-                mock_site_model_class.return_value = self.mock_site_model
-                mock_category_model_class.return_value = self.mock_category_model
-                mock_remote_file_model_class.return_value = self.mock_remote_file_model
-                mock_local_file_model_class.return_value = self.mock_local_file_model
-                mock_download_model_class.return_value = self.mock_download_model
-                mock_settings_model_class.return_value = self.mock_settings_model
-                
-                # Create the main window
-                self.window = MainWindow()
+            # Create the main window once for all tests
+            cls.window = MainWindow()
     
-    def tearDown(self):
-        """Clean up test fixtures."""
+    @classmethod
+    def tearDownClass(cls):
+        """Tear down fixtures shared by all tests."""
         # Close the main window
-        self.window.close()
+        cls.window.tray_icon.hide()
+        cls.window.close()
+        super().tearDownClass()
     
     def test_init(self):
         """Test the constructor."""
         # Check that the window was created
         self.assertIsInstance(self.window, QMainWindow)
+        self.assertEqual(self.window.windowTitle(), "PDF Downloader")
         
-        # Check that the window has a title
-        self.assertTrue(self.window.windowTitle())
+        # Check that the tabs were added in order
+        self.assertEqual(self.window.tab_widget.count(), len(_TABS))
+        for index, (attribute, _, label) in enumerate(_TABS):
+            with self.subTest(tab=attribute):
+                self.assertIs(self.window.tab_widget.widget(index), getattr(self.window, attribute))
+                self.assertEqual(self.window.tab_widget.tabText(index), label)
         
-        # Check that the tabs were created
-        self.assertIsNotNone(self.window.tabs)
-        
-        # Check that the database was connected
-        self.mock_db.connect.assert_called_once()
-    
-    def test_create_tabs(self):
-        """Test the create_tabs method."""
-        # Check that the tabs were created
-        self.assertIsNotNone(self.window.site_management_tab)
-        self.assertIsNotNone(self.window.local_library_tab)
-        self.assertIsNotNone(self.window.library_tab)
-        self.assertIsNotNone(self.window.comparison_tab)
-        self.assertIsNotNone(self.window.download_queue_tab)
-        self.assertIsNotNone(self.window.download_history_tab)
+        # Check that the status bar was created
+        self.assertEqual(self.window.status_bar.currentMessage(), "Ready")
     
-    def test_create_menu(self):
-        """Test the create_menu method."""
-        # Check that the menu bar was created
-        self.assertIsNotNone(self.window.menuBar())
+    def test_menu_bar(self):
+        """Test that the menus were created."""
+        menus = [action.text() for action in self.window.menuBar().actions()]
         
-        # Check that the file menu was created
-        file_menu = self.window.menuBar().findChild(QMenu, "fileMenu")
-        self.assertIsNotNone(file_menu)
-        
-        # Check that the settings menu was created
-        settings_menu = self.window.menuBar().findChild(QMenu, "settingsMenu")
-        self.assertIsNotNone(settings_menu)
+        self.assertEqual(menus, ["&File", "&Tools", "&Help"])
+    
+    def test_show_settings_dialog(self):
+        """Test opening the settings dialog."""
+        with patch("src.gui.main_window.SettingsDialog") as mock_dialog_class:
+            self.window.show_settings_dialog()
         
-        # Check that the help menu was created
-        help_menu = self.window.menuBar().findChild(QMenu, "helpMenu")
-        self.assertIsNotNone(help_menu)
+        # Check that the dialog was created for the window and shown
+        mock_dialog_class.assert_called_once_with(self.window)
+        mock_dialog_class.return_value.exec_.assert_called_once()
     
-    def test_create_status_bar(self):
-        """Test the create_status_bar method."""
-        # Check that the status bar was created
-        self.assertIsNotNone(self.window.statusBar())
+    def test_tray_icon_activated(self):
+        """Test that double-clicking the tray icon shows the window."""
+        with patch.object(self.window, "show") as mock_show, \
+                patch.object(self.window, "activateWindow") as mock_activate_window:
+            self.window.tray_icon_activated(QSystemTrayIcon.DoubleClick)
+        
+        mock_show.assert_called_once()
+        mock_activate_window.assert_called_once()
     
-    def test_open_settings(self):
-        """Test the open_settings method."""
-        # Mock the SettingsDialog class
-        with patch('src.gui.settings_dialog.SettingsDialog') as mock_settings_dialog_class:
-            # Set up the mock dialog
-            mock_dialog = MagicMock()
-            mock_settings_dialog_class.return_value = mock_dialog
-            
-            # Call the open_settings method
-            self.window.open_settings()
+    def test_show_download_notification(self):
+        """Test the notification for a completed download."""
+        with patch("src.db.remote_file_model.RemoteFileModel") as mock_model_class, \
+                patch.object(self.window.tray_icon, "showMessage") as mock_show_message:
+            mock_model_class.return_value.get_file_by_id.return_value = {"id": 1, "name": "file1.pdf"}
             
-            # Check that the dialog was created and executed
-            mock_settings_dialog_class.assert_called_once_with(
-                self.mock_settings_model,
-                self.window
-            )
-            mock_dialog.exec_.assert_called_once()
-    
-    def test_refresh_all_tabs(self):
-        """Test the refresh_all_tabs method."""
-        # Mock the tab refresh methods
-        self.window.site_management_tab.refresh = MagicMock()
-        self.window.local_library_tab.refresh = MagicMock()
-        self.window.library_tab.refresh = MagicMock()
-        self.window.comparison_tab.refresh = MagicMock()
-        self.window.download_queue_tab.refresh = MagicMock()
-        self.window.download_history_tab.refresh = MagicMock()
+            self.window.show_download_notification(1)
         
-        # Call the refresh_all_tabs method
-        self.window.refresh_all_tabs()
-        
-        # Check that all tab refresh methods were called
-        self.window.site_management_tab.refresh.assert_called_once()
-        self.window.local_library_tab.refresh.assert_called_once()
-        self.window.library_tab.refresh.assert_called_once()
-        self.window.comparison_tab.refresh.assert_called_once()
-        self.window.download_queue_tab.refresh.assert_called_once()
-        self.window.download_history_tab.refresh.assert_called_once()
+        # Check that the file was looked up and named in the message
+        mock_model_class.return_value.get_file_by_id.assert_called_once_with(1)
+        mock_show_message.assert_called_once_with(
+            "Download Completed",
+            "File 'file1.pdf' has been downloaded successfully.",
+            QSystemTrayIcon.Information,
+            5000
+        )
     
-    def test_closeEvent(self):
-        """Test the closeEvent method."""
-        # Create a mock close event
-        mock_event = MagicMock()
+    def test_close_event(self):
+        """Test that closing the window stops the download managers."""
+        for tab in (self.window.library_tab, self.window.download_queue_tab):
+            tab.download_manager = Mock()
+            self.addCleanup(delattr, tab, "download_manager")
+        mock_event = Mock()
         
-        # Call the closeEvent method
         self.window.closeEvent(mock_event)
         
-        # Check that the database was closed
-        self.mock_db.close.assert_called_once()
-        
-        # Check that the event was accepted
+        # Check that the download managers were stopped and the event accepted
+        self.window.library_tab.download_manager.stop.assert_called_once()
+        self.window.download_queue_tab.download_manager.stop.assert_called_once()
         mock_event.accept.assert_called_once()
 
 
 if __name__ == "__main__":
-    unittest.main()
\ No newline at end of file
+    unittest.main()
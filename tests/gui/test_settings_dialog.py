@@ -1,111 +1,125 @@
 import unittest
-from unittest.mock import patch, MagicMock
+from types import MappingProxyType
+from unittest.mock import patch
 
-from PyQt5.QtWidgets import QApplication, QDialog
+from PyQt5.QtWidgets import QDialog
 from src.gui.settings_dialog import SettingsDialog
+from tests.gui import GuiTestCase
 
 
-# Create a QApplication instance for testing
-app = QApplication.instance()
-if app is None:
-    app = QApplication([])
+# Settings in the configuration, by section and key; the dialog falls back
+# to its defaults for the others
+_SETTINGS = MappingProxyType({
+    ("network", "proxy_url"): "http://proxy.example.com:8080",
+    ("network", "timeout"): 60,
+    ("download", "concurrent_downloads"): 5,
+    ("file_types", "epub_enabled"): False,
+    ("appearance", "theme"): "dark",
+})
 
 
-class TestSettingsDialog(unittest.TestCase):
+# Form changes as the widget, its setter and the section, key and value
+# they should be saved as
+_CHANGES = (
+    ("proxy_url", "setText", "network", "proxy_url", "http://other.example.com:3128"),
+    ("timeout", "setValue", "network", "timeout", 90),
+    ("concurrent_downloads", "setValue", "download", "concurrent_downloads", 7),
+    ("epub_enabled", "setChecked", "file_types", "epub_enabled", True),
+)
+
+
+def _get_setting(section, key, default=None):
+    """Stand in for config.get, reading _SETTINGS."""
+    return _SETTINGS.get((section, key), default)
+
+
+class TestSettingsDialog(GuiTestCase):
     """Test case for the SettingsDialog class."""
     
-    def setUp(self):
-        """Set up test fixtures."""
-        # Create a mock settings model
-        self.mock_settings_model = MagicMock()
+    @classmethod
+    def setUpClass(cls):
+        """Set up fixtures shared by all tests."""
+        super().setUpClass()
         
-        # Set up the mock settings model to return settings
-        self.mock_settings_model.get_all_settings.return_value = {
-            "download_dir": "/downloads",
-            "max_downloads": 5,
-            "auto_validate": True,
-            "network_timeout": 30
-        }
+        # Patch the configuration for the whole class, since the dialog
+        # writes it back when saving
+        cls.config_patcher = patch("src.gui.settings_dialog.config")
+        cls.mock_config = cls.config_patcher.start()
+        cls.mock_config.get.side_effect = _get_setting
         
-        # Create the settings dialog
-        self.dialog = SettingsDialog(self.mock_settings_model)
+        # Create the settings dialog once for all tests
+        cls.dialog = SettingsDialog()
     
-    def tearDown(self):
-        """Clean up test fixtures."""
-        # Close the dialog
-        self.dialog.close()
+    @classmethod
+    def tearDownClass(cls):
+        """Tear down fixtures shared by all tests."""
+        # Close the dialog and stop patching the configuration
+        cls.dialog.close()
+        cls.config_patcher.stop()
+        super().tearDownClass()
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        # Show the configured settings again in place of the changes made by
+        # earlier tests, then forget the calls made so far
+        self.dialog.load_settings()
+        self.mock_config.reset_mock()
     
     def test_init(self):
         """Test the constructor."""
         # Check that the dialog was created
         self.assertIsInstance(self.dialog, QDialog)
+        self.assertEqual(self.dialog.windowTitle(), "Settings")
         
-        # Check that the dialog has a title
-        self.assertTrue(self.dialog.windowTitle())
-        
-        # Check that the settings model was saved
-        self.assertEqual(self.dialog.settings_model, self.mock_settings_model)
-        
-        # Check that the settings were loaded
-        self.mock_settings_model.get_all_settings.assert_called_once()
-    
-    def test_create_ui(self):
-        """Test the create_ui method."""
-        # Check that the form layout was created
-        self.assertIsNotNone(self.dialog.form_layout)
-        
-        # Check that the button box was created
-        self.assertIsNotNone(self.dialog.button_box)
+        # Check that the tabs were created
+        tabs = [self.dialog.tab_widget.tabText(index) for index in range(self.dialog.tab_widget.count())]
+        self.assertEqual(tabs, ["Network", "Download", "File Types", "Notifications", "Appearance"])
     
     def test_load_settings(self):
-        """Test the load_settings method."""
-        # Check that the settings were loaded into the form
-        self.assertEqual(self.dialog.download_dir_edit.text(), "/downloads")
-        self.assertEqual(self.dialog.max_downloads_spin.value(), 5)
-        self.assertEqual(self.dialog.auto_validate_check.isChecked(), True)
-        self.assertEqual(self.dialog.network_timeout_spin.value(), 30)
+        """Test that the settings are shown, with defaults for missing ones."""
+        self.assertEqual(self.dialog.proxy_url.text(), "http://proxy.example.com:8080")
+        self.assertEqual(self.dialog.timeout.value(), 60)
+        self.assertEqual(self.dialog.concurrent_downloads.value(), 5)
+        self.assertFalse(self.dialog.epub_enabled.isChecked())
+        self.assertTrue(self.dialog.pdf_enabled.isChecked())
+        self.assertEqual(self.dialog.theme.currentData(), "dark")
+        self.assertEqual(self.dialog.font_size.value(), 12)
     
     def test_save_settings(self):
-        """Test the save_settings method."""
-        # Change the settings in the form
-        self.dialog.download_dir_edit.setText("/new_downloads")
-        self.dialog.max_downloads_spin.setValue(10)
-        self.dialog.auto_validate_check.setChecked(False)
-        self.dialog.network_timeout_spin.setValue(60)
+        """Test that the form is written to the configuration."""
+        for attribute, setter, _, _, value in _CHANGES:
+            getattr(getattr(self.dialog, attribute), setter)(value)
         
-        # Call the save_settings method
         self.dialog.save_settings()
         
-        # Check that the settings were saved
-        self.mock_settings_model.set_setting.assert_any_call("download_dir", "/new_downloads")
-        self.mock_settings_model.set_setting.assert_any_call("max_downloads", 10)
-        self.mock_settings_model.set_setting.assert_any_call("auto_validate", False)
-        self.mock_settings_model.set_setting.assert_any_call("network_timeout", 60)
-    
-    def test_browse_download_dir(self):
-        """Test the browse_download_dir method."""
-        # Mock the QFileDialog.getExistingDirectory method
-        with patch('PyQt5.QtWidgets.QFileDialog.getExistingDirectory') as mock_get_dir:
-            # Set up the mock to return a directory
-            mock_get_dir.return_value = "/selected_dir"
-            
-            # Call the browse_download_dir method
-            self.dialog.browse_download_dir()
-            
-            # Check that the directory was set in the form
-            self.assertEqual(self.dialog.download_dir_edit.text(), "/selected_dir")
+        # Check that the changed settings were saved
+        for attribute, _, section, key, value in _CHANGES:
+            with self.subTest(setting=attribute):
+                self.mock_config.set.assert_any_call(section, key, value)
+        
+        # Check that an unchanged setting was saved as loaded
+        self.mock_config.set.assert_any_call("appearance", "theme", "dark")
     
     def test_accept(self):
-        """Test the accept method."""
-        # Mock the save_settings method
-        self.dialog.save_settings = MagicMock()
+        """Test that accepting the dialog saves the settings."""
+        with patch.object(self.dialog, "save_settings") as mock_save_settings:
+            self.dialog.accept()
         
-        # Call the accept method
-        self.dialog.accept()
+        mock_save_settings.assert_called_once()
+        self.assertEqual(self.dialog.result(), QDialog.Accepted)
+    
+    def test_reset_settings(self):
+        """Test resetting the settings to their defaults."""
+        with patch("src.gui.settings_dialog.QMessageBox") as mock_message_box, \
+                patch("src.db.settings_model.SettingsModel") as mock_settings_model_class:
+            mock_message_box.question.return_value = mock_message_box.Yes
+            
+            self.dialog.reset_settings()
         
-        # Check that the settings were saved
-        self.dialog.save_settings.assert_called_once()
+        # Check that the defaults were restored and shown
+        mock_settings_model_class.return_value.reset_to_defaults.assert_called_once()
+        mock_message_box.information.assert_called_once()
 
 
 if __name__ == "__main__":
-    unittest.main()
\ No newline at end of file
+    unittest.main()
@@ -1,205 +1,180 @@
 import unittest
-from unittest.mock import patch, MagicMock
+from types import MappingProxyType
+from unittest.mock import patch, Mock
 
-from PyQt5.QtWidgets import QApplication, QWidget
+from PyQt5.QtWidgets import QWidget
 from src.gui.site_management import SiteManagementTab
+from tests.gui import GuiTestCase, column_texts
 
 
-# Create a QApplication instance for testing
-app = QApplication.instance()
-if app is None:
-    app = QApplication([])
+# Sites in the database; shared read-only by the tests
+_SITES = (
+    MappingProxyType({
+        "id": 1, "name": "Site 1", "url": "http://example1.com",
+        "scraper_type": "generic", "last_scan_date": "2021-01-01 00:00:00"
+    }),
+    MappingProxyType({
+        "id": 2, "name": "Site 2", "url": "http://example2.com",
+        "scraper_type": "generic", "last_scan_date": None
+    }),
+)
 
 
-class TestSiteManagementTab(unittest.TestCase):
+class _FakeSiteModel:
+    """Stand in for SiteModel, recording the calls made by the tab."""
+    
+    def __init__(self):
+        self.get_all_sites = Mock(return_value=list(_SITES))
+        self.add_site = Mock()
+        self.update_site = Mock()
+        self.delete_site = Mock()
+    
+    def reset_mock(self):
+        """Forget the calls made so far, keeping the return values."""
+        for method in (self.get_all_sites, self.add_site, self.update_site, self.delete_site):
+            method.reset_mock()
+
+
+class _FakeScraperRegistry:
+    """Stand in for ScraperRegistry with two scraper types."""
+    
+    def get_available_scrapers(self):
+        return {"generic": object, "custom": object}
+
+
+class TestSiteManagementTab(GuiTestCase):
     """Test case for the SiteManagementTab class."""
     
-    def setUp(self):
-        """Set up test fixtures."""
-        # Create mock models
-        self.mock_site_model = MagicMock()
-        self.mock_remote_file_model = MagicMock()
-        
-        # Set up the mock site model to return sites
-        self.mock_site_model.get_all_sites.return_value = [
-            {
-                "id": 1,
-                "name": "Site 1",
-                "url": "http://example1.com",
-                "scraper_type": "generic",
-                "username": "user1",
-                "password": "pass1",
-                "last_scan": 1609459200
-            },
-            {
-                "id": 2,
-                "name": "Site 2",
-                "url": "http://example2.com",
-                "scraper_type": "generic",
-                "username": "user2",
-                "password": "pass2",
-                "last_scan": 1609459300
-            }
-        ]
-        
-        # Create the site management tab
-        self.tab = SiteManagementTab(self.mock_site_model, self.mock_remote_file_model)
+    @classmethod
+    def setUpClass(cls):
+        """Set up fixtures shared by all tests."""
+        super().setUpClass()
+        
+        # Build the fakes in place of the site model and the scraper registry
+        with patch("src.gui.site_management.SiteModel", _FakeSiteModel), \
+                patch("src.gui.site_management.ScraperRegistry", _FakeScraperRegistry):
+            # Create the site management tab once for all tests
+            cls.tab = SiteManagementTab()
+        
+        cls.mock_site_model = cls.tab.site_model
     
-    def tearDown(self):
-        """Clean up test fixtures."""
+    @classmethod
+    def tearDownClass(cls):
+        """Tear down fixtures shared by all tests."""
         # Close the tab
-        self.tab.close()
+        cls.tab.close()
+        super().tearDownClass()
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        # Undo the edits, selections and scans made by earlier tests
+        self.tab.clear_form()
+        self.tab.sites_table.clearSelection()
+        self.tab.scan_thread = None
+        self.tab.load_sites()
+        
+        # Forget the calls made so far, keeping the return values
+        self.mock_site_model.reset_mock()
     
     def test_init(self):
         """Test the constructor."""
         # Check that the tab was created
         self.assertIsInstance(self.tab, QWidget)
+        self.assertIsInstance(self.tab.site_model, _FakeSiteModel)
+        self.assertIsNone(self.tab.current_site_id)
         
-        # Check that the models were saved
-        self.assertEqual(self.tab.site_model, self.mock_site_model)
-        self.assertEqual(self.tab.remote_file_model, self.mock_remote_file_model)
+        # Check that the scraper types were loaded
+        scraper_types = [self.tab.scraper_type_combo.itemText(index) for index in range(self.tab.scraper_type_combo.count())]
+        self.assertEqual(scraper_types, ["generic", "custom"])
     
-    def test_create_ui(self):
-        """Test the create_ui method."""
-        # Check that the site list was created
-        self.assertIsNotNone(self.tab.site_list)
-        
-        # Check that the form was created
-        self.assertIsNotNone(self.tab.form_layout)
-        
-        # Check that the buttons were created
-        self.assertIsNotNone(self.tab.add_button)
-        self.assertIsNotNone(self.tab.edit_button)
-        self.assertIsNotNone(self.tab.delete_button)
-        self.assertIsNotNone(self.tab.scan_button)
-    
-    def test_refresh(self):
-        """Test the refresh method."""
-        # Call the refresh method
-        self.tab.refresh()
-        
-        # Check that the site model was queried
-        self.mock_site_model.get_all_sites.assert_called_once()
-        
-        # Check that the site list was populated
-        self.assertEqual(self.tab.site_list.count(), 2)
-        self.assertEqual(self.tab.site_list.item(0).text(), "Site 1")
-        self.assertEqual(self.tab.site_list.item(1).text(), "Site 2")
-    
-    def test_site_selected(self):
-        """Test the site_selected method."""
-        # Select a site
-        self.tab.site_list.setCurrentRow(0)
-        
-        # Call the site_selected method
-        self.tab.site_selected()
-        
-        # Check that the form was populated
-        self.assertEqual(self.tab.name_edit.text(), "Site 1")
-        self.assertEqual(self.tab.url_edit.text(), "http://example1.com")
-        self.assertEqual(self.tab.scraper_type_combo.currentText(), "generic")
-        self.assertEqual(self.tab.username_edit.text(), "user1")
-        self.assertEqual(self.tab.password_edit.text(), "pass1")
+    def test_load_sites(self):
+        """Test that the sites are shown in the table."""
+        self.assertEqual(column_texts(self.tab.sites_table, 1), ["Site 1", "Site 2"])
+        self.assertEqual(column_texts(self.tab.sites_table, 2), ["http://example1.com", "http://example2.com"])
+        self.assertEqual(column_texts(self.tab.sites_table, 4), ["2021-01-01 00:00:00", "Never"])
     
     def test_add_site(self):
-        """Test the add_site method."""
-        # Set up the form for a new site
-        self.tab.name_edit.setText("New Site")
-        self.tab.url_edit.setText("http://example.com")
-        self.tab.scraper_type_combo.setCurrentText("generic")
-        self.tab.username_edit.setText("user")
-        self.tab.password_edit.setText("pass")
-        
-        # Set up the mock site model to return a site ID
+        """Test adding a site from the form."""
+        self.tab.name_input.setText("New Site")
+        self.tab.url_input.setText("http://example.com")
         self.mock_site_model.add_site.return_value = 3
         
-        # Call the add_site method
-        self.tab.add_site()
-        
-        # Check that the site was added
-        self.mock_site_model.add_site.assert_called_once_with(
-            name="New Site",
-            url="http://example.com",
-            scraper_type="generic",
-            username="user",
-            password="pass"
-        )
+        with patch("src.gui.site_management.QMessageBox") as mock_message_box:
+            self.tab.add_site()
         
-        # Check that the site list was refreshed
-        self.mock_site_model.get_all_sites.assert_called()
+        # Check that the site was added and the form cleared
+        self.mock_site_model.add_site.assert_called_once_with("New Site", "http://example.com", "generic")
+        mock_message_box.information.assert_called_once()
+        self.assertEqual(self.tab.name_input.text(), "")
     
-    def test_edit_site(self):
-        """Test the edit_site method."""
-        # Select a site
-        self.tab.site_list.setCurrentRow(0)
-        self.tab.site_selected()
+    def test_add_site_with_invalid_url(self):
+        """Test that a URL without a scheme is refused."""
+        self.tab.name_input.setText("New Site")
+        self.tab.url_input.setText("example.com")
         
-        # Change the site details
-        self.tab.name_edit.setText("Updated Site")
-        self.tab.url_edit.setText("http://updated.com")
+        with patch("src.gui.site_management.QMessageBox") as mock_message_box:
+            self.tab.add_site()
         
-        # Call the edit_site method
+        self.mock_site_model.add_site.assert_not_called()
+        mock_message_box.warning.assert_called_once()
+    
+    def test_edit_and_update_site(self):
+        """Test editing the selected site."""
+        self.tab.sites_table.selectRow(0)
         self.tab.edit_site()
         
-        # Check that the site was updated
-        self.mock_site_model.update_site.assert_called_once_with(
-            site_id=1,
-            name="Updated Site",
-            url="http://updated.com",
-            scraper_type="generic",
-            username="user1",
-            password="pass1"
-        )
-        
-        # Check that the site list was refreshed
-        self.mock_site_model.get_all_sites.assert_called()
+        # Check that the site was loaded into the form
+        self.assertEqual(self.tab.name_input.text(), "Site 1")
+        self.assertEqual(self.tab.current_site_id, 1)
+        self.assertTrue(self.tab.update_button.isEnabled())
+        self.assertFalse(self.tab.add_button.isEnabled())
+        
+        # Save a new name
+        self.tab.name_input.setText("Updated Site")
+        self.mock_site_model.update_site.return_value = True
+        
+        with patch("src.gui.site_management.QMessageBox"):
+            self.tab.update_site()
+        
+        self.mock_site_model.update_site.assert_called_once_with(1, "Updated Site", "http://example1.com", "generic")
+        self.assertIsNone(self.tab.current_site_id)
     
-    def test_delete_site(self):
-        """Test the delete_site method."""
-        # Select a site
-        self.tab.site_list.setCurrentRow(0)
-        
-        # Mock the QMessageBox.question method to return Yes
-        with patch('PyQt5.QtWidgets.QMessageBox.question') as mock_question:
-            mock_question.return_value = QMessageBox.Yes
-            
-            # Call the delete_site method
-            self.tab.delete_site()
-            
-            # Check that the site was deleted
-            self.mock_site_model.delete_site.assert_called_once_with(1)
+    def test_remove_site(self):
+        """Test removing the selected site."""
+        self.tab.sites_table.selectRow(1)
+        self.mock_site_model.delete_site.return_value = True
+        
+        with patch("src.gui.site_management.QMessageBox") as mock_message_box:
+            mock_message_box.question.return_value = mock_message_box.Yes
             
-            # Check that the site list was refreshed
-            self.mock_site_model.get_all_sites.assert_called()
+            self.tab.remove_site()
+        
+        self.mock_site_model.delete_site.assert_called_once_with(2)
+        mock_message_box.information.assert_called_once()
     
     def test_scan_site(self):
-        """Test the scan_site method."""
-        # Select a site
-        self.tab.site_list.setCurrentRow(0)
-        
-        # Mock the SiteScanner class
-        with patch('src.core.site_scanner.SiteScanner') as mock_scanner_class:
-            # Set up the mock scanner
-            mock_scanner = MagicMock()
-            mock_scanner_class.return_value = mock_scanner
-            mock_scanner.scan.return_value = [
-                {"url": "http://example1.com/file1.pdf", "name": "file1.pdf"},
-                {"url": "http://example1.com/file2.pdf", "name": "file2.pdf"}
-            ]
-            
-            # Call the scan_site method
+        """Test starting a scan of the selected site."""
+        self.tab.sites_table.selectRow(0)
+        
+        with patch("src.gui.site_management.ScanThread") as mock_thread_class, \
+                patch("src.gui.site_management.QProgressDialog"):
             self.tab.scan_site()
-            
-            # Check that the scanner was created and used
-            mock_scanner_class.assert_called_once_with(
-                self.mock_site_model,
-                self.mock_remote_file_model
-            )
-            mock_scanner.scan.assert_called_once_with(1)
-            
-            # Check that the last scan time was updated
-            self.mock_site_model.update_last_scan.assert_called_once_with(1)
+        
+        # Check that a thread was started for the site
+        mock_thread_class.assert_called_once_with(1)
+        mock_thread_class.return_value.start.assert_called_once()
+    
+    def test_on_scan_complete(self):
+        """Test handling the completion of a site scan."""
+        result = {"success": True, "error": None, "categories": [{}], "files": [{}, {}]}
+        
+        with patch("src.gui.site_management.QMessageBox") as mock_message_box:
+            self.tab.on_scan_complete(result)
+        
+        # Check that the results were shown and the sites reloaded
+        mock_message_box.information.assert_called_once()
+        self.mock_site_model.get_all_sites.assert_called_once()
 
 
 if __name__ == "__main__":
-    unittest.main()
\ No newline at end of file
+    unittest.main()
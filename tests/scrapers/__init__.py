@@ -6,11 +6,19 @@ This module provides utilities for testing scrapers.
 import os
 import json
 import logging
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Any, List, Optional, Type
 from unittest.mock import MagicMock, patch
 
 from src.scrapers.base_scraper import BaseScraper
 
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
 
 logger = logging.getLogger(__name__)
 
@@ -18,6 +26,8 @@ logger = logging.getLogger(__name__)
 class MockResponse:
     """Mock response object for testing scrapers."""
     
+    __slots__ = ("text", "status_code", "headers")
+    
     def __init__(self, text: str, status_code: int = 200, headers: Optional[Dict[str, str]] = None):
         """Initialize the mock response.
         
@@ -37,6 +47,19 @@ class MockResponse:
             raise HTTPError(f"HTTP Error: {self.status_code}")
 
 
+def _read_html_file(file_path: str) -> str:
+    """Read an HTML fixture file.
+    
+    Args:
+        file_path: Path of the file
+        
+    Returns:
+        Contents of the file
+    """
+    with open(file_path, "rb") as f:
+        return f.read().decode("utf-8")
+
+
 class ScraperTester:
     """Utility for testing scrapers.
     
@@ -53,6 +76,15 @@ class ScraperTester:
         self.scraper_class = scraper_class
         self.base_url = base_url
         self.mock_responses = {}
+        
+        # Response for URLs without a mock response, and how often each of
+        # those URLs was requested in the current run
+        self.not_found_response = MockResponse("", 404)
+        self.missing_urls = Counter()
+        
+        # Session handed to the scraper; built once and reset before each run
+        self.mock_session = MagicMock()
+        self.mock_session.get.side_effect = self._mock_get
     
     def add_mock_response(self, url: str, html: str, status_code: int = 200, headers: Optional[Dict[str, str]] = None):
         """Add a mock response for a URL.
@@ -71,20 +103,25 @@ class ScraperTester:
         Args:
             directory: Directory containing HTML files
         """
-        for file in os.listdir(directory):
-            if file.endswith(".html"):
-                file_path = os.path.join(directory, file)
-                url = file.replace(".html", "")
+        with os.scandir(directory) as entries:
+            html_entries = [(entry.name, entry.path) for entry in entries if entry.name.endswith(".html")]
+        
+        if not html_entries:
+            return
+        
+        # File names that aren't URLs are joined with the base URL
+        prefix = self.base_url + "/"
+        
+        # Read the files in parallel threads, since the reads are I/O-bound
+        with ThreadPoolExecutor(max_workers=min(32, len(html_entries))) as executor:
+            pages = executor.map(_read_html_file, [path for _, path in html_entries])
+            
+            for (name, _), html in zip(html_entries, pages):
+                url = name[:-len(".html")]
                 
                 # If the file name is a URL, use it as is
-                if url.startswith("http"):
-                    pass
-                # Otherwise, join it with the base URL
-                else:
-                    url = f"{self.base_url}/{url}"
-                
-                with open(file_path, "r", encoding="utf-8") as f:
-                    html = f.read()
+                if not url.startswith("http"):
+                    url = prefix + url
                 
                 self.add_mock_response(url, html)
     
@@ -98,11 +135,12 @@ class ScraperTester:
         Returns:
             Mock response
         """
-        if url in self.mock_responses:
-            return self.mock_responses[url]
-        else:
-            logger.warning(f"No mock response for URL: {url}")
-            return MockResponse("", 404)
+        response = self.mock_responses.get(url)
+        if response is None:
+            self.missing_urls[url] += 1
+            return self.not_found_response
+        
+        return response
     
     def test_scraper(self) -> Dict[str, Any]:
         """Test the scraper with mock data.
@@ -117,12 +155,12 @@ class ScraperTester:
             "errors": []
         }
         
-        # Create a mock session
-        mock_session = MagicMock()
-        mock_session.get.side_effect = self._mock_get
+        # Forget the requests of earlier runs, keeping the mocked responses
+        self.mock_session.reset_mock()
+        self.missing_urls.clear()
         
         # Create the scraper with the mock session
-        with patch("requests.Session", return_value=mock_session):
+        with patch("requests.Session", return_value=self.mock_session):
             scraper = self.scraper_class(self.base_url)
             
             # Test get_categories
@@ -133,7 +171,8 @@ class ScraperTester:
                 logger.error(f"Error testing get_categories: {e}")
                 results["errors"].append(f"get_categories: {str(e)}")
             
-            # Test get_files_in_category for each category
+            # Test get_files_in_category for each category, one after another
+            # since the scraper's session and state aren't shared safely
             for category in results["categories"]:
                 category_id = category["id"]
                 try:
@@ -154,6 +193,13 @@ class ScraperTester:
                         logger.error(f"Error testing get_download_url for {file_id}: {e}")
                         results["errors"].append(f"get_download_url({file_id}): {str(e)}")
         
+        # Report the URLs without a mock response once, instead of per request
+        if self.missing_urls:
+            logger.warning(
+                f"No mock response for {len(self.missing_urls)} URLs: "
+                + ", ".join(f"{url} ({count}x)" for url, count in self.missing_urls.items())
+            )
+        
         return results
     
     def save_test_results(self, results: Dict[str, Any], output_file: str):
@@ -163,8 +209,15 @@ class ScraperTester:
             results: Test results
             output_file: Output file path
         """
-        with open(output_file, "w", encoding="utf-8") as f:
-            json.dump(results, f, indent=2)
+        if HAS_ORJSON:
+            # Category and file IDs may be integers, which orjson only accepts as keys with OPT_NON_STR_KEYS
+            data = orjson.dumps(results, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+        else:
+            # The same format as orjson's: indented by two spaces, in UTF-8
+            data = json.dumps(results, indent=2, ensure_ascii=False).encode("utf-8")
+        
+        with open(output_file, "wb") as f:
+            f.write(data)
         
         logger.info(f"Saved test results to {output_file}")
     
@@ -178,8 +231,10 @@ class ScraperTester:
         Returns:
             Test results
         """
-        with open(input_file, "r", encoding="utf-8") as f:
-            results = json.load(f)
+        with open(input_file, "rb") as f:
+            data = f.read()
+        
+        results = orjson.loads(data) if HAS_ORJSON else json.loads(data)
         
         logger.info(f"Loaded test results from {input_file}")
         return results
\ No newline at end of file
@@ -1,7 +1,23 @@
 import unittest
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch
+
+from requests.exceptions import HTTPError
 
 from src.scrapers.base_scraper import BaseScraper
+from tests.scrapers import MockResponse
+
+
+class TestScraper(BaseScraper):
+    """Concrete subclass of BaseScraper for testing."""
+    
+    def get_categories(self):
+        return [{"id": "books", "name": "Books"}]
+    
+    def get_files_in_category(self, category_id):
+        return [{"id": "file1", "name": "file1.pdf", "category_id": category_id}]
+    
+    def get_download_url(self, file_id):
+        return f"{self.base_url}/download/{file_id}"
 
 
 class TestBaseScraper(unittest.TestCase):
@@ -9,84 +25,51 @@ class TestBaseScraper(unittest.TestCase):
     
     def setUp(self):
         """Set up test fixtures."""
-        # Create a concrete subclass of BaseScraper for testing
-        class TestScraper(BaseScraper):
-            def __init__(self, site_url, username=None, password=None):
-                super().__init__(site_url, username, password)
-            
-            def scan(self):
-                return [{"url": "http://example.com/file.pdf", "name": "file.pdf"}]
-            
-            def get_file_details(self, file_url):
-                return {
-                    "url": file_url,
-                    "name": "file.pdf",
-                    "type": "pdf",
-                    "size": 1024,
-                    "category": "test"
-                }
-        
         # Create an instance of the test scraper
         self.scraper = TestScraper("http://example.com")
     
     def test_init(self):
         """Test the constructor."""
-        # Check that the site URL was set correctly
-        self.assertEqual(self.scraper.site_url, "http://example.com")
-        
-        # Check that the username and password are None by default
-        self.assertIsNone(self.scraper.username)
-        self.assertIsNone(self.scraper.password)
+        # Check that the base URL and the default user agent were set
+        self.assertEqual(self.scraper.base_url, "http://example.com")
+        self.assertEqual(self.scraper.user_agent, "PDF Downloader/1.0")
+        self.assertIsNone(self.scraper.proxy)
+        self.assertEqual(self.scraper.session.headers["User-Agent"], "PDF Downloader/1.0")
         
-        # Create a scraper with username and password
-        scraper = self.scraper.__class__("http://example.com", "user", "pass")
-        self.assertEqual(scraper.username, "user")
-        self.assertEqual(scraper.password, "pass")
+        # Create a scraper with a user agent and a proxy
+        proxy = {"http": "http://proxy.example.com:8080"}
+        scraper = TestScraper("http://example.com", "Test Agent", proxy)
+        self.assertEqual(scraper.session.headers["User-Agent"], "Test Agent")
+        self.assertEqual(scraper.session.proxies["http"], "http://proxy.example.com:8080")
     
-    def test_scan(self):
-        """Test the scan method."""
-        # Call the scan method
-        files = self.scraper.scan()
+    def test_get_page(self):
+        """Test fetching and parsing a page."""
+        response = MockResponse("<html><title>Test Page</title></html>")
         
-        # Check the result
-        self.assertEqual(len(files), 1)
-        self.assertEqual(files[0]["url"], "http://example.com/file.pdf")
-        self.assertEqual(files[0]["name"], "file.pdf")
-    
-    def test_get_file_details(self):
-        """Test the get_file_details method."""
-        # Call the get_file_details method
-        details = self.scraper.get_file_details("http://example.com/file.pdf")
+        with patch.object(self.scraper.session, "get", return_value=response) as mock_get:
+            soup = self.scraper.get_page("http://example.com/page")
         
-        # Check the result
-        self.assertEqual(details["url"], "http://example.com/file.pdf")
-        self.assertEqual(details["name"], "file.pdf")
-        self.assertEqual(details["type"], "pdf")
-        self.assertEqual(details["size"], 1024)
-        self.assertEqual(details["category"], "test")
+        # Check that the page was fetched and parsed
+        mock_get.assert_called_once_with("http://example.com/page")
+        self.assertEqual(soup.title.string, "Test Page")
     
-    def test_login(self):
-        """Test the login method."""
-        # The base login method should do nothing
-        self.scraper.login()
+    def test_get_page_error(self):
+        """Test that an error status is raised."""
+        with patch.object(self.scraper.session, "get", return_value=MockResponse("", 404)):
+            with self.assertRaises(HTTPError):
+                self.scraper.get_page("http://example.com/missing")
     
-    def test_logout(self):
-        """Test the logout method."""
-        # The base logout method should do nothing
-        self.scraper.logout()
+    def test_scraper_methods(self):
+        """Test the methods implemented by the subclass."""
+        self.assertEqual(self.scraper.get_categories()[0]["id"], "books")
+        self.assertEqual(self.scraper.get_files_in_category("books")[0]["category_id"], "books")
+        self.assertEqual(self.scraper.get_download_url("file1"), "http://example.com/download/file1")
     
     def test_abstract_methods(self):
-        """Test that abstract methods raise NotImplementedError."""
-        # Create an instance of BaseScraper directly
-        scraper = BaseScraper("http://example.com")
-        
-        # Check that the abstract methods raise NotImplementedError
-        with self.assertRaises(NotImplementedError):
-            scraper.scan()
-        
-        with self.assertRaises(NotImplementedError):
-            scraper.get_file_details("http://example.com/file.pdf")
+        """Test that BaseScraper can't be created without the abstract methods."""
+        with self.assertRaises(TypeError):
+            BaseScraper("http://example.com")
 
 
 if __name__ == "__main__":
-    unittest.main()
\ No newline at end of file
+    unittest.main()
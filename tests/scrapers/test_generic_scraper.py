@@ -1,236 +1,113 @@
 import unittest
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch
 
 from src.scrapers.generic_scraper import GenericScraper
+from tests.scrapers import ScraperTester
+
+
+# Pages of the site, by URL; registered once with the tester for all tests
+_PAGES = {
+    "http://example.com": """
+        <html>
+            <body>
+                <a href="file1.pdf">File 1</a>
+                <a href="file2.epub">File 2</a>
+                <a href="file3.txt"></a>
+                <a href="image.png">Image</a>
+                <a href="https://another-site.com/file4.pdf">File 4</a>
+                <a href="subdir/">Subdir</a>
+            </body>
+        </html>
+    """,
+    "http://example.com/subdir/": """
+        <html>
+            <body>
+                <a href="file2.pdf">File 2</a>
+            </body>
+        </html>
+    """,
+}
 
 
 class TestGenericScraper(unittest.TestCase):
     """Test case for the GenericScraper class."""
     
+    @classmethod
+    def setUpClass(cls):
+        """Set up fixtures shared by all tests."""
+        # Serve the pages from the tester's mock session
+        cls.tester = ScraperTester(GenericScraper)
+        for url, html in _PAGES.items():
+            cls.tester.add_mock_response(url, html)
+        
+        # Create the generic scraper once with the mock session, and a fixed
+        # set of supported extensions rather than the discovered plugins
+        with patch("requests.Session", return_value=cls.tester.mock_session), \
+                patch("src.scrapers.generic_scraper.FileValidator") as mock_validator_class:
+            mock_validator_class.return_value.get_supported_extensions.return_value = [".pdf", ".epub", ".txt"]
+            cls.scraper = GenericScraper("http://example.com")
+    
     def setUp(self):
         """Set up test fixtures."""
-        # Create an instance of the generic scraper
-        self.scraper = GenericScraper("http://example.com")
+        # Forget the requests made by earlier tests
+        self.tester.mock_session.reset_mock()
     
     def test_init(self):
         """Test the constructor."""
-        # Check that the site URL was set correctly
-        self.assertEqual(self.scraper.site_url, "http://example.com")
-        
-        # Check that the username and password are None by default
-        self.assertIsNone(self.scraper.username)
-        self.assertIsNone(self.scraper.password)
-        
-        # Create a scraper with username and password
-        scraper = GenericScraper("http://example.com", "user", "pass")
-        self.assertEqual(scraper.username, "user")
-        self.assertEqual(scraper.password, "pass")
-    
-    def test_scan(self):
-        """Test the scan method."""
-        # Mock the requests.get function
-        with patch('requests.get') as mock_get:
-            # Set up the mock response
-            mock_response = MagicMock()
-            mock_response.status_code = 200
-            mock_response.text = """
-            <html>
-                <body>
-                    <a href="file1.pdf">File 1</a>
-                    <a href="file2.pdf">File 2</a>
-                    <a href="file3.txt">File 3</a>
-                    <a href="http://example.com/file4.pdf">File 4</a>
-                    <a href="https://another-site.com/file5.pdf">File 5</a>
-                </body>
-            </html>
-            """
-            mock_get.return_value = mock_response
-            
-            # Call the scan method
-            files = self.scraper.scan()
-            
-            # Check the result
-            self.assertEqual(len(files), 4)  # 3 PDF files + 1 TXT file
-            
-            # Check that the URLs are correctly formed
-            urls = [file["url"] for file in files]
-            self.assertIn("http://example.com/file1.pdf", urls)
-            self.assertIn("http://example.com/file2.pdf", urls)
-            self.assertIn("http://example.com/file3.txt", urls)
-            self.assertIn("http://example.com/file4.pdf", urls)
-            
-            # Check that the external URL is not included
-            self.assertNotIn("https://another-site.com/file5.pdf", urls)
+        self.assertEqual(self.scraper.base_url, "http://example.com")
+        self.assertEqual(self.scraper.supported_extensions, [".pdf", ".epub", ".txt"])
     
-    def test_scan_with_extensions(self):
-        """Test the scan method with specific extensions."""
-        # Mock the requests.get function
-        with patch('requests.get') as mock_get:
-            # Set up the mock response
-            mock_response = MagicMock()
-            mock_response.status_code = 200
-            mock_response.text = """
-            <html>
-                <body>
-                    <a href="file1.pdf">File 1</a>
-                    <a href="file2.pdf">File 2</a>
-                    <a href="file3.txt">File 3</a>
-                    <a href="file4.epub">File 4</a>
-                </body>
-            </html>
-            """
-            mock_get.return_value = mock_response
-            
-            # Call the scan method with specific extensions
-            files = self.scraper.scan(extensions=[".pdf"])
-            
-            # Check the result
-            self.assertEqual(len(files), 2)  # Only PDF files
-            
-            # Check that only PDF files are included
-            urls = [file["url"] for file in files]
-            self.assertIn("http://example.com/file1.pdf", urls)
-            self.assertIn("http://example.com/file2.pdf", urls)
-            self.assertNotIn("http://example.com/file3.txt", urls)
-            self.assertNotIn("http://example.com/file4.epub", urls)
-    
-    def test_scan_with_recursive(self):
-        """Test the scan method with recursive scanning."""
-        # Mock the requests.get function
-        with patch('requests.get') as mock_get:
-            # Set up the mock responses
-            main_response = MagicMock()
-            main_response.status_code = 200
-            main_response.text = """
-            <html>
-                <body>
-                    <a href="file1.pdf">File 1</a>
-                    <a href="subdir/">Subdir</a>
-                </body>
-            </html>
-            """
-            
-            subdir_response = MagicMock()
-            subdir_response.status_code = 200
-            subdir_response.text = """
-            <html>
-                <body>
-                    <a href="file2.pdf">File 2</a>
-                </body>
-            </html>
-            """
-            
-            # Set up the mock to return different responses for different URLs
-            def get_response(url, **kwargs):
-                if url == "http://example.com":
-                    return main_response
-                elif url == "http://example.com/subdir/":
-                    return subdir_response
-                else:
-                    raise ValueError(f"Unexpected URL: {url}")
-            
-            mock_get.side_effect = get_response
-            
-            # Call the scan method with recursive scanning
-            files = self.scraper.scan(recursive=True)
-            
-            # Check the result
-            self.assertEqual(len(files), 2)  # 1 file in main dir + 1 file in subdir
-            
-            # Check that files from both directories are included
-            urls = [file["url"] for file in files]
-            self.assertIn("http://example.com/file1.pdf", urls)
-            self.assertIn("http://example.com/subdir/file2.pdf", urls)
+    def test_get_categories(self):
+        """Test that the site is one default category."""
+        categories = self.scraper.get_categories()
+        
+        self.assertEqual(len(categories), 1)
+        self.assertEqual(categories[0]["id"], "default")
+        self.assertEqual(categories[0]["url"], "http://example.com")
     
-    def test_get_file_details(self):
-        """Test the get_file_details method."""
-        # Mock the requests.head function
-        with patch('requests.head') as mock_head:
-            # Set up the mock response
-            mock_response = MagicMock()
-            mock_response.status_code = 200
-            mock_response.headers = {
-                "Content-Length": "1024",
-                "Content-Type": "application/pdf"
-            }
-            mock_head.return_value = mock_response
-            
-            # Call the get_file_details method
-            details = self.scraper.get_file_details("http://example.com/file.pdf")
-            
-            # Check the result
-            self.assertEqual(details["url"], "http://example.com/file.pdf")
-            self.assertEqual(details["name"], "file.pdf")
-            self.assertEqual(details["type"], "pdf")
-            self.assertEqual(details["size"], 1024)
-            self.assertEqual(details["category"], "")  # No category for generic scraper
+    def test_get_files_in_category(self):
+        """Test finding the links to supported files on the site."""
+        files = self.scraper.get_files_in_category("default")
+        
+        # Check that the base URL was fetched
+        self.tester.mock_session.get.assert_called_once_with("http://example.com")
+        
+        # Check the result
+        urls = [file["url"] for file in files]
+        self.assertEqual(urls, [
+            "http://example.com/file1.pdf",
+            "http://example.com/file2.epub",
+            "http://example.com/file3.txt",
+            "https://another-site.com/file4.pdf",
+        ])
+        self.assertEqual([file["file_type"] for file in files], ["pdf", "epub", "txt", "pdf"])
+        
+        # The name comes from the link text, or the URL if there is none
+        self.assertEqual(files[0]["name"], "File 1")
+        self.assertEqual(files[2]["name"], "file3.txt")
+        self.assertEqual(files[0]["category_id"], "default")
     
-    def test_get_file_details_with_category(self):
-        """Test the get_file_details method with a category."""
-        # Mock the requests.head function
-        with patch('requests.head') as mock_head:
-            # Set up the mock response
-            mock_response = MagicMock()
-            mock_response.status_code = 200
-            mock_response.headers = {
-                "Content-Length": "1024",
-                "Content-Type": "application/pdf"
-            }
-            mock_head.return_value = mock_response
-            
-            # Call the get_file_details method with a category
-            details = self.scraper.get_file_details(
-                "http://example.com/category/file.pdf",
-                category="category"
-            )
-            
-            # Check the result
-            self.assertEqual(details["url"], "http://example.com/category/file.pdf")
-            self.assertEqual(details["name"], "file.pdf")
-            self.assertEqual(details["type"], "pdf")
-            self.assertEqual(details["size"], 1024)
-            self.assertEqual(details["category"], "category")
+    def test_get_files_in_category_url(self):
+        """Test that other categories are fetched from their URL."""
+        files = self.scraper.get_files_in_category("http://example.com/subdir/")
+        
+        # Check that the links are relative to the category URL
+        self.tester.mock_session.get.assert_called_once_with("http://example.com/subdir/")
+        self.assertEqual([file["url"] for file in files], ["http://example.com/subdir/file2.pdf"])
     
-    def test_login(self):
-        """Test the login method."""
-        # Mock the requests.post function
-        with patch('requests.post') as mock_post:
-            # Set up the mock response
-            mock_response = MagicMock()
-            mock_response.status_code = 200
-            mock_post.return_value = mock_response
-            
-            # Create a scraper with username and password
-            scraper = GenericScraper("http://example.com", "user", "pass")
-            
-            # Call the login method
-            scraper.login()
-            
-            # Check that requests.post was called with the correct arguments
-            mock_post.assert_called_once_with(
-                "http://example.com/login",
-                data={"username": "user", "password": "pass"},
-                headers=unittest.mock.ANY
-            )
+    def test_get_files_in_category_error(self):
+        """Test that a failed request gives no files."""
+        files = self.scraper.get_files_in_category("http://example.com/missing/")
+        
+        self.assertEqual(files, [])
     
-    def test_logout(self):
-        """Test the logout method."""
-        # Mock the requests.get function
-        with patch('requests.get') as mock_get:
-            # Set up the mock response
-            mock_response = MagicMock()
-            mock_response.status_code = 200
-            mock_get.return_value = mock_response
-            
-            # Call the logout method
-            self.scraper.logout()
-            
-            # Check that requests.get was called with the correct arguments
-            mock_get.assert_called_once_with(
-                "http://example.com/logout",
-                headers=unittest.mock.ANY
-            )
+    def test_get_download_url(self):
+        """Test that the file ID is the download URL."""
+        self.assertEqual(
+            self.scraper.get_download_url("http://example.com/file1.pdf"),
+            "http://example.com/file1.pdf"
+        )
 
 
 if __name__ == "__main__":
-    unittest.main()
\ No newline at end of file
+    unittest.main()
@@ -1,133 +1,115 @@
 import unittest
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch
 
-from src.scrapers.registry import ScraperRegistry
+from src.plugins.scrapers import scraper_plugin_manager
+from src.scrapers.registry import ScraperRegistry, load_scrapers, register_builtin_scrapers
 from src.scrapers.base_scraper import BaseScraper
 from src.scrapers.generic_scraper import GenericScraper
 
 
+class TestScraper(BaseScraper):
+    """Concrete subclass of BaseScraper for testing."""
+    
+    def get_categories(self):
+        return []
+    
+    def get_files_in_category(self, category_id):
+        return []
+    
+    def get_download_url(self, file_id):
+        return file_id
+
+
 class TestScraperRegistry(unittest.TestCase):
     """Test case for the ScraperRegistry class."""
     
+    @classmethod
+    def setUpClass(cls):
+        """Set up fixtures shared by all tests."""
+        # Get the registry once for all tests
+        cls.registry = ScraperRegistry()
+    
     def setUp(self):
         """Set up test fixtures."""
-        # Create a test scraper class
-        class TestScraper(BaseScraper):
-            def scan(self):
-                return []
-            
-            def get_file_details(self, file_url):
-                return {}
-        
-        # Save the test scraper class
-        self.TestScraper = TestScraper
-        
-        # Create a registry
-        self.registry = ScraperRegistry()
+        # The registry and the plugin manager are shared by the whole
+        # application, so start each test with both empty and restore them after
+        for scrapers in (self.registry._scrapers, scraper_plugin_manager.plugins):
+            patcher = patch.dict(scrapers, clear=True)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+    
+    def test_singleton(self):
+        """Test that the registry is created once."""
+        self.assertIs(ScraperRegistry(), self.registry)
     
     def test_register_scraper(self):
         """Test registering a scraper."""
-        # Register the test scraper
-        self.registry.register_scraper("test", self.TestScraper)
+        self.registry.register_scraper("test", TestScraper)
         
-        # Check that the scraper was registered
-        self.assertIn("test", self.registry.scrapers)
-        self.assertEqual(self.registry.scrapers["test"], self.TestScraper)
+        # Check that the scraper was registered here and with the plugin manager
+        self.assertIs(self.registry.get_scraper_class("test"), TestScraper)
+        self.assertIs(scraper_plugin_manager.get_plugin("test"), TestScraper)
     
-    def test_get_scraper(self):
-        """Test getting a scraper."""
-        # Register the test scraper
-        self.registry.register_scraper("test", self.TestScraper)
+    def test_register_invalid_scraper(self):
+        """Test that a class that isn't a scraper is refused."""
+        with self.assertRaises(TypeError):
+            self.registry.register_scraper("test", object)
         
-        # Get the scraper
-        scraper_class = self.registry.get_scraper("test")
-        
-        # Check that the correct scraper was returned
-        self.assertEqual(scraper_class, self.TestScraper)
+        self.assertIsNone(self.registry.get_scraper_class("test"))
     
-    def test_get_scraper_not_found(self):
-        """Test getting a scraper that doesn't exist."""
-        # Try to get a scraper that doesn't exist
-        scraper_class = self.registry.get_scraper("nonexistent")
+    def test_get_scraper_class(self):
+        """Test looking up scraper classes."""
+        # A plugin registered only with the plugin manager is found as well
+        scraper_plugin_manager.register_plugin("plugin", GenericScraper)
         
-        # Check that the generic scraper was returned
-        self.assertEqual(scraper_class, GenericScraper)
+        self.assertIs(self.registry.get_scraper_class("plugin"), GenericScraper)
+        self.assertIsNone(self.registry.get_scraper_class("nonexistent"))
     
-    def test_get_scraper_instance(self):
-        """Test getting a scraper instance."""
-        # Register the test scraper
-        self.registry.register_scraper("test", self.TestScraper)
+    def test_create_scraper(self):
+        """Test creating a scraper for a URL."""
+        self.registry.register_scraper("test", TestScraper)
         
-        # Get a scraper instance
-        scraper = self.registry.get_scraper_instance(
-            "test",
-            "http://example.com",
-            "user",
-            "pass"
-        )
+        scraper = self.registry.create_scraper("test", "http://example.com", user_agent="Test Agent")
         
-        # Check that the correct scraper was returned
-        self.assertIsInstance(scraper, self.TestScraper)
-        self.assertEqual(scraper.site_url, "http://example.com")
-        self.assertEqual(scraper.username, "user")
-        self.assertEqual(scraper.password, "pass")
+        # Check that the scraper was created with the arguments
+        self.assertIsInstance(scraper, TestScraper)
+        self.assertEqual(scraper.base_url, "http://example.com")
+        self.assertEqual(scraper.user_agent, "Test Agent")
+    
+    def test_create_scraper_not_found(self):
+        """Test that no scraper is created for an unknown type."""
+        self.assertIsNone(self.registry.create_scraper("nonexistent", "http://example.com"))
     
-    def test_get_scraper_instance_not_found(self):
-        """Test getting a scraper instance for a scraper that doesn't exist."""
-        # Try to get a scraper instance for a scraper that doesn't exist
-        scraper = self.registry.get_scraper_instance(
-            "nonexistent",
-            "http://example.com"
-        )
+    def test_create_scraper_error(self):
+        """Test that no scraper is created if its constructor fails."""
+        self.registry.register_scraper("test", TestScraper)
         
-        # Check that a generic scraper was returned
-        self.assertIsInstance(scraper, GenericScraper)
-        self.assertEqual(scraper.site_url, "http://example.com")
+        self.assertIsNone(self.registry.create_scraper("test", "http://example.com", unknown=True))
     
     def test_get_available_scrapers(self):
         """Test getting the available scrapers."""
-        # Register some scrapers
-        self.registry.register_scraper("test1", self.TestScraper)
-        self.registry.register_scraper("test2", self.TestScraper)
+        self.registry.register_scraper("test", TestScraper)
+        scraper_plugin_manager.register_plugin("plugin", GenericScraper)
         
-        # Get the available scrapers
         scrapers = self.registry.get_available_scrapers()
         
-        # Check the result
-        self.assertIn("test1", scrapers)
-        self.assertIn("test2", scrapers)
-        self.assertEqual(len(scrapers), 2)
+        self.assertEqual(scrapers, {"test": TestScraper, "plugin": GenericScraper})
     
     def test_load_scrapers(self):
-        """Test loading scrapers from plugins."""
-        # Mock the importlib.import_module function
-        with patch('importlib.import_module') as mock_import_module:
-            # Set up the mock module
-            mock_module = MagicMock()
-            mock_module.register_scrapers = MagicMock()
-            mock_import_module.return_value = mock_module
-            
-            # Mock the os.listdir function
-            with patch('os.listdir') as mock_listdir:
-                # Set up the mock directory listing
-                mock_listdir.return_value = ["test_scraper.py"]
-                
-                # Mock the os.path.isfile function
-                with patch('os.path.isfile') as mock_isfile:
-                    # Set up the mock file check
-                    mock_isfile.return_value = True
-                    
-                    # Call the load_scrapers method
-                    self.registry.load_scrapers()
-                    
-                    # Check that the module was imported
-                    mock_import_module.assert_called_once_with(
-                        "src.plugins.scrapers.test_scraper"
-                    )
-                    
-                    # Check that register_scrapers was called
-                    mock_module.register_scrapers.assert_called_once_with(self.registry)
+        """Test loading the scrapers in the scrapers package."""
+        with patch.object(scraper_plugin_manager, "discover_plugins") as mock_discover_plugins:
+            load_scrapers()
+        
+        # Check that the generic scraper was found and the plugins discovered
+        self.assertIs(self.registry.get_scraper_class("generic"), GenericScraper)
+        mock_discover_plugins.assert_called_once()
+    
+    def test_register_builtin_scrapers(self):
+        """Test registering the built-in scrapers."""
+        register_builtin_scrapers()
+        
+        self.assertEqual(self.registry.get_available_scrapers(), {"generic": GenericScraper})
 
 
 if __name__ == "__main__":
-    unittest.main()
\ No newline at end of file
+    unittest.main()
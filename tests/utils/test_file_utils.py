@@ -2,38 +2,65 @@ import os
 import unittest
 import tempfile
 from pathlib import Path
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch, MagicMock, mock_open
 
 from src.utils import file_utils
 
 
+def _write_file(path, data):
+    """Write bytes to a test file with one unbuffered write."""
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        os.write(fd, data)
+    finally:
+        os.close(fd)
+
+
 class TestFileUtils(unittest.TestCase):
     """Test case for the file_utils module."""
     
-    def setUp(self):
-        """Set up test fixtures."""
-        # Create a temporary directory for test files
-        self.temp_dir = tempfile.TemporaryDirectory()
-        self.test_dir = Path(self.temp_dir.name)
+    @classmethod
+    def setUpClass(cls):
+        """Set up fixtures shared by all tests."""
+        # Create a directory tree that the tests only read, once for all tests
+        cls.fixture_temp_dir = tempfile.TemporaryDirectory()
+        cls.fixture_dir = Path(cls.fixture_temp_dir.name)
         
         # Create a test file
-        self.test_file = self.test_dir / "test.txt"
-        with open(self.test_file, "w") as f:
-            f.write("Test content")
+        cls.test_file = cls.fixture_dir / "test.txt"
+        _write_file(cls.test_file, b"Test content")
         
         # Create a test PDF file
-        self.pdf_file = self.test_dir / "test.pdf"
-        with open(self.pdf_file, "w") as f:
-            f.write("%PDF-1.5\nFake PDF content")
+        cls.pdf_file = cls.fixture_dir / "test.pdf"
+        _write_file(cls.pdf_file, b"%PDF-1.5\nFake PDF content")
         
         # Create a test EPUB file
-        self.epub_file = self.test_dir / "test.epub"
-        with open(self.epub_file, "w") as f:
-            f.write("Fake EPUB content")
+        cls.epub_file = cls.fixture_dir / "test.epub"
+        _write_file(cls.epub_file, b"Fake EPUB content")
+        
+        # Create a category directory with a PDF and a text file
+        category_dir = cls.fixture_dir / "category1"
+        category_dir.mkdir()
+        _write_file(category_dir / "test.pdf", b"%PDF-1.5\nFake PDF content")
+        _write_file(category_dir / "test.txt", b"Text content")
+    
+    @classmethod
+    def tearDownClass(cls):
+        """Tear down fixtures shared by all tests."""
+        cls.fixture_temp_dir.cleanup()
     
-    def tearDown(self):
-        """Clean up test fixtures."""
-        self.temp_dir.cleanup()
+    def create_test_dir(self):
+        """Create an empty temporary directory for the files a test writes.
+        
+        Only the tests that write files call this, so the others touch no
+        disk. The directory is removed when the test ends.
+        
+        Returns:
+            Path of the directory
+        """
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        return Path(temp_dir.name)
     
     def test_get_file_extension(self):
         """Test the get_file_extension function."""
@@ -67,26 +94,50 @@ class TestFileUtils(unittest.TestCase):
     
     def test_is_valid_pdf(self):
         """Test the is_valid_pdf function."""
-        # Test with a valid PDF file
-        self.assertTrue(file_utils.is_valid_pdf(str(self.pdf_file)))
+        # Stand in for the file and PyPDF2, so that only the checks around
+        # them run
+        with patch("src.utils.file_utils.open", mock_open(read_data=b"%PDF-1.5\n"), create=True), \
+                patch("src.utils.file_utils.PyPDF2", create=True) as mock_pypdf2, \
+                patch("src.utils.file_utils.HAS_PYPDF2", True):
+            mock_pypdf2.PdfReader.return_value.pages = [MagicMock()]
+            
+            # Test with a valid PDF file
+            self.assertEqual(file_utils.is_valid_pdf(str(self.pdf_file)), (True, None))
+            
+            # Test with a PDF file that PyPDF2 can't read
+            mock_pypdf2.PdfReader.side_effect = Exception("EOF marker not found")
+            self.assertEqual(
+                file_utils.is_valid_pdf(str(self.pdf_file)),
+                (False, "Invalid PDF file: EOF marker not found")
+            )
         
         # Test with a non-PDF file
-        self.assertFalse(file_utils.is_valid_pdf(str(self.test_file)))
+        self.assertEqual(
+            file_utils.is_valid_pdf(str(self.test_file)),
+            (False, "File does not have a PDF extension")
+        )
     
     def test_is_valid_epub(self):
         """Test the is_valid_epub function."""
-        # Mock the epub.read_epub function
-        with patch('ebooklib.epub.read_epub') as mock_read_epub:
+        # Stand in for the epub module where file_utils looks it up, so that
+        # ebooklib isn't imported or run
+        with patch("src.utils.file_utils.epub", create=True) as mock_epub, \
+                patch("src.utils.file_utils.HAS_EBOOKLIB", True):
             # Test with a valid EPUB file
-            mock_read_epub.return_value = MagicMock()
-            self.assertTrue(file_utils.is_valid_epub(str(self.epub_file)))
+            self.assertEqual(file_utils.is_valid_epub(str(self.epub_file)), (True, None))
+            mock_epub.read_epub.assert_called_once_with(str(self.epub_file))
             
             # Test with an invalid EPUB file
-            mock_read_epub.side_effect = Exception("Invalid EPUB")
-            self.assertFalse(file_utils.is_valid_epub(str(self.epub_file)))
+            mock_epub.read_epub.side_effect = Exception("Invalid EPUB")
+            self.assertEqual(
+                file_utils.is_valid_epub(str(self.epub_file)),
+                (False, "Invalid EPUB file: Invalid EPUB")
+            )
     
     def test_get_file_hash(self):
         """Test the get_file_hash function."""
+        test_dir = self.create_test_dir()
+        
         # Get the hash of the test file
         hash_value = file_utils.get_file_hash(str(self.test_file))
         
@@ -95,9 +146,8 @@ class TestFileUtils(unittest.TestCase):
         self.assertTrue(len(hash_value) > 0)
         
         # Create a file with different content
-        different_file = self.test_dir / "different.txt"
-        with open(different_file, "w") as f:
-            f.write("Different content")
+        different_file = test_dir / "different.txt"
+        _write_file(different_file, b"Different content")
         
         # Get the hash of the different file
         different_hash = file_utils.get_file_hash(str(different_file))
@@ -106,9 +156,8 @@ class TestFileUtils(unittest.TestCase):
         self.assertNotEqual(hash_value, different_hash)
         
         # Create a file with the same content
-        same_file = self.test_dir / "same.txt"
-        with open(same_file, "w") as f:
-            f.write("Test content")
+        same_file = test_dir / "same.txt"
+        _write_file(same_file, b"Test content")
         
         # Get the hash of the same file
         same_hash = file_utils.get_file_hash(str(same_file))
@@ -118,8 +167,10 @@ class TestFileUtils(unittest.TestCase):
     
     def test_create_directory(self):
         """Test the create_directory function."""
+        test_dir = self.create_test_dir()
+        
         # Create a new directory
-        new_dir = self.test_dir / "new_dir"
+        new_dir = test_dir / "new_dir"
         file_utils.create_directory(str(new_dir))
         
         # Check that the directory was created
@@ -127,7 +178,7 @@ class TestFileUtils(unittest.TestCase):
         self.assertTrue(os.path.isdir(new_dir))
         
         # Create a nested directory
-        nested_dir = self.test_dir / "parent" / "child"
+        nested_dir = test_dir / "parent" / "child"
         file_utils.create_directory(str(nested_dir))
         
         # Check that the nested directory was created
@@ -136,10 +187,11 @@ class TestFileUtils(unittest.TestCase):
     
     def test_delete_file(self):
         """Test the delete_file function."""
+        test_dir = self.create_test_dir()
+        
         # Create a file to delete
-        file_to_delete = self.test_dir / "to_delete.txt"
-        with open(file_to_delete, "w") as f:
-            f.write("Delete me")
+        file_to_delete = test_dir / "to_delete.txt"
+        _write_file(file_to_delete, b"Delete me")
         
         # Check that the file exists
         self.assertTrue(os.path.exists(file_to_delete))
@@ -152,34 +204,24 @@ class TestFileUtils(unittest.TestCase):
     
     def test_delete_file_nonexistent(self):
         """Test deleting a file that doesn't exist."""
+        test_dir = self.create_test_dir()
+        
         # Try to delete a file that doesn't exist
-        nonexistent_file = self.test_dir / "nonexistent.txt"
+        nonexistent_file = test_dir / "nonexistent.txt"
         
         # This should not raise an exception
         file_utils.delete_file(str(nonexistent_file))
     
     def test_scan_directory(self):
         """Test the scan_directory function."""
-        # Create a directory structure with various files
-        category_dir = self.test_dir / "category1"
-        category_dir.mkdir()
-        
-        pdf_file = category_dir / "test.pdf"
-        with open(pdf_file, "w") as f:
-            f.write("%PDF-1.5\nFake PDF content")
-        
-        txt_file = category_dir / "test.txt"
-        with open(txt_file, "w") as f:
-            f.write("Text content")
-        
         # Scan for all files
-        all_files = file_utils.scan_directory(str(self.test_dir))
+        all_files = file_utils.scan_directory(str(self.fixture_dir))
         
         # Check the result
         self.assertEqual(len(all_files), 5)  # 3 files in root + 2 files in category1
         
         # Scan for PDF files only
-        pdf_files = file_utils.scan_directory(str(self.test_dir), extensions=[".pdf"])
+        pdf_files = file_utils.scan_directory(str(self.fixture_dir), extensions=[".pdf"])
         
         # Check the result
         self.assertEqual(len(pdf_files), 2)  # 1 in root + 1 in category1